@@ -8,6 +8,7 @@ Create Date: 2025-01-15 12:00:00.000000
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
 
 # revision identifiers, used by Alembic.
 revision = '001'
@@ -16,9 +17,20 @@ branch_labels = None
 depends_on = None
 
 
+def _create_tables(metadata: sa.MetaData) -> None:
+    """Create all tables of ``metadata`` with one multi-statement execute"""
+    dialect = op.get_context().dialect
+    op.execute(";\n".join(
+        str(CreateTable(table, if_not_exists=True).compile(dialect=dialect))
+        for table in metadata.sorted_tables
+    ))
+
+
 def upgrade() -> None:
+    metadata = sa.MetaData()
+
     # Create users table
-    op.create_table('users',
+    sa.Table('users', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('email', sa.String(), nullable=False),
         sa.Column('hashed_password', sa.String(), nullable=False),
@@ -28,73 +40,68 @@ def upgrade() -> None:
         sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email', name='uq_users_email')
     )
-    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
-    op.create_index(op.f('ix_users_tenant_id'), 'users', ['tenant_id'], unique=False)
 
     # Create models table
-    op.create_table('models',
+    sa.Table('models', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('name', sa.String(), nullable=False),
         sa.Column('provider', sa.String(), nullable=False),
         sa.Column('endpoint', sa.String(), nullable=False),
-        sa.Column('pricing', sa.JSON(), nullable=True),
+        sa.Column('pricing', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
         sa.Column('context_len', sa.Integer(), nullable=False),
         sa.Column('enabled', sa.Boolean(), nullable=False),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name', name='uq_models_name')
     )
-    op.create_index(op.f('ix_models_name'), 'models', ['name'], unique=True)
-    op.create_index(op.f('ix_models_provider'), 'models', ['provider'], unique=False)
 
     # Create agents table
-    op.create_table('agents',
+    sa.Table('agents', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('name', sa.String(), nullable=False),
         sa.Column('description', sa.Text(), nullable=True),
-        sa.Column('schema', sa.JSON(), nullable=False),
+        sa.Column('schema', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
         sa.Column('status', sa.String(), nullable=False),
         sa.Column('owner_id', postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_agents_name'), 'agents', ['name'], unique=False)
-    op.create_index(op.f('ix_agents_status'), 'agents', ['status'], unique=False)
 
     # Create tools table
-    op.create_table('tools',
+    sa.Table('tools', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('name', sa.String(), nullable=False),
         sa.Column('description', sa.Text(), nullable=True),
-        sa.Column('schema', sa.JSON(), nullable=False),
+        sa.Column('schema', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
         sa.Column('endpoint', sa.String(), nullable=True),
         sa.Column('enabled', sa.Boolean(), nullable=False),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name', name='uq_tools_name')
     )
-    op.create_index(op.f('ix_tools_name'), 'tools', ['name'], unique=True)
 
     # Create routes table
-    op.create_table('routes',
+    sa.Table('routes', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column('prompt_type', sa.String(), nullable=True),
         sa.Column('strategy', sa.String(), nullable=False),
         sa.Column('primary_model_id', postgresql.UUID(as_uuid=True), nullable=False),
-        sa.Column('backup_model_ids', postgresql.ARRAY(postgresql.UUID()), nullable=True),
+        sa.Column('backup_model_ids', postgresql.ARRAY(postgresql.UUID()), nullable=True, server_default=sa.text("ARRAY[]::uuid[]")),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.ForeignKeyConstraint(['primary_model_id'], ['models.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_routes_tenant_id'), 'routes', ['tenant_id'], unique=False)
 
     # Create runs table
-    op.create_table('runs',
+    sa.Table('runs', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('agent_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('model_id', postgresql.UUID(as_uuid=True), nullable=True),
@@ -104,33 +111,30 @@ def upgrade() -> None:
         sa.Column('cost_usd', sa.Float(), nullable=True),
         sa.Column('execution_time_ms', sa.Integer(), nullable=True),
         sa.Column('error_message', sa.Text(), nullable=True),
-        sa.Column('run_metadata', sa.JSON(), nullable=True),
+        sa.Column('run_metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
         sa.ForeignKeyConstraint(['agent_id'], ['agents.id'], ),
         sa.ForeignKeyConstraint(['model_id'], ['models.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_runs_agent_id'), 'runs', ['agent_id'], unique=False)
-    op.create_index(op.f('ix_runs_created_at'), 'runs', ['created_at'], unique=False)
-    op.create_index(op.f('ix_runs_model_id'), 'runs', ['model_id'], unique=False)
 
     # Create messages table
-    op.create_table('messages',
+    sa.Table('messages', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('run_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('role', sa.String(), nullable=False),
         sa.Column('content', sa.Text(), nullable=True),
-        sa.Column('tool_calls', sa.JSON(), nullable=True),
+        sa.Column('tool_calls', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
         sa.Column('tool_call_id', sa.String(), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['run_id'], ['runs.id'], ),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)'
     )
-    op.create_index(op.f('ix_messages_run_id'), 'messages', ['run_id'], unique=False)
 
     # Create usage table
-    op.create_table('usage',
+    sa.Table('usage', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column('model_id', postgresql.UUID(as_uuid=True), nullable=False),
@@ -142,38 +146,51 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(['model_id'], ['models.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_usage_date'), 'usage', ['date'], unique=False)
-    op.create_index(op.f('ix_usage_tenant_id'), 'usage', ['tenant_id'], unique=False)
+
+    # Emit every CREATE TABLE in a single round-trip instead of one per table
+    _create_tables(metadata)
+
+    # Append-only messages are range-partitioned by time; rows land in the
+    # default partition until dedicated time-range partitions are attached.
+    # Indexes on partitioned tables cannot be built concurrently.
+    op.execute("CREATE TABLE IF NOT EXISTS messages_default PARTITION OF messages DEFAULT")
+    op.create_index('ix_messages_run_id_created_at', 'messages', ['run_id', 'created_at'], unique=False, if_not_exists=True)
+
+    # Create indexes concurrently outside the migration transaction so
+    # writes to already-populated tables are not blocked
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_users_tenant_id'), 'users', ['tenant_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_models_provider'), 'models', ['provider'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_agents_name'), 'agents', ['name'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_agents_status'), 'agents', ['status'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_routes_tenant_id'), 'routes', ['tenant_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_runs_agent_id_created_at', 'runs', ['agent_id', sa.text('created_at DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_runs_created_at'), 'runs', ['created_at'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_runs_model_id'), 'runs', ['model_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_usage_date'), 'usage', ['date'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_usage_tenant_id_date', 'usage', ['tenant_id', 'date'], unique=False, postgresql_concurrently=True, if_not_exists=True)
 
 
 def downgrade() -> None:
+    # Drop indexes first, concurrently and outside the transaction
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_usage_tenant_id_date', table_name='usage', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_usage_date'), table_name='usage', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_runs_model_id'), table_name='runs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_runs_created_at'), table_name='runs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_runs_agent_id_created_at', table_name='runs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_routes_tenant_id'), table_name='routes', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_agents_status'), table_name='agents', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_agents_name'), table_name='agents', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_models_provider'), table_name='models', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_users_tenant_id'), table_name='users', postgresql_concurrently=True, if_exists=True)
+
     # Drop tables in reverse order
-    op.drop_index(op.f('ix_usage_tenant_id'), table_name='usage')
-    op.drop_index(op.f('ix_usage_date'), table_name='usage')
     op.drop_table('usage')
-    
-    op.drop_index(op.f('ix_messages_run_id'), table_name='messages')
     op.drop_table('messages')
-    
-    op.drop_index(op.f('ix_runs_model_id'), table_name='runs')
-    op.drop_index(op.f('ix_runs_created_at'), table_name='runs')
-    op.drop_index(op.f('ix_runs_agent_id'), table_name='runs')
     op.drop_table('runs')
-    
-    op.drop_index(op.f('ix_routes_tenant_id'), table_name='routes')
     op.drop_table('routes')
-    
-    op.drop_index(op.f('ix_tools_name'), table_name='tools')
     op.drop_table('tools')
-    
-    op.drop_index(op.f('ix_agents_status'), table_name='agents')
-    op.drop_index(op.f('ix_agents_name'), table_name='agents')
     op.drop_table('agents')
-    
-    op.drop_index(op.f('ix_models_provider'), table_name='models')
-    op.drop_index(op.f('ix_models_name'), table_name='models')
     op.drop_table('models')
-    
-    op.drop_index(op.f('ix_users_tenant_id'), table_name='users')
-    op.drop_index(op.f('ix_users_email'), table_name='users')
     op.drop_table('users') 
\ No newline at end of file
@@ -6,7 +6,6 @@ Create Date: 2025-01-15 16:00:00.000000
 
 """
 from alembic import op
-import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision = '002'
@@ -16,22 +15,20 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Remove pricing column from models table
-    op.drop_column('models', 'pricing')
-    
-    # Remove cost_usd column from runs table
-    op.drop_column('runs', 'cost_usd')
-    
-    # Remove cost_usd column from usage table
-    op.drop_column('usage', 'cost_usd')
+    # Remove pricing column from models table and cost_usd columns from
+    # runs/usage tables in a single round-trip
+    op.execute(
+        "ALTER TABLE models DROP COLUMN IF EXISTS pricing; "
+        "ALTER TABLE runs DROP COLUMN IF EXISTS cost_usd; "
+        "ALTER TABLE usage DROP COLUMN IF EXISTS cost_usd"
+    )
 
 
 def downgrade() -> None:
-    # Add back cost_usd column to usage table
-    op.add_column('usage', sa.Column('cost_usd', sa.Float(), nullable=False, server_default='0.0'))
-    
-    # Add back cost_usd column to runs table
-    op.add_column('runs', sa.Column('cost_usd', sa.Float(), nullable=True))
-    
-    # Add back pricing column to models table
-    op.add_column('models', sa.Column('pricing', sa.JSON(), nullable=True)) 
\ No newline at end of file
+    # Add back cost_usd columns to usage/runs tables and pricing column to
+    # models table in a single round-trip
+    op.execute(
+        "ALTER TABLE usage ADD COLUMN IF NOT EXISTS cost_usd FLOAT NOT NULL DEFAULT '0.0'; "
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS cost_usd FLOAT; "
+        "ALTER TABLE models ADD COLUMN IF NOT EXISTS pricing JSONB"
+    )
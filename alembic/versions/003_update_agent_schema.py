@@ -5,7 +5,7 @@ Revises: 002
 Create Date: 2024-01-20 10:00:00.000000
 
 """
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
@@ -15,70 +15,247 @@ down_revision = '002'
 branch_labels = None
 depends_on = None
 
+# 数据迁移每批处理的行数，限制单条 UPDATE 的锁和 WAL 规模
+MIGRATE_BATCH_SIZE = 30000
+
+# 超过该行数时改为整表重写：一次顺序扫描写入新表，不产生死元组
+REWRITE_THRESHOLD_ROWS = 100000
+
+# 由 schema 字段拆分出的配置字段及其在 NEW_CONFIG_SELECT 中的别名
+NEW_CONFIG_COLUMNS = {'llm_config': 'llm', 'system_config': 'sys', 'tools_config': 'tools'}
+
+# 每行只计算一次新的配置结构，再通过 UPDATE ... FROM 写回
+NEW_CONFIG_SELECT = """
+    SELECT
+        id,
+        CASE 
+            WHEN schema->>'model_id' IS NOT NULL THEN 
+                jsonb_build_object(
+                    'primary_model_id', schema->>'model_id',
+                    'temperature', COALESCE((schema->>'temperature')::float, 0.7),
+                    'max_tokens', COALESCE((schema->>'max_tokens')::int, 2000),
+                    'top_p', 0.9,
+                    'frequency_penalty', 0,
+                    'presence_penalty', 0
+                )
+            ELSE '{}'::jsonb
+        END AS llm,
+        CASE 
+            WHEN schema->>'system_prompt' IS NOT NULL THEN 
+                jsonb_build_object(
+                    'system_prompt', schema->>'system_prompt',
+                    'conversation_starters', '[]'::jsonb,
+                    'response_style', 'formal',
+                    'max_context_turns', 10,
+                    'enable_memory', true
+                )
+            ELSE '{}'::jsonb
+        END AS sys,
+        CASE 
+            WHEN schema->'tools' IS NOT NULL THEN 
+                jsonb_build_object(
+                    'enabled_tools', schema->'tools',
+                    'tool_configs', '{}'::jsonb,
+                    'custom_tools', '[]'::jsonb
+                )
+            ELSE '{}'::jsonb
+        END AS tools
+    FROM agents
+    WHERE schema IS NOT NULL
+"""
+
+NEW_CONFIG_UPDATE = """
+    UPDATE agents a
+    SET llm_config = n.llm, system_config = n.sys, tools_config = n.tools
+    FROM new_cfg n
+    WHERE a.id = n.id
+"""
+
+
+def _migrate_schema_data() -> None:
+    """按 id 分批将旧 schema 字段拆分到新的配置字段"""
+    if context.is_offline_mode():
+        # 离线模式只生成 SQL，无法按批读取结果，直接输出整表更新
+        op.execute(f"WITH new_cfg AS ({NEW_CONFIG_SELECT}) {NEW_CONFIG_UPDATE}")
+        return
+
+    bind = op.get_bind()
+    # 重复执行时 schema 字段可能已被删除，此时数据早已迁移完成
+    has_schema = bind.execute(sa.text("""
+        SELECT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'agents' AND column_name = 'schema'
+        )
+    """)).scalar()
+    if not has_schema:
+        return
+
+    row_count = bind.execute(sa.text("SELECT count(*) FROM agents WHERE schema IS NOT NULL")).scalar()
+    if row_count > REWRITE_THRESHOLD_ROWS and _can_rewrite_agents_table(bind):
+        _rewrite_agents_table(bind)
+        return
+
+    batch_sql = sa.text(f"""
+        WITH new_cfg AS (
+            {NEW_CONFIG_SELECT}
+              AND (CAST(:last_id AS uuid) IS NULL OR id > CAST(:last_id AS uuid))
+            ORDER BY id
+            LIMIT :batch_size
+        )
+        {NEW_CONFIG_UPDATE}
+        RETURNING a.id
+    """)
+
+    # 在 autocommit 块中执行，每批 UPDATE 单独提交，锁和 WAL 不会在整个迁移事务中累积；
+    # 新配置只由 schema 字段计算得出，中途失败后重新执行会覆盖已提交的批次
+    with op.get_context().autocommit_block():
+        # 取 autocommit 块内的连接
+        autocommit_bind = op.get_bind()
+        last_id = None
+        while True:
+            ids = autocommit_bind.execute(
+                batch_sql, {"last_id": last_id, "batch_size": MIGRATE_BATCH_SIZE}
+            ).scalars().all()
+            if not ids:
+                break
+            last_id = str(max(ids))
+
+
+def _can_rewrite_agents_table(bind) -> bool:
+    """agents 上有依赖视图或行级安全策略时不能删表替换，回退到分批 UPDATE"""
+    has_views = bind.execute(sa.text("""
+        SELECT EXISTS (
+            SELECT 1
+            FROM pg_depend d
+            JOIN pg_rewrite r ON r.oid = d.objid
+            WHERE d.classid = 'pg_rewrite'::regclass
+              AND d.refclassid = 'pg_class'::regclass
+              AND d.refobjid = 'agents'::regclass
+              AND r.ev_class <> 'agents'::regclass
+        )
+    """)).scalar()
+    has_rls = bind.execute(sa.text("""
+        SELECT c.relrowsecurity OR c.relforcerowsecurity
+            OR EXISTS (SELECT 1 FROM pg_policy WHERE polrelid = c.oid)
+        FROM pg_class c
+        WHERE c.oid = 'agents'::regclass
+    """)).scalar()
+    return not has_views and not has_rls
+
+
+def _rewrite_agents_table(bind) -> None:
+    """大表时通过 INSERT ... SELECT 写入新表再替换，避免逐行 UPDATE 使堆和 WAL 翻倍
+
+    新表先不建索引，数据写入后再按原定义重建主键、唯一约束、索引和引用 agents 的外键，
+    并恢复表的属主、表级权限、触发器、表和列注释。
+
+    限制：列级权限、索引和约束上的注释、表的存储参数以及 publication 成员关系不会保留；
+    存在依赖视图或行级安全策略时不走此路径（见 _can_rewrite_agents_table）。
+    """
+    owner = bind.execute(sa.text(
+        "SELECT quote_ident(pg_get_userbyid(relowner)) FROM pg_class WHERE oid = 'agents'::regclass"
+    )).scalar()
+    grants = bind.execute(sa.text("""
+        SELECT
+            CASE WHEN a.grantee = 0 THEN 'PUBLIC' ELSE quote_ident(pg_get_userbyid(a.grantee)) END,
+            a.privilege_type,
+            a.is_grantable
+        FROM pg_class c, aclexplode(c.relacl) a
+        WHERE c.oid = 'agents'::regclass
+    """)).all()
+    comment = bind.execute(sa.text(
+        "SELECT quote_literal(obj_description('agents'::regclass, 'pg_class'))"
+    )).scalar()
+    triggers = bind.execute(sa.text("""
+        SELECT pg_get_triggerdef(oid)
+        FROM pg_trigger
+        WHERE tgrelid = 'agents'::regclass AND NOT tgisinternal
+    """)).scalars().all()
+    fks = bind.execute(sa.text("""
+        SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE contype = 'f' AND confrelid = 'agents'::regclass
+    """)).all()
+    constraints = bind.execute(sa.text("""
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE contype IN ('p', 'u') AND conrelid = 'agents'::regclass
+    """)).all()
+    constraint_names = [name for name, _ in constraints]
+    indexes = [
+        indexdef for indexname, indexdef in bind.execute(sa.text(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = 'agents'"
+        )).all()
+        if indexname not in constraint_names
+    ]
+    columns = [column['name'] for column in sa.inspect(bind).get_columns('agents')]
+
+    select_list = ", ".join(
+        f"COALESCE(n.{NEW_CONFIG_COLUMNS[column]}, a.{column})" if column in NEW_CONFIG_COLUMNS else f"a.{column}"
+        for column in columns
+    )
+    column_list = ", ".join(columns)
+
+    op.execute("CREATE TABLE agents_new (LIKE agents INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS)")
+    op.execute(f"""
+        INSERT INTO agents_new ({column_list})
+        SELECT {select_list}
+        FROM agents a
+        LEFT JOIN ({NEW_CONFIG_SELECT}) n ON n.id = a.id
+    """)
+
+    for table, name, _ in fks:
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+    op.execute("DROP TABLE agents")
+    op.execute("ALTER TABLE agents_new RENAME TO agents")
+
+    op.execute(f"ALTER TABLE agents OWNER TO {owner}")
+    for grantee, privilege, grantable in grants:
+        option = " WITH GRANT OPTION" if grantable else ""
+        op.execute(f"GRANT {privilege} ON agents TO {grantee}{option}")
+    if comment is not None:
+        op.execute(f"COMMENT ON TABLE agents IS {comment}")
+
+    for name, definition in constraints:
+        op.execute(f'ALTER TABLE agents ADD CONSTRAINT "{name}" {definition}')
+    for indexdef in indexes:
+        op.execute(indexdef)
+    for table, name, definition in fks:
+        op.execute(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}')
+    # 触发器在数据写入后再创建，INSERT ... SELECT 不会触发
+    for triggerdef in triggers:
+        op.execute(triggerdef)
+
 
 def upgrade() -> None:
-    # 添加新字段
-    op.add_column('agents', sa.Column('avatar', sa.String(), nullable=True))
-    op.add_column('agents', sa.Column('category', sa.String(), nullable=False, server_default='其他'))
-    op.add_column('agents', sa.Column('tags', postgresql.ARRAY(sa.String()), nullable=True, server_default='{}'))
-    op.add_column('agents', sa.Column('access_level', sa.String(), nullable=False, server_default='private'))
-    op.add_column('agents', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
-    
-    # 添加新的配置字段
-    op.add_column('agents', sa.Column('llm_config', sa.JSON(), nullable=False, server_default='{}'))
-    op.add_column('agents', sa.Column('system_config', sa.JSON(), nullable=False, server_default='{}'))
-    op.add_column('agents', sa.Column('tools_config', sa.JSON(), nullable=False, server_default='{}'))
-    op.add_column('agents', sa.Column('knowledge_config', sa.JSON(), nullable=False, server_default='{}'))
-    op.add_column('agents', sa.Column('deployment_config', sa.JSON(), nullable=False, server_default='{}'))
-    op.add_column('agents', sa.Column('stats', sa.JSON(), nullable=False, server_default='{"total_conversations": 0, "total_messages": 0, "avg_response_time": 0, "user_satisfaction": 0}'))
+    # 添加新字段和新的配置字段，合并为一条 ALTER TABLE 只获取一次排他锁；
+    # 配置字段使用 jsonb 常量默认值，PG 只记录到系统表而无需重写整表
+    op.execute("""
+        ALTER TABLE agents
+            ADD COLUMN IF NOT EXISTS avatar VARCHAR,
+            ADD COLUMN IF NOT EXISTS category VARCHAR NOT NULL DEFAULT '其他',
+            ADD COLUMN IF NOT EXISTS tags VARCHAR[] DEFAULT ARRAY[]::varchar[],
+            ADD COLUMN IF NOT EXISTS access_level VARCHAR NOT NULL DEFAULT 'private',
+            ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT '1',
+            ADD COLUMN IF NOT EXISTS llm_config JSONB NOT NULL DEFAULT '{}'::jsonb,
+            ADD COLUMN IF NOT EXISTS system_config JSONB NOT NULL DEFAULT '{}'::jsonb,
+            ADD COLUMN IF NOT EXISTS tools_config JSONB NOT NULL DEFAULT '{}'::jsonb,
+            ADD COLUMN IF NOT EXISTS knowledge_config JSONB NOT NULL DEFAULT '{}'::jsonb,
+            ADD COLUMN IF NOT EXISTS deployment_config JSONB NOT NULL DEFAULT '{}'::jsonb,
+            ADD COLUMN IF NOT EXISTS stats JSONB NOT NULL DEFAULT '{"total_conversations": 0, "total_messages": 0, "avg_response_time": 0, "user_satisfaction": 0}'::jsonb
+    """)
     
     # 迁移现有的schema数据到新结构
     # 这里我们将现有的schema字段数据迁移到新的字段中
-    op.execute("""
-        UPDATE agents 
-        SET 
-            llm_config = CASE 
-                WHEN schema->>'model_id' IS NOT NULL THEN 
-                    json_build_object(
-                        'primary_model_id', schema->>'model_id',
-                        'temperature', COALESCE((schema->>'temperature')::float, 0.7),
-                        'max_tokens', COALESCE((schema->>'max_tokens')::int, 2000),
-                        'top_p', 0.9,
-                        'frequency_penalty', 0,
-                        'presence_penalty', 0
-                    )
-                ELSE '{}'::json
-            END,
-            system_config = CASE 
-                WHEN schema->>'system_prompt' IS NOT NULL THEN 
-                    json_build_object(
-                        'system_prompt', schema->>'system_prompt',
-                        'conversation_starters', '[]'::json,
-                        'response_style', 'formal',
-                        'max_context_turns', 10,
-                        'enable_memory', true
-                    )
-                ELSE '{}'::json
-            END,
-            tools_config = CASE 
-                WHEN schema->'tools' IS NOT NULL THEN 
-                    json_build_object(
-                        'enabled_tools', schema->'tools',
-                        'tool_configs', '{}'::json,
-                        'custom_tools', '[]'::json
-                    )
-                ELSE '{}'::json
-            END
-        WHERE schema IS NOT NULL
-    """)
+    _migrate_schema_data()
     
     # 删除旧的schema字段
-    op.drop_column('agents', 'schema')
+    op.execute("ALTER TABLE agents DROP COLUMN IF EXISTS schema")
 
 
 def downgrade() -> None:
     # 恢复schema字段
-    op.add_column('agents', sa.Column('schema', sa.JSON(), nullable=False, server_default='{}'))
+    op.add_column('agents', sa.Column('schema', postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default='{}'))
     
     # 将新字段的数据迁移回schema字段
     op.execute("""
@@ -94,14 +271,17 @@ def downgrade() -> None:
     """)
     
     # 删除新字段
-    op.drop_column('agents', 'stats')
-    op.drop_column('agents', 'deployment_config')
-    op.drop_column('agents', 'knowledge_config')
-    op.drop_column('agents', 'tools_config')
-    op.drop_column('agents', 'system_config')
-    op.drop_column('agents', 'llm_config')
-    op.drop_column('agents', 'version')
-    op.drop_column('agents', 'access_level')
-    op.drop_column('agents', 'tags')
-    op.drop_column('agents', 'category')
-    op.drop_column('agents', 'avatar') 
\ No newline at end of file
+    op.execute("""
+        ALTER TABLE agents
+            DROP COLUMN IF EXISTS stats,
+            DROP COLUMN IF EXISTS deployment_config,
+            DROP COLUMN IF EXISTS knowledge_config,
+            DROP COLUMN IF EXISTS tools_config,
+            DROP COLUMN IF EXISTS system_config,
+            DROP COLUMN IF EXISTS llm_config,
+            DROP COLUMN IF EXISTS version,
+            DROP COLUMN IF EXISTS access_level,
+            DROP COLUMN IF EXISTS tags,
+            DROP COLUMN IF EXISTS category,
+            DROP COLUMN IF EXISTS avatar
+    """)
@@ -10,6 +10,7 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
 
 # revision identifiers, used by Alembic.
 revision: str = '004_add_advanced_agent_tables'
@@ -18,27 +19,37 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _create_tables(metadata: sa.MetaData) -> None:
+    """Create all tables of ``metadata`` with one multi-statement execute"""
+    dialect = op.get_context().dialect
+    op.execute(";\n".join(
+        str(CreateTable(table, if_not_exists=True).compile(dialect=dialect))
+        for table in metadata.sorted_tables
+    ))
+
+
 def upgrade() -> None:
+    metadata = sa.MetaData()
+
     # Create advanced_agents table
-    op.create_table('advanced_agents',
+    sa.Table('advanced_agents', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('name', sa.String(), nullable=False),
         sa.Column('role', sa.String(), nullable=False),
         sa.Column('personality', sa.String(), nullable=False, default='professional'),
         sa.Column('description', sa.Text(), nullable=True),
-        sa.Column('config', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('config', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
         sa.Column('status', sa.String(), nullable=False, default='idle'),
         sa.Column('current_session_id', postgresql.UUID(as_uuid=True), nullable=True),
-        sa.Column('stats', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('stats', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
         sa.Column('owner_id', postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_advanced_agents_name'), 'advanced_agents', ['name'], unique=False)
 
     # Create agent_sessions table
-    op.create_table('agent_sessions',
+    sa.Table('agent_sessions', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('agent_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('status', sa.String(), nullable=False, default='active'),
@@ -46,7 +57,7 @@ def upgrade() -> None:
         sa.Column('progress', sa.Integer(), nullable=True, default=0),
         sa.Column('confidence_score', sa.Float(), nullable=True, default=0.0),
         sa.Column('reasoning_visible', sa.Boolean(), nullable=True, default=True),
-        sa.Column('session_config', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('session_config', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
         sa.Column('total_messages', sa.Integer(), nullable=True, default=0),
         sa.Column('total_tool_calls', sa.Integer(), nullable=True, default=0),
         sa.Column('execution_time_ms', sa.Integer(), nullable=True, default=0),
@@ -60,58 +71,58 @@ def upgrade() -> None:
     )
 
     # Create session_messages table
-    op.create_table('session_messages',
+    sa.Table('session_messages', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('session_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('role', sa.String(), nullable=False),
         sa.Column('content', sa.Text(), nullable=False),
         sa.Column('confidence', sa.Float(), nullable=True),
         sa.Column('reasoning', sa.Text(), nullable=True),
-        sa.Column('tool_calls', postgresql.JSON(astext_type=sa.Text()), nullable=True),
-        sa.Column('tool_results', postgresql.JSON(astext_type=sa.Text()), nullable=True),
-        sa.Column('metadata', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('tool_calls', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('tool_results', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
         sa.Column('tokens_used', sa.Integer(), nullable=True, default=0),
         sa.Column('execution_time_ms', sa.Integer(), nullable=True, default=0),
-        sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['session_id'], ['agent_sessions.id'], ),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id', 'timestamp'),
+        postgresql_partition_by='RANGE (timestamp)'
     )
 
     # Create advanced_tools table
-    op.create_table('advanced_tools',
+    sa.Table('advanced_tools', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('name', sa.String(), nullable=False),
         sa.Column('description', sa.Text(), nullable=False),
         sa.Column('category', sa.String(), nullable=False),
-        sa.Column('schema', postgresql.JSON(astext_type=sa.Text()), nullable=False),
-        sa.Column('implementation', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('schema', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('implementation', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
         sa.Column('version', sa.String(), nullable=True, default='1.0.0'),
         sa.Column('enabled', sa.Boolean(), nullable=True, default=True),
-        sa.Column('required_params', postgresql.ARRAY(sa.String()), nullable=True),
-        sa.Column('optional_params', postgresql.ARRAY(sa.String()), nullable=True),
+        sa.Column('required_params', postgresql.ARRAY(sa.String()), nullable=True, server_default=sa.text("ARRAY[]::varchar[]")),
+        sa.Column('optional_params', postgresql.ARRAY(sa.String()), nullable=True, server_default=sa.text("ARRAY[]::varchar[]")),
         sa.Column('usage_count', sa.Integer(), nullable=True, default=0),
         sa.Column('success_rate', sa.Float(), nullable=True, default=0.0),
         sa.Column('avg_execution_time', sa.Float(), nullable=True, default=0.0),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.PrimaryKeyConstraint('id'),
-        sa.UniqueConstraint('name')
+        sa.UniqueConstraint('name', name='uq_advanced_tools_name')
     )
-    op.create_index(op.f('ix_advanced_tools_name'), 'advanced_tools', ['name'], unique=True)
 
     # Create agent_memories table
-    op.create_table('agent_memories',
+    sa.Table('agent_memories', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('agent_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('memory_type', sa.String(), nullable=False),
         sa.Column('content', sa.Text(), nullable=False),
-        sa.Column('embedding', postgresql.JSON(astext_type=sa.Text()), nullable=True),
+        sa.Column('embedding', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
         sa.Column('importance_score', sa.Float(), nullable=True, default=0.5),
         sa.Column('access_count', sa.Integer(), nullable=True, default=0),
         sa.Column('last_accessed', sa.DateTime(timezone=True), nullable=True),
         sa.Column('source_session_id', postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column('source_message_id', postgresql.UUID(as_uuid=True), nullable=True),
-        sa.Column('tags', postgresql.ARRAY(sa.String()), nullable=True),
+        sa.Column('tags', postgresql.ARRAY(sa.String()), nullable=True, server_default=sa.text("ARRAY[]::varchar[]")),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
@@ -120,30 +131,31 @@ def upgrade() -> None:
     )
 
     # Create agent_performance_metrics table
-    op.create_table('agent_performance_metrics',
+    sa.Table('agent_performance_metrics', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('agent_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('session_id', postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column('metric_name', sa.String(), nullable=False),
         sa.Column('metric_value', sa.Float(), nullable=False),
         sa.Column('metric_unit', sa.String(), nullable=True),
-        sa.Column('context', postgresql.JSON(astext_type=sa.Text()), nullable=True),
-        sa.Column('measurement_time', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('context', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('measurement_time', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['agent_id'], ['advanced_agents.id'], ),
         sa.ForeignKeyConstraint(['session_id'], ['agent_sessions.id'], ),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id', 'measurement_time'),
+        postgresql_partition_by='RANGE (measurement_time)'
     )
 
     # Create agent_knowledge_bases table
-    op.create_table('agent_knowledge_bases',
+    sa.Table('agent_knowledge_bases', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('agent_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('title', sa.String(), nullable=False),
         sa.Column('content', sa.Text(), nullable=False),
         sa.Column('content_type', sa.String(), nullable=True, default='text'),
-        sa.Column('embedding', postgresql.JSON(astext_type=sa.Text()), nullable=True),
-        sa.Column('keywords', postgresql.ARRAY(sa.String()), nullable=True),
-        sa.Column('categories', postgresql.ARRAY(sa.String()), nullable=True),
+        sa.Column('embedding', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('keywords', postgresql.ARRAY(sa.String()), nullable=True, server_default=sa.text("ARRAY[]::varchar[]")),
+        sa.Column('categories', postgresql.ARRAY(sa.String()), nullable=True, server_default=sa.text("ARRAY[]::varchar[]")),
         sa.Column('source_url', sa.String(), nullable=True),
         sa.Column('source_type', sa.String(), nullable=True),
         sa.Column('file_path', sa.String(), nullable=True),
@@ -156,17 +168,45 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint('id')
     )
 
-    # Add foreign key constraint for current_session_id
-    op.create_foreign_key(
-        'fk_advanced_agents_current_session', 
-        'advanced_agents', 
-        'agent_sessions',
-        ['current_session_id'], 
-        ['id']
-    )
+    # Emit every CREATE TABLE in a single round-trip instead of one per table
+    _create_tables(metadata)
+
+    # Append-only message/metric tables are range-partitioned by time; rows
+    # land in the default partition until time-range partitions are attached.
+    # Indexes on partitioned tables cannot be built concurrently.
+    op.execute("CREATE TABLE IF NOT EXISTS session_messages_default PARTITION OF session_messages DEFAULT")
+    op.execute("CREATE TABLE IF NOT EXISTS agent_performance_metrics_default PARTITION OF agent_performance_metrics DEFAULT")
+    op.create_index('ix_session_messages_session_id_timestamp', 'session_messages', ['session_id', 'timestamp'], unique=False, if_not_exists=True)
+
+    # Add foreign key constraint for current_session_id; guarded like the
+    # IF NOT EXISTS statements above so a partially applied run can be retried
+    op.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM pg_constraint
+                WHERE conname = 'fk_advanced_agents_current_session'
+                  AND conrelid = 'advanced_agents'::regclass
+            ) THEN
+                ALTER TABLE advanced_agents
+                    ADD CONSTRAINT fk_advanced_agents_current_session
+                    FOREIGN KEY (current_session_id) REFERENCES agent_sessions (id);
+            END IF;
+        END
+        $$
+    """)
+
+    # Create indexes concurrently outside the migration transaction so
+    # writes to already-populated tables are not blocked
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_advanced_agents_name'), 'advanced_agents', ['name'], unique=False, postgresql_concurrently=True, if_not_exists=True)
 
 
 def downgrade() -> None:
+    # Drop indexes first, concurrently and outside the transaction
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_advanced_agents_name'), table_name='advanced_agents', postgresql_concurrently=True, if_exists=True)
+
     # Drop foreign key constraint first
     op.drop_constraint('fk_advanced_agents_current_session', 'advanced_agents', type_='foreignkey')
     
@@ -174,9 +214,7 @@ def downgrade() -> None:
     op.drop_table('agent_knowledge_bases')
     op.drop_table('agent_performance_metrics')
     op.drop_table('agent_memories')
-    op.drop_index(op.f('ix_advanced_tools_name'), table_name='advanced_tools')
     op.drop_table('advanced_tools')
     op.drop_table('session_messages')
     op.drop_table('agent_sessions')
-    op.drop_index(op.f('ix_advanced_agents_name'), table_name='advanced_agents')
     op.drop_table('advanced_agents') 
\ No newline at end of file
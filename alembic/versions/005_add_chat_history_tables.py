@@ -10,6 +10,7 @@ from typing import Sequence, Union
 from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
 
 # revision identifiers, used by Alembic.
 revision: str = '005_add_chat_history_tables'
@@ -18,41 +19,68 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _create_tables(metadata: sa.MetaData, exclude: Sequence[str] = ()) -> None:
+    """Create all tables of ``metadata`` with one multi-statement execute"""
+    dialect = op.get_context().dialect
+    op.execute(";\n".join(
+        str(CreateTable(table, if_not_exists=True).compile(dialect=dialect))
+        for table in metadata.sorted_tables
+        if table.name not in exclude
+    ))
+
+
 def upgrade() -> None:
+    metadata = sa.MetaData()
+    # Existing table, declared only so foreign keys to it can be resolved
+    sa.Table('models', metadata, sa.Column('id', postgresql.UUID(as_uuid=True)))
+
     # Create chat_sessions table
-    op.create_table('chat_sessions',
+    sa.Table('chat_sessions', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('title', sa.String(), nullable=False, default='新对话'),
         sa.Column('model_id', postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
         sa.Column('is_pinned', sa.Boolean(), nullable=False, default=False),
-        sa.Column('tags', postgresql.ARRAY(sa.String()), nullable=True, default=[]),
+        sa.Column('tags', postgresql.ARRAY(sa.String()), nullable=True, server_default=sa.text("ARRAY[]::varchar[]")),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
         sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
         sa.ForeignKeyConstraint(['model_id'], ['models.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_chat_sessions_user_id'), 'chat_sessions', ['user_id'], unique=False)
 
     # Create chat_messages table
-    op.create_table('chat_messages',
+    sa.Table('chat_messages', metadata,
         sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('session_id', postgresql.UUID(as_uuid=True), nullable=False),
         sa.Column('role', sa.String(), nullable=False),
         sa.Column('content', sa.Text(), nullable=False),
         sa.Column('model_used', sa.String(), nullable=True),
-        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.ForeignKeyConstraint(['session_id'], ['chat_sessions.id'], ondelete='CASCADE'),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)'
     )
-    op.create_index(op.f('ix_chat_messages_session_id'), 'chat_messages', ['session_id'], unique=False)
+
+    # Emit every CREATE TABLE in a single round-trip instead of one per table
+    _create_tables(metadata, exclude=['models'])
+
+    # Append-only chat messages are range-partitioned by time; rows land in
+    # the default partition until time-range partitions are attached.
+    # Indexes on partitioned tables cannot be built concurrently.
+    op.execute("CREATE TABLE IF NOT EXISTS chat_messages_default PARTITION OF chat_messages DEFAULT")
+    op.create_index('ix_chat_messages_session_id_created_at', 'chat_messages', ['session_id', 'created_at'], unique=False, if_not_exists=True)
+
+    # Create indexes concurrently outside the migration transaction so
+    # writes to already-populated tables are not blocked
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_chat_sessions_user_id'), 'chat_sessions', ['user_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
 
 
 def downgrade() -> None:
-    # Drop indexes first
-    op.drop_index(op.f('ix_chat_messages_session_id'), table_name='chat_messages')
-    op.drop_index(op.f('ix_chat_sessions_user_id'), table_name='chat_sessions')
-    
+    # Drop indexes first, concurrently and outside the transaction
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_chat_sessions_user_id'), table_name='chat_sessions', postgresql_concurrently=True, if_exists=True)
+
     # Drop tables in reverse order
     op.drop_table('chat_messages')
     op.drop_table('chat_sessions') 
\ No newline at end of file
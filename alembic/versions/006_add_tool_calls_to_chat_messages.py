@@ -18,7 +18,7 @@ depends_on = None
 
 def upgrade():
     # ### commands auto generated by Alembic - please adjust! ###
-    op.add_column('chat_messages', sa.Column('tool_calls', postgresql.JSON(astext_type=sa.Text()), nullable=True))
+    op.add_column('chat_messages', sa.Column('tool_calls', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
     op.add_column('chat_messages', sa.Column('tool_call_id', sa.String(), nullable=True))
     op.alter_column('chat_messages', 'content',
                existing_type=sa.TEXT(),
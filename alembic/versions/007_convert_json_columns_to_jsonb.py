@@ -0,0 +1,66 @@
+"""convert json columns to jsonb
+
+Revision ID: 007_convert_json_columns_to_jsonb
+Revises: 006_add_tool_calls_to_chat_messages
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '007_convert_json_columns_to_jsonb'
+down_revision = '006_add_tool_calls_to_chat_messages'
+branch_labels = None
+depends_on = None
+
+# 每张表需要转换的 JSON 列
+# TODO: embedding 列存放的是浮点向量，后续应迁移到 pgvector 的 vector 类型
+JSON_COLUMNS = {
+    'models': ['custom_headers'],
+    'agents': ['llm_config', 'system_config', 'tools_config', 'knowledge_config', 'deployment_config', 'stats'],
+    'tools': ['schema'],
+    'runs': ['run_metadata'],
+    'messages': ['tool_calls'],
+    'advanced_agents': ['config', 'stats'],
+    'agent_sessions': ['session_config'],
+    'session_messages': ['tool_calls', 'tool_results', 'metadata'],
+    'advanced_tools': ['schema', 'implementation'],
+    'agent_memories': ['embedding'],
+    'agent_performance_metrics': ['context'],
+    'agent_knowledge_bases': ['embedding'],
+    'chat_messages': ['tool_calls'],
+}
+
+# 带服务端默认值的列，类型转换前后需要重建默认值
+COLUMN_DEFAULTS = {
+    ('agents', 'llm_config'): "'{}'",
+    ('agents', 'system_config'): "'{}'",
+    ('agents', 'tools_config'): "'{}'",
+    ('agents', 'knowledge_config'): "'{}'",
+    ('agents', 'deployment_config'): "'{}'",
+    ('agents', 'stats'): """'{"total_conversations": 0, "total_messages": 0, "avg_response_time": 0, "user_satisfaction": 0}'""",
+}
+
+
+def _convert(type_name: str) -> None:
+    """每张表一条 ALTER TABLE，转换该表所有 JSON 列的类型"""
+    for table, columns in JSON_COLUMNS.items():
+        clauses = []
+        for column in columns:
+            default = COLUMN_DEFAULTS.get((table, column))
+            if default is not None:
+                clauses.append(f'ALTER COLUMN "{column}" DROP DEFAULT')
+            clauses.append(f'ALTER COLUMN "{column}" TYPE {type_name} USING "{column}"::{type_name}')
+            if default is not None:
+                clauses.append(f'ALTER COLUMN "{column}" SET DEFAULT {default}::{type_name}')
+        op.execute(f"ALTER TABLE {table} " + ", ".join(clauses))
+
+
+def upgrade():
+    # jsonb 以解析后的二进制格式存储，读取时无需重新解析，并支持 GIN 索引
+    _convert('jsonb')
+
+
+def downgrade():
+    _convert('json')
@@ -0,0 +1,53 @@
+"""add composite query indexes
+
+Revision ID: 008_add_composite_query_indexes
+Revises: 007_convert_json_columns_to_jsonb
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_add_composite_query_indexes'
+down_revision = '007_convert_json_columns_to_jsonb'
+branch_labels = None
+depends_on = None
+
+
+def _concurrently(table: str) -> bool:
+    """分区表上的索引不能并发创建；全新安装时这些表在 001/004/005 中已分区"""
+    if context.is_offline_mode():
+        return True
+    return not op.get_bind().execute(
+        sa.text("SELECT relkind = 'p' FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+        {"table": table},
+    ).scalar()
+
+
+def upgrade():
+    # 用与查询条件匹配的复合索引替换单列索引；复合索引的首列仍可满足
+    # 只按该列过滤的查询。runs.created_at / usage.date 单列索引保留给
+    # 不带 agent/tenant 条件的仪表盘查询
+    with op.get_context().autocommit_block():
+        op.create_index('ix_runs_agent_id_created_at', 'runs', ['agent_id', sa.text('created_at DESC')], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_messages_run_id_created_at', 'messages', ['run_id', 'created_at'], unique=False, postgresql_concurrently=_concurrently('messages'), if_not_exists=True)
+        op.create_index('ix_usage_tenant_id_date', 'usage', ['tenant_id', 'date'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_session_messages_session_id_timestamp', 'session_messages', ['session_id', 'timestamp'], unique=False, postgresql_concurrently=_concurrently('session_messages'), if_not_exists=True)
+        op.create_index('ix_chat_messages_session_id_created_at', 'chat_messages', ['session_id', 'created_at'], unique=False, postgresql_concurrently=_concurrently('chat_messages'), if_not_exists=True)
+
+        op.drop_index(op.f('ix_runs_agent_id'), table_name='runs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_messages_run_id'), table_name='messages', postgresql_concurrently=_concurrently('messages'), if_exists=True)
+        op.drop_index(op.f('ix_usage_tenant_id'), table_name='usage', postgresql_concurrently=True, if_exists=True)
+        op.drop_index(op.f('ix_chat_messages_session_id'), table_name='chat_messages', postgresql_concurrently=_concurrently('chat_messages'), if_exists=True)
+
+
+def downgrade():
+    # 只恢复 008 之前存在的单列索引，不再删除复合索引：全新安装时
+    # 001/004/005 已直接创建了复合索引
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_chat_messages_session_id'), 'chat_messages', ['session_id'], unique=False, postgresql_concurrently=_concurrently('chat_messages'), if_not_exists=True)
+        op.create_index(op.f('ix_usage_tenant_id'), 'usage', ['tenant_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(op.f('ix_messages_run_id'), 'messages', ['run_id'], unique=False, postgresql_concurrently=_concurrently('messages'), if_not_exists=True)
+        op.create_index(op.f('ix_runs_agent_id'), 'runs', ['agent_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
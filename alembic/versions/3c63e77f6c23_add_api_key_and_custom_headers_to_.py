@@ -7,6 +7,7 @@ Create Date: 2025-07-21 10:40:08.532979
 """
 from alembic import op
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
 
 
 # revision identifiers, used by Alembic.
@@ -19,7 +20,7 @@ depends_on = None
 def upgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
     op.add_column('models', sa.Column('api_key', sa.String(), nullable=True))
-    op.add_column('models', sa.Column('custom_headers', sa.JSON(), nullable=True))
+    op.add_column('models', sa.Column('custom_headers', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
     # ### end Alembic commands ###
 
 
@@ -6,20 +6,146 @@ ModelVS3 命令行工具
 
 import asyncio
 import json
+import multiprocessing
 import sys
-from typing import Optional, List
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import AsyncExitStack
+from typing import TYPE_CHECKING, Dict, Optional, List, Set, Tuple
 import click
 import subprocess
 import os
 
-from src.utils.api_client import ModelVS3Client, create_simple_agent, quick_chat
+if TYPE_CHECKING:
+    # API 客户端会导入 httpx 等依赖，仅在需要访问 API 的命令中才导入，
+    # 使 --help、version、deploy 等命令启动更快
+    from src.utils.api_client import ModelVS3Client
+
+
+# 列表命令的启用/停用状态图标
+STATUS_ICONS = {True: "🟢", False: "🔴"}
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """返回当前线程正在运行的事件循环，没有时返回 None"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _report_task_error(task: asyncio.Task) -> None:
+    """后台任务结束时输出未处理的异常，避免异常被静默丢弃"""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        click.echo(f"❌ 命令执行失败: {exc}", err=True)
+
+
+class CLIContext:
+    """子命令共享的事件循环和 API 客户端
+
+    同一进程内（脚本中通过 ``standalone_mode=False`` 连续调用子命令等）
+    复用同一个 ``ModelVS3Client`` 及其 httpx 连接池，避免每条命令重新
+    建立 TCP/TLS 连接。客户端绑定在事件循环上，因此所有协程都通过
+    ``run`` 在同一个循环中执行。
+    """
+
+    def __init__(self):
+        self._runner: Optional[asyncio.Runner] = None
+        self._stack = AsyncExitStack()
+        self._clients: Dict[Tuple[str, Optional[str]], "ModelVS3Client"] = {}
+        # 在已运行的事件循环上调度、尚未结束的命令任务
+        self._tasks: Set[asyncio.Task] = set()
+        self._closing: Optional[asyncio.Task] = None
+
+    def _get_runner(self) -> asyncio.Runner:
+        """首次运行协程时再创建事件循环"""
+        if self._runner is None:
+            try:
+                # uvicorn[standard] 已带 uvloop，可用时作为 CLI 的事件循环实现
+                import uvloop
+                loop_factory = uvloop.new_event_loop
+            except ImportError:
+                loop_factory = None
+            self._runner = asyncio.Runner(loop_factory=loop_factory)
+        return self._runner
+
+    def run(self, coro):
+        """在共享事件循环中运行协程
+
+        在已运行的事件循环中被调用时（IPython/Jupyter、异步测试等），无法再阻塞
+        等待，改为在该循环上创建任务并返回 ``asyncio.Task``。此时命令返回时
+        协程尚未执行，因此各命令的成功/失败提示都在协程内部输出，不依赖本方法
+        的返回值；协程中未处理的异常由任务的完成回调输出。
+        """
+        loop = _running_loop()
+        if loop is not None:
+            task = loop.create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            task.add_done_callback(_report_task_error)
+            return task
+        return self._get_runner().run(coro)
+
+    async def client(self, url: str, token: Optional[str] = None) -> "ModelVS3Client":
+        """按 API 地址和令牌获取共享客户端，首次使用时创建"""
+        key = (url, token)
+        if key not in self._clients:
+            from src.utils.api_client import ModelVS3Client
+
+            self._clients[key] = await self._stack.enter_async_context(ModelVS3Client(url, token))
+        return self._clients[key]
+
+    async def _aclose_after(self, tasks: Tuple[asyncio.Task, ...]):
+        """等待已调度的命令任务结束后关闭客户端，客户端可能在 close 之后才由任务创建"""
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._stack.aclose()
+    
+    def close(self):
+        """关闭所有客户端和事件循环"""
+        loop = _running_loop()
+        try:
+            if loop is not None:
+                if self._tasks or self._clients:
+                    self._closing = loop.create_task(self._aclose_after(tuple(self._tasks)))
+            elif self._clients:
+                self._get_runner().run(self._stack.aclose())
+        finally:
+            if self._runner is not None:
+                self._runner.close()
+
+
+async def _arun(*args: str, capture_output: bool = False, check: bool = True) -> str:
+    """异步执行外部命令，等待期间不阻塞事件循环
+
+    capture_output 为 True 时返回标准输出，否则直接输出到终端。
+    check 为 True 且返回码非零时抛出 subprocess.CalledProcessError。
+    """
+    pipe = asyncio.subprocess.PIPE if capture_output else None
+    proc = await asyncio.create_subprocess_exec(*args, stdout=pipe, stderr=pipe)
+    try:
+        stdout, stderr = await proc.communicate()
+    except asyncio.CancelledError:
+        # Ctrl+C 时事件循环取消当前任务，确保子进程退出后再返回
+        if proc.returncode is None:
+            proc.terminate()
+            await proc.wait()
+        raise
+
+    if check and proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, args, stdout, stderr)
+    return stdout.decode() if stdout else ""
 
 
 @click.group()
 @click.version_option(version="1.0.0")
-def cli():
+@click.pass_context
+def cli(ctx: click.Context):
     """ModelVS3 Agent 平台命令行工具"""
-    pass
+    if ctx.obj is None:
+        ctx.obj = CLIContext()
+        ctx.call_on_close(ctx.obj.close)
 
 
 @cli.group()
@@ -32,7 +158,8 @@ def server():
 @click.option("--port", default=8000, help="服务器端口")
 @click.option("--host", default="0.0.0.0", help="服务器地址")
 @click.option("--reload", is_flag=True, help="启用热重载")
-def start(port: int, host: str, reload: bool):
+@click.pass_obj
+def start(obj: CLIContext, port: int, host: str, reload: bool):
     """启动 ModelVS3 服务器"""
     click.echo(f"🚀 正在启动 ModelVS3 服务器 {host}:{port}")
     
@@ -40,12 +167,16 @@ def start(port: int, host: str, reload: bool):
     if reload:
         cmd.append("--reload")
     
+    async def _start():
+        try:
+            await _arun(*cmd)
+        except subprocess.CalledProcessError as e:
+            click.echo(f"❌ 启动失败: {e}")
+    
     try:
-        subprocess.run(cmd, check=True)
+        obj.run(_start())
     except KeyboardInterrupt:
         click.echo("\n✅ 服务器已停止")
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ 启动失败: {e}")
 
 
 @server.command()
@@ -63,38 +194,60 @@ def db():
 
 
 @db.command()
-def init():
+@click.option("--baseline", is_flag=True, help="全新数据库直接创建最终表结构，跳过历史迁移")
+@click.pass_obj
+def init(obj: CLIContext, baseline: bool):
     """初始化数据库"""
     click.echo("🔧 正在初始化数据库...")
-    try:
-        subprocess.run(["alembic", "upgrade", "head"], check=True)
-        click.echo("✅ 数据库初始化完成")
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ 数据库初始化失败: {e}")
+    
+    async def _init():
+        try:
+            if baseline:
+                await _arun("python3", "scripts/create_baseline.py")
+            else:
+                await _arun("alembic", "upgrade", "head")
+            click.echo("✅ 数据库初始化完成")
+        except subprocess.CalledProcessError as e:
+            click.echo(f"❌ 数据库初始化失败: {e}")
+    
+    obj.run(_init())
 
 
 @db.command()
-def seed():
+@click.pass_obj
+def seed(obj: CLIContext):
     """填充种子数据"""
     click.echo("🌱 正在填充种子数据...")
-    try:
-        subprocess.run(["python3", "scripts/seed_data.py"], check=True)
-        click.echo("✅ 种子数据填充完成")
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ 种子数据填充失败: {e}")
+    
+    async def _seed():
+        try:
+            # 在当前进程和事件循环中直接执行，省去子进程启动解释器的开销
+            from scripts.seed_data import main as seed_main
+            
+            await seed_main()
+            click.echo("✅ 种子数据填充完成")
+        except Exception as e:
+            click.echo(f"❌ 种子数据填充失败: {e}")
+    
+    obj.run(_seed())
 
 
 @db.command()
-def reset():
+@click.pass_obj
+def reset(obj: CLIContext):
     """重置数据库（危险操作）"""
     if click.confirm("⚠️  这将删除所有数据，确定要继续吗？"):
         click.echo("🔄 正在重置数据库...")
-        try:
-            subprocess.run(["alembic", "downgrade", "base"], check=True)
-            subprocess.run(["alembic", "upgrade", "head"], check=True)
-            click.echo("✅ 数据库重置完成")
-        except subprocess.CalledProcessError as e:
-            click.echo(f"❌ 数据库重置失败: {e}")
+        
+        async def _reset():
+            try:
+                await _arun("alembic", "downgrade", "base")
+                await _arun("alembic", "upgrade", "head")
+                click.echo("✅ 数据库重置完成")
+            except subprocess.CalledProcessError as e:
+                click.echo(f"❌ 数据库重置失败: {e}")
+        
+        obj.run(_reset())
 
 
 @cli.group()
@@ -106,23 +259,27 @@ def agent():
 @agent.command()
 @click.option("--url", default="http://localhost:8000", help="API 地址")
 @click.option("--token", help="API 令牌")
-def list_agents(url: str, token: Optional[str]):
+@click.pass_obj
+def list_agents(obj: CLIContext, url: str, token: Optional[str]):
     """列出所有 Agent"""
     async def _list():
-        async with ModelVS3Client(url, token) as client:
-            agents = await client.get_agents()
-            
-            if not agents:
-                click.echo("📭 暂无 Agent")
-                return
-            
-            click.echo("🎯 Agent 列表:")
-            for agent in agents:
-                status_icon = "🟢" if agent["status"] == "active" else "🔴"
-                click.echo(f"  {status_icon} {agent['name']} ({agent['id'][:8]}...)")
-                click.echo(f"     {agent.get('description', '无描述')}")
+        client = await obj.client(url, token)
+        count = 0
+        
+        # 分页获取，每页到达即输出
+        async for agent in client.iter_agents():
+            if count == 0:
+                click.echo("🎯 Agent 列表:")
+            count += 1
+            click.echo(
+                f"  {STATUS_ICONS[agent['status'] == 'active']} {agent['name']} ({agent['id'][:8]}...)\n"
+                f"     {agent.get('description', '无描述')}"
+            )
+        
+        if not count:
+            click.echo("📭 暂无 Agent")
     
-    asyncio.run(_list())
+    obj.run(_list())
 
 
 @agent.command()
@@ -132,17 +289,20 @@ def list_agents(url: str, token: Optional[str]):
 @click.option("--tools", help="工具列表，用逗号分隔")
 @click.option("--url", default="http://localhost:8000", help="API 地址")
 @click.option("--token", help="API 令牌")
-def create(name: str, system_prompt: str, model: str, tools: Optional[str], url: str, token: Optional[str]):
+@click.pass_obj
+def create(obj: CLIContext, name: str, system_prompt: str, model: str, tools: Optional[str], url: str, token: Optional[str]):
     """创建新 Agent"""
     async def _create():
+        from src.utils.api_client import create_simple_agent
+        
         tool_list = tools.split(",") if tools else None
         
-        async with ModelVS3Client(url, token) as client:
-            agent = await create_simple_agent(client, name, system_prompt, model, tool_list)
-            click.echo(f"✅ Agent '{name}' 创建成功")
-            click.echo(f"   ID: {agent['id']}")
+        client = await obj.client(url, token)
+        agent = await create_simple_agent(client, name, system_prompt, model, tool_list)
+        click.echo(f"✅ Agent '{name}' 创建成功")
+        click.echo(f"   ID: {agent['id']}")
     
-    asyncio.run(_create())
+    obj.run(_create())
 
 
 @agent.command()
@@ -151,17 +311,20 @@ def create(name: str, system_prompt: str, model: str, tools: Optional[str], url:
 @click.option("--stream", is_flag=True, help="启用流式输出")
 @click.option("--url", default="http://localhost:8000", help="API 地址")
 @click.option("--token", help="API 令牌")
-def chat(agent_id: str, message: str, stream: bool, url: str, token: Optional[str]):
+@click.pass_obj
+def chat(obj: CLIContext, agent_id: str, message: str, stream: bool, url: str, token: Optional[str]):
     """与 Agent 聊天"""
     async def _chat():
-        async with ModelVS3Client(url, token) as client:
-            click.echo(f"💬 与 Agent {agent_id[:8]}... 聊天:")
-            click.echo(f"👤 {message}")
-            
-            response = await quick_chat(client, agent_id, message, stream)
-            click.echo(f"🤖 {response}")
+        from src.utils.api_client import quick_chat
+        
+        client = await obj.client(url, token)
+        click.echo(f"💬 与 Agent {agent_id[:8]}... 聊天:")
+        click.echo(f"👤 {message}")
+        
+        response = await quick_chat(client, agent_id, message, stream)
+        click.echo(f"🤖 {response}")
     
-    asyncio.run(_chat())
+    obj.run(_chat())
 
 
 @cli.group()
@@ -173,26 +336,29 @@ def model():
 @model.command()
 @click.option("--url", default="http://localhost:8000", help="API 地址")
 @click.option("--token", help="API 令牌")
-def list_models(url: str, token: Optional[str]):
+@click.pass_obj
+def list_models(obj: CLIContext, url: str, token: Optional[str]):
     """列出所有模型"""
     async def _list():
-        async with ModelVS3Client(url, token) as client:
-            models = await client.get_models()
-            
-            if not models:
-                click.echo("📭 暂无模型")
-                return
+        client = await obj.client(url, token)
+        count = 0
+        
+        async for model in client.iter_models():
+            if count == 0:
+                click.echo("🤖 模型列表:")
+            count += 1
+            pricing = model.get("pricing")
+            price_info = f"${pricing.get('input', 0)}/{pricing.get('output', 0)}" if pricing else "无定价"
             
-            click.echo("🤖 模型列表:")
-            for model in models:
-                status_icon = "🟢" if model["enabled"] else "🔴"
-                pricing = model.get("pricing", {})
-                price_info = f"${pricing.get('input', 0)}/{pricing.get('output', 0)}" if pricing else "无定价"
-                
-                click.echo(f"  {status_icon} {model['name']} ({model['provider']})")
-                click.echo(f"     Context: {model['context_len']} tokens | Price: {price_info}")
+            click.echo(
+                f"  {STATUS_ICONS[bool(model['enabled'])]} {model['name']} ({model['provider']})\n"
+                f"     Context: {model['context_len']} tokens | Price: {price_info}"
+            )
+        
+        if not count:
+            click.echo("📭 暂无模型")
     
-    asyncio.run(_list())
+    obj.run(_list())
 
 
 @cli.group()
@@ -204,23 +370,26 @@ def tool():
 @tool.command()
 @click.option("--url", default="http://localhost:8000", help="API 地址")
 @click.option("--token", help="API 令牌")
-def list_tools(url: str, token: Optional[str]):
+@click.pass_obj
+def list_tools(obj: CLIContext, url: str, token: Optional[str]):
     """列出所有工具"""
     async def _list():
-        async with ModelVS3Client(url, token) as client:
-            tools = await client.get_tools()
-            
-            if not tools:
-                click.echo("📭 暂无工具")
-                return
-            
-            click.echo("🔧 工具列表:")
-            for tool in tools:
-                status_icon = "🟢" if tool["enabled"] else "🔴"
-                click.echo(f"  {status_icon} {tool['name']}")
-                click.echo(f"     {tool.get('description', '无描述')}")
+        client = await obj.client(url, token)
+        count = 0
+        
+        async for tool in client.iter_tools():
+            if count == 0:
+                click.echo("🔧 工具列表:")
+            count += 1
+            click.echo(
+                f"  {STATUS_ICONS[bool(tool['enabled'])]} {tool['name']}\n"
+                f"     {tool.get('description', '无描述')}"
+            )
+        
+        if not count:
+            click.echo("📭 暂无工具")
     
-    asyncio.run(_list())
+    obj.run(_list())
 
 
 @cli.group()
@@ -229,74 +398,110 @@ def deploy():
     pass
 
 
+def _docker_deploy():
+    """构建镜像并启动服务，在独立的工作进程中运行"""
+    # 构建镜像
+    click.echo("📦 构建 Docker 镜像...")
+    subprocess.run(["docker", "build", "-t", "modelvs3:latest", "."], check=True)
+    
+    # 启动服务
+    click.echo("🚀 启动服务...")
+    subprocess.run(["docker-compose", "up", "-d"], check=True)
+
+
 @deploy.command()
 @click.option("--env", default="production", help="部署环境")
-def docker(env: str):
+@click.pass_obj
+def docker(obj: CLIContext, env: str):
     """使用 Docker 部署"""
     click.echo(f"🐳 正在使用 Docker 部署到 {env} 环境...")
     
-    try:
-        # 构建镜像
-        click.echo("📦 构建 Docker 镜像...")
-        subprocess.run(["docker", "build", "-t", "modelvs3:latest", "."], check=True)
-        
-        # 启动服务
-        click.echo("🚀 启动服务...")
-        subprocess.run(["docker-compose", "up", "-d"], check=True)
-        
-        click.echo("✅ 部署完成！")
-        click.echo("🌐 访问地址: http://localhost:8000")
-        click.echo("📊 监控地址: http://localhost:3000")
-        
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ 部署失败: {e}")
+    async def _deploy():
+        try:
+            # 构建可能持续数分钟，放到独立进程中执行，与调用方的事件循环完全隔离
+            loop = asyncio.get_running_loop()
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                await loop.run_in_executor(pool, _docker_deploy)
+            
+            click.echo("✅ 部署完成！")
+            click.echo("🌐 访问地址: http://localhost:8000")
+            click.echo("📊 监控地址: http://localhost:3000")
+            
+        except subprocess.CalledProcessError as e:
+            click.echo(f"❌ 部署失败: {e}")
+    
+    obj.run(_deploy())
 
 
 @deploy.command()
-def status():
+@click.pass_obj
+def status(obj: CLIContext):
     """查看部署状态"""
     click.echo("📊 检查部署状态...")
     
-    try:
-        result = subprocess.run(["docker-compose", "ps"], capture_output=True, text=True)
-        click.echo(result.stdout)
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ 获取状态失败: {e}")
+    async def _status():
+        try:
+            output = await _arun("docker-compose", "ps", capture_output=True, check=False)
+            click.echo(output)
+        except subprocess.CalledProcessError as e:
+            click.echo(f"❌ 获取状态失败: {e}")
+    
+    obj.run(_status())
 
 
 @deploy.command()
-def logs():
+@click.pass_obj
+def logs(obj: CLIContext):
     """查看部署日志"""
     click.echo("📋 查看部署日志...")
     
+    async def _logs():
+        args = ("docker-compose", "logs", "-f")
+        proc = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+        )
+        try:
+            # 逐行转发，日志跟踪期间事件循环仍可调度其他任务
+            async for line in proc.stdout:
+                click.echo(line.decode(errors="replace"), nl=False)
+            await proc.wait()
+        finally:
+            if proc.returncode is None:
+                proc.terminate()
+                await proc.wait()
+        
+        if proc.returncode:
+            click.echo(f"❌ 获取日志失败: {subprocess.CalledProcessError(proc.returncode, args)}")
+    
     try:
-        subprocess.run(["docker-compose", "logs", "-f"], check=True)
+        obj.run(_logs())
     except KeyboardInterrupt:
         click.echo("\n✅ 停止查看日志")
-    except subprocess.CalledProcessError as e:
-        click.echo(f"❌ 获取日志失败: {e}")
 
 
 @cli.command()
 @click.option("--url", default="http://localhost:8000", help="API 地址")
-def health(url: str):
+@click.option("--no-cache", is_flag=True, help="忽略缓存的健康检查结果")
+@click.option("--simple", is_flag=True, help="只检查服务存活，不探测数据库等依赖")
+@click.pass_obj
+def health(obj: CLIContext, url: str, no_cache: bool, simple: bool):
     """健康检查"""
     async def _health():
         try:
-            async with ModelVS3Client(url) as client:
-                status = await client.health_check()
+            client = await obj.client(url)
+            status = await client.health_check(bypass_cache=no_cache, simple=simple)
+            
+            if status.get("status") == "healthy":
+                click.echo("✅ 服务运行正常")
+                click.echo(f"   版本: {status.get('version', 'unknown')}")
+                click.echo(f"   时间: {status.get('timestamp', 'unknown')}")
+            else:
+                click.echo("⚠️  服务状态异常")
                 
-                if status.get("status") == "healthy":
-                    click.echo("✅ 服务运行正常")
-                    click.echo(f"   版本: {status.get('version', 'unknown')}")
-                    click.echo(f"   时间: {status.get('timestamp', 'unknown')}")
-                else:
-                    click.echo("⚠️  服务状态异常")
-                    
         except Exception as e:
             click.echo(f"❌ 服务不可用: {e}")
     
-    asyncio.run(_health())
+    obj.run(_health())
 
 
 @cli.command()
@@ -10,9 +10,14 @@
 """
 
 import asyncio
+import hashlib
+import io
 import json
 import sys
 import os
+from typing import Any, Dict
+
+import httpx
 
 # 添加项目根目录到 Python 路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -20,18 +25,57 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.core.llm_adapters import OpenAICompatibleAdapter
 
 
-async def test_ollama():
-    """测试 Ollama 本地模型"""
-    print("🦙 测试 Ollama 本地模型...")
+# 同时发往本地推理服务的请求数上限，避免单卡服务被并发请求拖慢
+MAX_CONCURRENT_REQUESTS = 4
+_request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# 进行中的请求，相同端点和参数的并发请求共用一个结果
+_inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+
+async def chat_completion(adapter: OpenAICompatibleAdapter, **kwargs: Any) -> Dict[str, Any]:
+    """限制并发并合并重复请求的 chat_completion"""
+    key = hashlib.blake2b(
+        json.dumps([adapter.endpoint, adapter.model_name, kwargs], sort_keys=True).encode()
+    ).hexdigest()
     
-    adapter = OpenAICompatibleAdapter(
+    if key in _inflight:
+        return await asyncio.shield(_inflight[key])
+    
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        async with _request_semaphore:
+            result = await adapter.chat_completion(**kwargs)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        # 没有其他等待者时避免 "exception was never retrieved" 警告
+        future.exception()
+        raise
+    finally:
+        del _inflight[key]
+
+
+def build_ollama_adapter(http: httpx.AsyncClient) -> OpenAICompatibleAdapter:
+    """创建 Ollama 适配器，普通对话和工具调用测试共用"""
+    return OpenAICompatibleAdapter(
         model_name="llama2:7b",
         endpoint="http://localhost:11434/v1/chat/completions",
-        provider="ollama"
+        provider="ollama",
+        http_client=http
     )
+
+
+async def test_ollama(adapter: OpenAICompatibleAdapter) -> str:
+    """测试 Ollama 本地模型"""
+    out = io.StringIO()
+    print("🦙 测试 Ollama 本地模型...", file=out)
     
     try:
-        response = await adapter.chat_completion(
+        response = await chat_completion(
+            adapter,
             messages=[
                 {"role": "user", "content": "Hello! Please respond briefly."}
             ],
@@ -39,27 +83,32 @@ async def test_ollama():
             max_tokens=50
         )
         
-        print("✅ Ollama 响应成功:")
-        print(f"   Content: {response.get('content', 'No content')}")
-        print(f"   Model: {response.get('model', 'Unknown')}")
+        print("✅ Ollama 响应成功:", file=out)
+        print(f"   Content: {response.get('content', 'No content')}", file=out)
+        print(f"   Model: {response.get('model', 'Unknown')}", file=out)
         
     except Exception as e:
-        print(f"❌ Ollama 连接失败: {str(e)}")
-        print("   请确保 Ollama 服务正在运行: ollama serve")
+        print(f"❌ Ollama 连接失败: {str(e)}", file=out)
+        print("   请确保 Ollama 服务正在运行: ollama serve", file=out)
+
+    return out.getvalue()
 
 
-async def test_localai():
+async def test_localai(http: httpx.AsyncClient) -> str:
     """测试 LocalAI"""
-    print("\n🤖 测试 LocalAI...")
+    out = io.StringIO()
+    print("\n🤖 测试 LocalAI...", file=out)
     
     adapter = OpenAICompatibleAdapter(
         model_name="gpt-3.5-turbo",
         endpoint="http://localhost:8080/v1/chat/completions",
-        provider="localai"
+        provider="localai",
+        http_client=http
     )
     
     try:
-        response = await adapter.chat_completion(
+        response = await chat_completion(
+            adapter,
             messages=[
                 {"role": "user", "content": "Hello! Please respond briefly."}
             ],
@@ -67,27 +116,32 @@ async def test_localai():
             max_tokens=50
         )
         
-        print("✅ LocalAI 响应成功:")
-        print(f"   Content: {response.get('content', 'No content')}")
-        print(f"   Model: {response.get('model', 'Unknown')}")
+        print("✅ LocalAI 响应成功:", file=out)
+        print(f"   Content: {response.get('content', 'No content')}", file=out)
+        print(f"   Model: {response.get('model', 'Unknown')}", file=out)
         
     except Exception as e:
-        print(f"❌ LocalAI 连接失败: {str(e)}")
-        print("   请确保 LocalAI 服务正在运行")
+        print(f"❌ LocalAI 连接失败: {str(e)}", file=out)
+        print("   请确保 LocalAI 服务正在运行", file=out)
+
+    return out.getvalue()
 
 
-async def test_vllm():
+async def test_vllm(http: httpx.AsyncClient) -> str:
     """测试 vLLM 推理服务器"""
-    print("\n⚡ 测试 vLLM...")
+    out = io.StringIO()
+    print("\n⚡ 测试 vLLM...", file=out)
     
     adapter = OpenAICompatibleAdapter(
         model_name="microsoft/DialoGPT-medium",
         endpoint="http://localhost:8000/v1/chat/completions",
-        provider="vllm"
+        provider="vllm",
+        http_client=http
     )
     
     try:
-        response = await adapter.chat_completion(
+        response = await chat_completion(
+            adapter,
             messages=[
                 {"role": "user", "content": "Hello! Please respond briefly."}
             ],
@@ -95,18 +149,21 @@ async def test_vllm():
             max_tokens=50
         )
         
-        print("✅ vLLM 响应成功:")
-        print(f"   Content: {response.get('content', 'No content')}")
-        print(f"   Model: {response.get('model', 'Unknown')}")
+        print("✅ vLLM 响应成功:", file=out)
+        print(f"   Content: {response.get('content', 'No content')}", file=out)
+        print(f"   Model: {response.get('model', 'Unknown')}", file=out)
         
     except Exception as e:
-        print(f"❌ vLLM 连接失败: {str(e)}")
-        print("   请确保 vLLM 服务正在运行")
+        print(f"❌ vLLM 连接失败: {str(e)}", file=out)
+        print("   请确保 vLLM 服务正在运行", file=out)
 
+    return out.getvalue()
 
-async def test_custom_api():
+
+async def test_custom_api(http: httpx.AsyncClient) -> str:
     """测试自定义 API（带自定义 headers）"""
-    print("\n🔧 测试自定义 API...")
+    out = io.StringIO()
+    print("\n🔧 测试自定义 API...", file=out)
     
     custom_headers = {
         "X-Custom-Auth": "my-secret-token",
@@ -117,11 +174,13 @@ async def test_custom_api():
         model_name="custom-model",
         endpoint="http://localhost:9000/v1/chat/completions",
         provider="custom",
-        custom_headers=custom_headers
+        custom_headers=custom_headers,
+        http_client=http
     )
     
     try:
-        response = await adapter.chat_completion(
+        response = await chat_completion(
+            adapter,
             messages=[
                 {"role": "user", "content": "Hello! Please respond briefly."}
             ],
@@ -129,25 +188,21 @@ async def test_custom_api():
             max_tokens=50
         )
         
-        print("✅ 自定义 API 响应成功:")
-        print(f"   Content: {response.get('content', 'No content')}")
-        print(f"   Model: {response.get('model', 'Unknown')}")
+        print("✅ 自定义 API 响应成功:", file=out)
+        print(f"   Content: {response.get('content', 'No content')}", file=out)
+        print(f"   Model: {response.get('model', 'Unknown')}", file=out)
         
     except Exception as e:
-        print(f"❌ 自定义 API 连接失败: {str(e)}")
-        print("   请确保您的自定义 API 服务正在运行")
+        print(f"❌ 自定义 API 连接失败: {str(e)}", file=out)
+        print("   请确保您的自定义 API 服务正在运行", file=out)
 
+    return out.getvalue()
 
-async def test_tool_calling():
-    """测试工具调用功能"""
-    print("\n🔨 测试工具调用...")
-    
-    # 使用 Ollama 测试工具调用
-    adapter = OpenAICompatibleAdapter(
-        model_name="llama2:7b",
-        endpoint="http://localhost:11434/v1/chat/completions",
-        provider="ollama"
-    )
+
+async def test_tool_calling(adapter: OpenAICompatibleAdapter) -> str:
+    """测试工具调用功能（使用 Ollama）"""
+    out = io.StringIO()
+    print("\n🔨 测试工具调用...", file=out)
     
     tools = [
         {
@@ -170,7 +225,8 @@ async def test_tool_calling():
     ]
     
     try:
-        response = await adapter.chat_completion(
+        response = await chat_completion(
+            adapter,
             messages=[
                 {"role": "user", "content": "请计算 15 + 27 = ?"}
             ],
@@ -179,14 +235,16 @@ async def test_tool_calling():
             tools=tools
         )
         
-        print("✅ 工具调用测试:")
+        print("✅ 工具调用测试:", file=out)
         if response.get("tool_calls"):
-            print(f"   工具调用: {response['tool_calls']}")
+            print(f"   工具调用: {response['tool_calls']}", file=out)
         else:
-            print(f"   普通响应: {response.get('content', 'No content')}")
+            print(f"   普通响应: {response.get('content', 'No content')}", file=out)
         
     except Exception as e:
-        print(f"❌ 工具调用测试失败: {str(e)}")
+        print(f"❌ 工具调用测试失败: {str(e)}", file=out)
+
+    return out.getvalue()
 
 
 def print_setup_instructions():
@@ -223,12 +281,24 @@ async def main():
     print("开始测试本地模型连接...")
     print("=" * 50)
     
-    # 按顺序测试各种本地模型配置
-    await test_ollama()
-    await test_localai() 
-    await test_vllm()
-    await test_custom_api()
-    await test_tool_calling()
+    # 各服务互不依赖，并发测试；每个测试把输出写入自己的缓冲区，
+    # 全部完成后再按固定顺序打印，避免输出交错
+    # 所有适配器共用一个 httpx 客户端，同一端点的请求复用连接
+    async with httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=32)) as http:
+        ollama = build_ollama_adapter(http)
+        tests = [
+            test_ollama(ollama),
+            test_localai(http),
+            test_vllm(http),
+            test_custom_api(http),
+            test_tool_calling(ollama),
+        ]
+        results = await asyncio.gather(*tests, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            print(f"❌ 测试异常: {result}")
+        else:
+            print(result, end="")
     
     print("\n" + "=" * 50)
     print("✨ 测试完成！")
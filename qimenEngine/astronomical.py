@@ -3,7 +3,11 @@
 基于精确天文算法实现节气计算、时差方程、真太阳时等功能
 """
 
+import json
 import math
+import os
+import tempfile
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from typing import Dict, Tuple, List, Optional
 from functools import lru_cache
@@ -13,14 +17,238 @@ try:
 except ImportError:
     from .symbols import SOLAR_TERMS
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+_EPOCH_2000 = 2451545.0         # J2000.0历元（儒略日数）
+_DEG_TO_RAD = math.pi / 180     # 度转弧度
+
+# 时差方程中的 tan²(ε/2)，黄赤交角 ε 取 23.439°
+_EOT_Y = math.tan(23.439 * _DEG_TO_RAD / 2) ** 2
+
+
+def _jit(func):
+    """安装了 numba 时编译为机器码，否则原样返回
+
+    numba 的磁盘缓存记录了模块名，本模块既可能作为 qimenEngine.astronomical
+    导入，也可能在 qimenEngine 目录下作为 astronomical 导入，两者共用同一个
+    缓存文件会导致加载失败，因此只在包内导入时启用磁盘缓存。
+    """
+    if NUMBA_AVAILABLE:
+        return njit(cache=bool(__package__), fastmath=True)(func)
+    return func
+
+
+@_jit
+def _solar_longitude_impl(julian_day: float) -> float:
+    """太阳黄经计算内核（度），见 AstronomicalCalculator.calculate_solar_longitude"""
+    # 计算自J2000.0以来的儒略世纪数
+    T = (julian_day - _EPOCH_2000) / 36525.0
+    
+    # 平太阳平近点角（度）
+    M = 357.52911 + 35999.05029 * T - 0.0001537 * T * T
+    M = M % 360
+    
+    # 平黄经（度）
+    L0 = 280.46646 + 36000.76983 * T + 0.0003032 * T * T
+    L0 = L0 % 360
+    
+    # 近点角修正
+    C = (1.914602 - 0.004817 * T - 0.000014 * T * T) * math.sin(M * _DEG_TO_RAD) + \
+        (0.019993 - 0.000101 * T) * math.sin(2 * M * _DEG_TO_RAD) + \
+        0.000289 * math.sin(3 * M * _DEG_TO_RAD)
+    
+    # 真黄经
+    L = L0 + C
+    L = L % 360
+    
+    return L
+
+
+@_jit
+def _solar_longitude_rate_impl(julian_day: float) -> float:
+    """太阳黄经变化率内核（度/日），即 _solar_longitude_impl 对儒略日的解析导数"""
+    T = (julian_day - _EPOCH_2000) / 36525.0
+    
+    M_rad = (357.52911 + 35999.05029 * T - 0.0001537 * T * T) * _DEG_TO_RAD
+    dM = 35999.05029 - 2 * 0.0001537 * T
+    dL0 = 36000.76983 + 2 * 0.0003032 * T
+    
+    # 近点角修正 C 对 T 的导数（含系数随 T 的变化）
+    dC = ((1.914602 - 0.004817 * T - 0.000014 * T * T) * math.cos(M_rad) +
+          2 * (0.019993 - 0.000101 * T) * math.cos(2 * M_rad) +
+          3 * 0.000289 * math.cos(3 * M_rad)) * _DEG_TO_RAD * dM + \
+        (-0.004817 - 2 * 0.000014 * T) * math.sin(M_rad) - \
+        0.000101 * math.sin(2 * M_rad)
+    
+    return (dL0 + dC) / 36525.0
+
+
+@_jit
+def _equation_of_time_impl(julian_day: float) -> float:
+    """时差方程计算内核（分钟），见 AstronomicalCalculator.calculate_equation_of_time"""
+    # 计算自J2000.0以来的天数
+    n = julian_day - _EPOCH_2000
+    
+    # 平黄经（度）
+    L = (280.4665 + 0.98564736 * n) % 360
+    
+    # 平近点角（度）
+    g = (357.5291 + 0.98560028 * n) % 360
+    
+    # 转换为弧度
+    L_rad = L * _DEG_TO_RAD
+    g_rad = g * _DEG_TO_RAD
+    
+    # 每个角度只求一次正余弦，倍角由倍角公式推出
+    sin_L = math.sin(L_rad)
+    cos_L = math.cos(L_rad)
+    sin_g = math.sin(g_rad)
+    cos_g = math.cos(g_rad)
+    sin_2L = 2 * sin_L * cos_L
+    cos_2L = 1 - 2 * sin_L * sin_L
+    sin_4L = 2 * sin_2L * cos_2L
+    sin_2g = 2 * sin_g * cos_g
+    
+    # 时差方程计算（分钟）
+    # 这是一个简化但精确的时差方程公式
+    y = _EOT_Y
+    
+    E = y * sin_2L - 2 * 0.0167 * sin_g + \
+        4 * 0.0167 * y * sin_g * cos_2L - \
+        0.5 * y * y * sin_4L - \
+        1.25 * (0.0167 ** 2) * sin_2g
+    
+    # 转换为分钟（1弧度 = 229.18分钟）
+    return E * 229.18
+
+
+def _solar_longitude_vec(julian_days: "np.ndarray") -> "np.ndarray":
+    """
+    批量计算太阳黄经，与 calculate_solar_longitude 公式相同
+    
+    Args:
+        julian_days: 儒略日数数组
+        
+    Returns:
+        np.ndarray: 太阳黄经数组（度）
+    """
+    T = (julian_days - AstronomicalCalculator.EPOCH_2000) / 36525.0
+    
+    M = (357.52911 + 35999.05029 * T - 0.0001537 * T * T) % 360
+    L0 = (280.46646 + 36000.76983 * T + 0.0003032 * T * T) % 360
+    
+    M_rad = np.deg2rad(M)
+    C = (1.914602 - 0.004817 * T - 0.000014 * T * T) * np.sin(M_rad) + \
+        (0.019993 - 0.000101 * T) * np.sin(2 * M_rad) + \
+        0.000289 * np.sin(3 * M_rad)
+    
+    return (L0 + C) % 360
+
+
+def _solar_longitude_rate_vec(julian_days: "np.ndarray") -> "np.ndarray":
+    """批量计算太阳黄经变化率（度/日），与 _solar_longitude_rate_impl 公式相同"""
+    T = (julian_days - AstronomicalCalculator.EPOCH_2000) / 36525.0
+    
+    M_rad = np.deg2rad(357.52911 + 35999.05029 * T - 0.0001537 * T * T)
+    dM = 35999.05029 - 2 * 0.0001537 * T
+    dL0 = 36000.76983 + 2 * 0.0003032 * T
+    
+    dC = ((1.914602 - 0.004817 * T - 0.000014 * T * T) * np.cos(M_rad) +
+          2 * (0.019993 - 0.000101 * T) * np.cos(2 * M_rad) +
+          3 * 0.000289 * np.cos(3 * M_rad)) * (math.pi / 180) * dM + \
+        (-0.004817 - 2 * 0.000014 * T) * np.sin(M_rad) - \
+        0.000101 * np.sin(2 * M_rad)
+    
+    return (dL0 + dC) / 36525.0
+
+
+@lru_cache(maxsize=4096)
+def _jdn(year: int, month: int, day: int) -> int:
+    """公历日期对应的儒略日编号（整数部分）"""
+    a = (14 - month) // 12
+    y = year + 4800 - a
+    m = month + 12 * a - 3
+    return day + (153 * m + 2) // 5 + 365 * y + y // 4 - y // 100 + y // 400 - 32045
+
+
+# 以下缓存定义为模块级函数而非方法，避免 lru_cache 持有实例引用
+
+@lru_cache(maxsize=8192)
+def _julian_day(dt: datetime) -> float:
+    """naive datetime 的儒略日数，见 AstronomicalCalculator.julian_day"""
+    # 日期部分查表，加上时间部分
+    return _jdn(dt.year, dt.month, dt.day) + (dt.hour - 12) / 24.0 + dt.minute / 1440.0 + dt.second / 86400.0
+
+
+@lru_cache(maxsize=4096)
+def _cached_solar_longitude(julian_day: float) -> float:
+    """带缓存的太阳黄经，见 AstronomicalCalculator.calculate_solar_longitude"""
+    return _solar_longitude_impl(julian_day)
+
+
+@lru_cache(maxsize=8)
+def _sorted_solar_terms(year: int) -> Tuple[List[datetime], List[Tuple[str, int, datetime]], Tuple[str, int, datetime]]:
+    """
+    按时间排序的当年节气表，每年只构建一次，节气时间由全局 astro_calculator 求得
+    
+    Returns:
+        (节气时间列表, 对应的(节气名称, 索引, 时间)列表, 早于所有节气时使用的前一年大寒)
+    """
+    # 获取当年和前一年的节气
+    current_year_terms = astro_calculator.calculate_all_solar_terms(year)
+    prev_year_terms = astro_calculator.calculate_all_solar_terms(year - 1)
+    
+    # 合并所有相关节气
+    all_terms = []
+    
+    # 添加前一年的小寒、大寒（可能在当年1月）
+    for term_name in ["小寒", "大寒"]:
+        term_time = prev_year_terms[term_name]
+        if term_time.year == year:
+            all_terms.append((term_name, SOLAR_TERMS.index(term_name), term_time))
+    
+    # 添加当年所有节气
+    for term_index, term_name in enumerate(SOLAR_TERMS):
+        all_terms.append((term_name, term_index, current_year_terms[term_name]))
+    
+    # 按时间排序
+    all_terms.sort(key=lambda x: x[2])
+    
+    prev_dahan = ("大寒", SOLAR_TERMS.index("大寒"), prev_year_terms["大寒"])
+    return [term[2] for term in all_terms], all_terms, prev_dahan
+
+
+# 最近求得的各节气时间 {节气名称: (年份, 时间)}，作为相邻年份迭代求解的起点
+_term_time_hints: Dict[str, Tuple[int, datetime]] = {}
+
+# 超过该年数的旧解不再作为起点
+TERM_HINT_MAX_YEARS = 10
+
+# 节气磁盘缓存目录，可通过环境变量 QIMEN_CACHE_DIR 覆盖
+SOLAR_TERM_CACHE_DIR = os.getenv("QIMEN_CACHE_DIR", os.path.expanduser("~/.qimen/cache"))
+
+# 节气算法或精度变化时递增，使旧的磁盘缓存失效
+SOLAR_TERM_CACHE_VERSION = 1
+
 
 class AstronomicalCalculator:
     """天文算法计算器"""
     
     # 天文常数
     TROPICAL_YEAR = 365.24219    # 回归年长度（天）
-    EPOCH_2000 = 2451545.0       # J2000.0历元（儒略日数）
-    DEG_TO_RAD = math.pi / 180   # 度转弧度
+    EPOCH_2000 = _EPOCH_2000     # J2000.0历元（儒略日数）
+    DEG_TO_RAD = _DEG_TO_RAD     # 度转弧度
     RAD_TO_DEG = 180 / math.pi   # 弧度转度
     
     # 节气对应的太阳黄经（度）
@@ -47,19 +275,9 @@ class AstronomicalCalculator:
         # 确保使用naive datetime
         if dt.tzinfo is not None:
             dt = dt.replace(tzinfo=None)
-            
-        a = (14 - dt.month) // 12
-        y = dt.year + 4800 - a
-        m = dt.month + 12 * a - 3
-        
-        jdn = dt.day + (153 * m + 2) // 5 + 365 * y + y // 4 - y // 100 + y // 400 - 32045
-        
-        # 加上时间部分
-        jd = jdn + (dt.hour - 12) / 24.0 + dt.minute / 1440.0 + dt.second / 86400.0
         
-        return jd
+        return _julian_day(dt)
     
-    @lru_cache(maxsize=100)
     def calculate_solar_longitude(self, julian_day: float) -> float:
         """
         计算太阳黄经
@@ -70,42 +288,27 @@ class AstronomicalCalculator:
         Returns:
             float: 太阳黄经（度）
         """
-        # 计算自J2000.0以来的天数
-        T = (julian_day - self.EPOCH_2000) / 36525.0
-        
-        # 平太阳平近点角（度）
-        M = 357.52911 + 35999.05029 * T - 0.0001537 * T * T
-        M = M % 360
-        
-        # 平黄经（度）
-        L0 = 280.46646 + 36000.76983 * T + 0.0003032 * T * T
-        L0 = L0 % 360
-        
-        # 近点角修正
-        C = (1.914602 - 0.004817 * T - 0.000014 * T * T) * math.sin(M * self.DEG_TO_RAD) + \
-            (0.019993 - 0.000101 * T) * math.sin(2 * M * self.DEG_TO_RAD) + \
-            0.000289 * math.sin(3 * M * self.DEG_TO_RAD)
-        
-        # 真黄经
-        L = L0 + C
-        L = L % 360
-        
-        return L
+        return _cached_solar_longitude(julian_day)
     
-    def find_solar_term_time(self, year: int, term_name: str) -> datetime:
+    def _estimate_solar_term_time(self, year: int, term_name: str) -> datetime:
         """
-        精确计算节气时间
+        估算节气的初始时间，作为迭代求解的起点
+        
+        优先使用最近求得的相邻年份同一节气的时间，否则按平均值估算。
         
         Args:
             year: 年份
             term_name: 节气名称
             
         Returns:
-            datetime: 精确的节气时间（naive datetime）
+            datetime: 估算的节气时间
         """
-        target_longitude = self.SOLAR_TERMS_LONGITUDE[term_name]
+        hint = _term_time_hints.get(term_name)
+        if hint is not None and 0 < abs(year - hint[0]) <= TERM_HINT_MAX_YEARS:
+            # 节气每年只漂移几十秒，用相邻年份的解加整数个回归年作起点
+            hint_year, hint_time = hint
+            return hint_time + timedelta(days=(year - hint_year) * self.TROPICAL_YEAR)
         
-        # 估算初始时间（基于平均值）
         term_index = SOLAR_TERMS.index(term_name)
         approx_day = 6 + (term_index % 2) * 15 + (term_index // 2) * 30
         if term_index >= 20:  # 小寒、大寒在次年1月
@@ -116,11 +319,23 @@ class AstronomicalCalculator:
         if month == 0:
             month = 12
         
-        # 初始估算
-        initial_dt = datetime(year, month, min(approx_day, 28))
+        return datetime(year, month, min(approx_day, 28))
+    
+    def find_solar_term_time(self, year: int, term_name: str) -> datetime:
+        """
+        精确计算节气时间
+        
+        Args:
+            year: 年份
+            term_name: 节气名称
+            
+        Returns:
+            datetime: 精确的节气时间（naive datetime）
+        """
+        target_longitude = self.SOLAR_TERMS_LONGITUDE[term_name]
         
         # 使用牛顿迭代法精确求解
-        dt = initial_dt
+        dt = self._estimate_solar_term_time(year, term_name)
         for _ in range(10):  # 最多迭代10次
             jd = self.julian_day(dt)
             current_longitude = self.calculate_solar_longitude(jd)
@@ -132,14 +347,15 @@ class AstronomicalCalculator:
             elif diff < -180:
                 diff += 360
             
-            # 收敛判断
+            # 用当前位置的黄经变化率（约0.95~1.02度/日）做牛顿修正，二次收敛
+            day_correction = diff / _solar_longitude_rate_impl(jd)
+            dt = dt + timedelta(days=day_correction)
+            
+            # 收敛判断：最后一步修正也已应用，结果与起点无关
             if abs(diff) < 0.0001:  # 精度约0.36秒
                 break
-            
-            # 太阳平均每天移动约0.9856度
-            day_correction = diff / 0.9856
-            dt = dt + timedelta(days=day_correction)
         
+        _term_time_hints[term_name] = (year, dt)
         return dt
     
     @lru_cache(maxsize=50)
@@ -147,12 +363,64 @@ class AstronomicalCalculator:
         """
         计算一年所有节气的精确时间
         
+        结果只与年份有关，启用缓存时会写入磁盘，进程重启后直接读取。
+        
         Args:
             year: 年份
             
         Returns:
             Dict[str, datetime]: 节气名称到时间的映射（所有datetime都是naive）
         """
+        if self.cache_enabled:
+            solar_terms = self._load_solar_terms(year)
+            if solar_terms is not None:
+                return solar_terms
+        
+        solar_terms = self._compute_all_solar_terms(year)
+        
+        if self.cache_enabled:
+            self._save_solar_terms(year, solar_terms)
+        
+        return solar_terms
+    
+    def _solar_terms_cache_path(self, year: int) -> str:
+        """节气磁盘缓存文件路径"""
+        return os.path.join(SOLAR_TERM_CACHE_DIR, f"solar_terms_v{SOLAR_TERM_CACHE_VERSION}_{year}.json")
+    
+    def _load_solar_terms(self, year: int) -> Optional[Dict[str, datetime]]:
+        """从磁盘缓存读取节气，文件不存在或内容无效时返回None"""
+        try:
+            with open(self._solar_terms_cache_path(year), encoding="utf-8") as f:
+                data = json.load(f)
+            solar_terms = {term_name: datetime.fromisoformat(data[term_name]) for term_name in SOLAR_TERMS}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        
+        for term_name, term_time in solar_terms.items():
+            _term_time_hints[term_name] = (year, term_time)
+        return solar_terms
+    
+    def _save_solar_terms(self, year: int, solar_terms: Dict[str, datetime]) -> None:
+        """将节气写入磁盘缓存，先写临时文件再原子替换，写入失败时忽略"""
+        data = {term_name: term_time.isoformat() for term_name, term_time in solar_terms.items()}
+        try:
+            os.makedirs(SOLAR_TERM_CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=SOLAR_TERM_CACHE_DIR, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self._solar_terms_cache_path(year))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+    
+    def _compute_all_solar_terms(self, year: int) -> Dict[str, datetime]:
+        """迭代求解一年所有节气，安装了 NumPy 时24个节气同时求解"""
+        if NUMPY_AVAILABLE:
+            return self._calculate_all_solar_terms_vec(year)
+        
         solar_terms = {}
         
         for term_name in SOLAR_TERMS:
@@ -161,6 +429,40 @@ class AstronomicalCalculator:
         
         return solar_terms
     
+    def _calculate_all_solar_terms_vec(self, year: int) -> Dict[str, datetime]:
+        """
+        同时迭代求解24个节气，每轮只做一次数组化的三角函数计算
+        
+        迭代方式和收敛条件与 find_solar_term_time 相同，已收敛的节气不再修正。
+        """
+        initial_dts = [self._estimate_solar_term_time(year, term_name) for term_name in SOLAR_TERMS]
+        initial_jd = np.array([self.julian_day(dt) for dt in initial_dts])
+        target = np.array([self.SOLAR_TERMS_LONGITUDE[term_name] for term_name in SOLAR_TERMS], dtype=float)
+        
+        jd = initial_jd.copy()
+        active = np.ones(len(SOLAR_TERMS), dtype=bool)
+        for _ in range(10):  # 最多迭代10次
+            current = _solar_longitude_vec(jd)
+            
+            # 角度差归一化到 [-180, 180)
+            diff = (target - current + 180) % 360 - 180
+            
+            # 用当前位置的黄经变化率做牛顿修正；本轮已收敛的节气也应用最后一步
+            jd[active] += diff[active] / _solar_longitude_rate_vec(jd[active])
+            
+            active[active] = np.abs(diff[active]) >= 0.0001
+            if not active.any():
+                break
+        
+        solar_terms = {
+            term_name: initial_dt + timedelta(days=float(offset))
+            for term_name, initial_dt, offset in zip(SOLAR_TERMS, initial_dts, jd - initial_jd)
+        }
+        for term_name, term_time in solar_terms.items():
+            _term_time_hints[term_name] = (year, term_time)
+        
+        return solar_terms
+    
     def get_current_solar_term(self, dt: datetime) -> Tuple[str, int, datetime]:
         """
         获取当前时间的节气信息
@@ -174,44 +476,16 @@ class AstronomicalCalculator:
         # 确保使用naive datetime
         if dt.tzinfo is not None:
             dt = dt.replace(tzinfo=None)
-            
-        year = dt.year
-        
-        # 获取当年和前一年的节气
-        current_year_terms = self.calculate_all_solar_terms(year)
-        prev_year_terms = self.calculate_all_solar_terms(year - 1)
-        
-        # 合并所有相关节气
-        all_terms = []
         
-        # 添加前一年的小寒、大寒（可能在当年1月）
-        for term_name in ["小寒", "大寒"]:
-            term_time = prev_year_terms[term_name]
-            if term_time.year == year:
-                all_terms.append((term_name, SOLAR_TERMS.index(term_name), term_time))
-        
-        # 添加当年所有节气
-        for term_name in SOLAR_TERMS:
-            term_time = current_year_terms[term_name]
-            all_terms.append((term_name, SOLAR_TERMS.index(term_name), term_time))
-        
-        # 按时间排序
-        all_terms.sort(key=lambda x: x[2])
-        
-        # 找到当前时间对应的节气
-        current_term = None
-        for i, (term_name, term_index, term_time) in enumerate(all_terms):
-            if dt >= term_time:
-                current_term = (term_name, term_index, term_time)
-            else:
-                break
+        term_times, all_terms, prev_dahan = _sorted_solar_terms(dt.year)
         
-        if current_term is None:
+        # 二分查找最后一个不晚于当前时间的节气
+        idx = bisect_right(term_times, dt) - 1
+        if idx < 0:
             # 如果没有找到，说明在第一个节气之前，取前一年的大寒
-            prev_dahan = prev_year_terms["大寒"]
-            return ("大寒", SOLAR_TERMS.index("大寒"), prev_dahan)
+            return prev_dahan
         
-        return current_term
+        return all_terms[idx]
     
     def calculate_equation_of_time(self, julian_day: float) -> float:
         """
@@ -223,35 +497,7 @@ class AstronomicalCalculator:
         Returns:
             float: 时差（分钟）
         """
-        # 计算自J2000.0以来的天数
-        n = julian_day - self.EPOCH_2000
-        
-        # 平黄经（度）
-        L = (280.4665 + 0.98564736 * n) % 360
-        
-        # 平近点角（度）
-        g = (357.5291 + 0.98560028 * n) % 360
-        
-        # 转换为弧度
-        L_rad = L * self.DEG_TO_RAD
-        g_rad = g * self.DEG_TO_RAD
-        
-        # 黄赤交角（度，转弧度）
-        epsilon = 23.439 * self.DEG_TO_RAD
-        
-        # 时差方程计算（分钟）
-        # 这是一个简化但精确的时差方程公式
-        y = math.tan(epsilon / 2) ** 2
-        
-        E = y * math.sin(2 * L_rad) - 2 * 0.0167 * math.sin(g_rad) + \
-            4 * 0.0167 * y * math.sin(g_rad) * math.cos(2 * L_rad) - \
-            0.5 * y * y * math.sin(4 * L_rad) - \
-            1.25 * (0.0167 ** 2) * math.sin(2 * g_rad)
-        
-        # 转换为分钟（1弧度 = 229.18分钟）
-        E_minutes = E * 229.18
-        
-        return E_minutes
+        return _equation_of_time_impl(julian_day)
     
     def calculate_true_solar_time(self, dt: datetime, longitude: float = 116.4667) -> datetime:
         """
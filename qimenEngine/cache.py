@@ -5,6 +5,7 @@
 # type: ignore
 
 import hashlib
+import heapq
 import json
 import pickle
 import time
@@ -14,6 +15,7 @@ from functools import wraps, lru_cache
 from dataclasses import dataclass
 import threading
 import weakref
+from collections import OrderedDict
 
 try:
     import redis
@@ -21,6 +23,29 @@ try:
 except ImportError:
     REDIS_AVAILABLE = False
 
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# msgpack扩展类型编号：datetime以ISO格式字符串保存，保留时区信息
+_MSGPACK_DATETIME_EXT = 1
+
+
+def _msgpack_default(obj: Any) -> Any:
+    """msgpack无法直接编码的类型转换"""
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(_MSGPACK_DATETIME_EXT, obj.isoformat().encode("ascii"))
+    raise TypeError(f"无法序列化类型: {type(obj).__name__}")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    """还原msgpack扩展类型"""
+    if code == _MSGPACK_DATETIME_EXT:
+        return datetime.fromisoformat(data.decode("ascii"))
+    return msgpack.ExtType(code, data)
+
 
 @dataclass
 class CacheStats:
@@ -79,148 +104,115 @@ class CacheProtocol(Protocol):
         ...
 
 
-class LRUCacheNode:
-    """LRU缓存节点"""
-    
-    def __init__(self, key: str = "", value: Any = None):
-        self.key = key
-        self.value = value
-        self.expire_time: Optional[float] = None
-        self.prev: Optional['LRUCacheNode'] = None
-        self.next: Optional['LRUCacheNode'] = None
-
-
 class ThreadSafeLRUCache:
-    """线程安全的LRU缓存实现"""
+    """线程安全的LRU缓存实现
+    
+    基于 OrderedDict 维护访问顺序：末尾为最近使用，头部为最久未使用。
+    每个条目存储 (值, 过期时间) 元组。
+    """
     
     def __init__(self, max_size: int = 1000, default_ttl: Optional[int] = None):
         self.max_size = max_size
         self.default_ttl = default_ttl
-        self._cache: Dict[str, LRUCacheNode] = {}
+        self._cache: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
         self._stats = CacheStats(max_size=max_size)
-        self._lock = threading.RLock()
-        
-        # 创建双向链表头尾节点
-        self._head = LRUCacheNode()
-        self._tail = LRUCacheNode()
-        self._head.next = self._tail
-        self._tail.prev = self._head
-    
-    def _add_node(self, node: LRUCacheNode) -> None:
-        """在头部添加节点"""
-        node.prev = self._head
-        node.next = self._head.next
-        if self._head.next:
-            self._head.next.prev = node
-        self._head.next = node
-    
-    def _remove_node(self, node: LRUCacheNode) -> None:
-        """移除节点"""
-        if node.prev:
-            node.prev.next = node.next
-        if node.next:
-            node.next.prev = node.prev
-    
-    def _move_to_head(self, node: LRUCacheNode) -> None:
-        """移动节点到头部"""
-        self._remove_node(node)
-        self._add_node(node)
-    
-    def _pop_tail(self) -> Optional[LRUCacheNode]:
-        """移除尾部节点"""
-        last_node = self._tail.prev
-        if last_node and last_node != self._head:
-            self._remove_node(last_node)
-            return last_node
-        return None
+        self._lock = threading.Lock()
+        
+        # 过期时间小顶堆 (过期时间, 键)；条目被覆盖或删除后旧记录留在堆中，弹出时再核对
+        self._expiry_heap: List[Tuple[float, str]] = []
+        # 最早过期时间提前时通知等待中的清理线程
+        self._expiry_changed = threading.Event()
     
-    def _is_expired(self, node: LRUCacheNode) -> bool:
-        """检查节点是否过期"""
-        if node.expire_time is None:
+    @staticmethod
+    def _is_expired(expire_time: Optional[float]) -> bool:
+        """检查过期时间是否已到"""
+        if expire_time is None:
             return False
-        return time.time() > node.expire_time
+        return time.monotonic() > expire_time
     
     def get(self, key: str) -> Optional[Any]:
-        """获取缓存值"""
-        with self._lock:
-            node = self._cache.get(key)
-            if node is None:
-                self._stats.misses += 1
-                return None
-            
-            # 检查是否过期
-            if self._is_expired(node):
-                self.delete(key)
-                self._stats.misses += 1
-                return None
-            
-            # 移动到头部（最近使用）
-            self._move_to_head(node)
-            self._stats.hits += 1
-            return node.value
+        """获取缓存值
+        
+        读路径不加锁：OrderedDict 的 get/move_to_end 均为单次C调用，在GIL下是原子的。
+        代价是并发读时命中/未命中计数可能丢失少量增量，统计仅作参考。
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+        
+        value, expire_time = entry
+        # 检查是否过期
+        if self._is_expired(expire_time):
+            with self._lock:
+                # 只删除读到的那个条目，避免误删其他线程刚写入的新值
+                if self._cache.get(key) is entry:
+                    self._delete_locked(key)
+            self._stats.misses += 1
+            return None
+        
+        # 移动到末尾（最近使用）；条目可能已被其他线程删除或淘汰
+        try:
+            self._cache.move_to_end(key)
+        except KeyError:
+            pass
+        self._stats.hits += 1
+        return value
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """设置缓存值"""
         with self._lock:
-            node = self._cache.get(key)
-            
-            # 计算过期时间
+            # 计算过期时间（单调时钟，不受系统时间调整影响）
             expire_time = None
             if ttl is not None:
-                expire_time = time.time() + ttl
+                expire_time = time.monotonic() + ttl
             elif self.default_ttl is not None:
-                expire_time = time.time() + self.default_ttl
+                expire_time = time.monotonic() + self.default_ttl
             
-            if node:
-                # 更新现有节点
-                node.value = value
-                node.expire_time = expire_time
-                self._move_to_head(node)
+            if key in self._cache:
+                # 更新现有条目
+                self._cache.move_to_end(key)
+                self._cache[key] = (value, expire_time)
             else:
-                # 创建新节点
-                new_node = LRUCacheNode(key, value)
-                new_node.expire_time = expire_time
-                
-                self._cache[key] = new_node
-                self._add_node(new_node)
+                self._cache[key] = (value, expire_time)
                 
-                # 检查是否超过最大容量
+                # 检查是否超过最大容量，淘汰最久未使用的条目
                 if len(self._cache) > self.max_size:
-                    tail = self._pop_tail()
-                    if tail:
-                        del self._cache[tail.key]
-                        self._stats.deletes += 1
+                    self._cache.popitem(last=False)
+                    self._stats.deletes += 1
+            
+            if expire_time is not None:
+                self._push_expiry(expire_time, key)
             
             self._stats.sets += 1
             self._stats.size = len(self._cache)
             return True
     
+    def _delete_locked(self, key: str) -> bool:
+        """删除缓存值（调用方持有锁）"""
+        if self._cache.pop(key, None) is not None:
+            self._stats.deletes += 1
+            self._stats.size = len(self._cache)
+            return True
+        return False
+    
     def delete(self, key: str) -> bool:
         """删除缓存值"""
         with self._lock:
-            node = self._cache.get(key)
-            if node:
-                self._remove_node(node)
-                del self._cache[key]
-                self._stats.deletes += 1
-                self._stats.size = len(self._cache)
-                return True
-            return False
+            return self._delete_locked(key)
     
     def clear(self) -> bool:
         """清空缓存"""
         with self._lock:
             self._cache.clear()
-            self._head.next = self._tail
-            self._tail.prev = self._head
             self._stats.size = 0
             return True
     
     def exists(self, key: str) -> bool:
         """检查键是否存在"""
         with self._lock:
-            node = self._cache.get(key)
-            if node and not self._is_expired(node):
+            entry = self._cache.get(key)
+            if entry and not self._is_expired(entry[1]):
                 return True
             return False
     
@@ -236,23 +228,60 @@ class ThreadSafeLRUCache:
                 max_size=self._stats.max_size
             )
     
-    def cleanup_expired(self) -> int:
-        """清理过期项"""
-        expired_keys = []
+    def _push_expiry(self, expire_time: float, key: str) -> None:
+        """记录条目的过期时间（调用方持有锁）"""
+        heap = self._expiry_heap
+        # 失效记录过多时按当前条目重建，避免堆无限增长
+        if len(heap) >= 2 * self.max_size + 64:
+            # 先用list()一次性取出条目快照，无锁的get可能同时调整顺序
+            heap[:] = [(exp, k) for k, (_, exp) in list(self._cache.items()) if exp is not None and k != key]
+            heapq.heapify(heap)
+        
+        heapq.heappush(heap, (expire_time, key))
+        if heap[0][0] == expire_time:
+            self._expiry_changed.set()
+    
+    def next_expiry(self) -> Optional[float]:
+        """最早的过期时间（monotonic时钟），没有带过期时间的条目时返回None"""
         with self._lock:
-            for key, node in self._cache.items():
-                if self._is_expired(node):
-                    expired_keys.append(key)
-            
-            for key in expired_keys:
-                self.delete(key)
+            return self._expiry_heap[0][0] if self._expiry_heap else None
+    
+    def wait_for_expiry(self, timeout: Optional[float] = None) -> None:
+        """阻塞到最早的条目过期、出现更早的过期时间或超时为止"""
+        with self._lock:
+            # 在锁内清除事件，保证之后set写入的更早过期时间不会被错过
+            self._expiry_changed.clear()
+            next_expiry = self._expiry_heap[0][0] if self._expiry_heap else None
         
-        return len(expired_keys)
+        if next_expiry is not None:
+            delay = max(next_expiry - time.monotonic(), 0.0)
+            timeout = delay if timeout is None else min(timeout, delay)
+        self._expiry_changed.wait(timeout)
+    
+    def cleanup_expired(self) -> int:
+        """清理过期项，只弹出过期时间已到的堆记录"""
+        expired_count = 0
+        with self._lock:
+            # 整轮清理使用同一个时间快照
+            now = time.monotonic()
+            heap = self._expiry_heap
+            while heap and heap[0][0] < now:
+                expire_time, key = heapq.heappop(heap)
+                entry = self._cache.get(key)
+                # 条目已删除或被重新设置过期时间时，堆记录已失效
+                if entry is not None and entry[1] == expire_time:
+                    self._delete_locked(key)
+                    expired_count += 1
+        
+        return expired_count
 
 
 class RedisCache:
     """Redis缓存实现"""
     
+    # clear时每个pipeline累积的UNLINK命令数
+    CLEAR_BATCH_SIZE = 1000
+    
     def __init__(self, redis_url: str = "redis://localhost:6379/0", 
                  prefix: str = "qimen:", encoding: str = "utf-8"):
         if not REDIS_AVAILABLE:
@@ -261,19 +290,24 @@ class RedisCache:
         self.redis_client = redis.from_url(redis_url, decode_responses=False)  # type: ignore
         self.prefix = prefix
         self.encoding = encoding
+        self._prefix_bytes = prefix.encode(encoding)
         self._stats = CacheStats()
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
     
-    def _make_key(self, key: str) -> str:
-        """生成Redis键"""
-        return f"{self.prefix}{key}"
+    def _make_key(self, key: str) -> bytes:
+        """生成Redis键（redis-py直接接受bytes，省去字符串格式化）"""
+        return self._prefix_bytes + key.encode(self.encoding)
     
     def _serialize(self, value: Any) -> bytes:
-        """序列化值"""
+        """序列化值（优先使用msgpack，未安装时退回pickle）"""
+        if MSGPACK_AVAILABLE:
+            return msgpack.packb(value, default=_msgpack_default, use_bin_type=True)
         return pickle.dumps(value)
     
     def _deserialize(self, data: bytes) -> Any:
         """反序列化值"""
+        if MSGPACK_AVAILABLE:
+            return msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, raw=False, strict_map_key=False)
         return pickle.loads(data)
     
     def get(self, key: str) -> Optional[Any]:
@@ -315,6 +349,27 @@ class RedisCache:
             print(f"Redis set error: {e}")
             return False
     
+    def set_many(self, items: Dict[str, Tuple[Any, Optional[int]]]) -> bool:
+        """批量设置缓存值，items为 键 -> (值, ttl)，通过pipeline一次往返写入"""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, (value, ttl) in items.items():
+                redis_key = self._make_key(key)
+                data = self._serialize(value)
+                if ttl is not None:
+                    pipe.setex(redis_key, ttl, data)
+                else:
+                    pipe.set(redis_key, data)
+            pipe.execute()
+            
+            with self._lock:
+                self._stats.sets += len(items)
+            return True
+        
+        except Exception as e:
+            print(f"Redis set_many error: {e}")
+            return False
+    
     def delete(self, key: str) -> bool:
         """删除缓存值"""
         try:
@@ -334,9 +389,17 @@ class RedisCache:
     def clear(self) -> bool:
         """清空缓存"""
         try:
-            keys = self.redis_client.keys(f"{self.prefix}*")
-            if keys:
-                self.redis_client.delete(*keys)
+            # 使用SCAN代替KEYS避免阻塞Redis，UNLINK在后台释放内存
+            pipe = self.redis_client.pipeline(transaction=False)
+            pending = 0
+            for redis_key in self.redis_client.scan_iter(match=self._prefix_bytes + b"*", count=500):
+                pipe.unlink(redis_key)
+                pending += 1
+                if pending >= self.CLEAR_BATCH_SIZE:
+                    pipe.execute()
+                    pending = 0
+            if pending:
+                pipe.execute()
             return True
         
         except Exception as e:
@@ -373,21 +436,23 @@ class RedisCache:
 
 
 class MultiLevelCache:
-    """多级缓存系统"""
+    """多级缓存系统
+    
+    自身的统计计数不加锁：计数只是整数自增，并发时可能丢失少量增量但不会
+    破坏缓存状态，各级缓存的一致性由其自身保证。
+    """
     
     def __init__(self, l1_cache: CacheProtocol, l2_cache: Optional[CacheProtocol] = None):
         self.l1_cache = l1_cache  # 内存缓存
         self.l2_cache = l2_cache  # Redis缓存
         self._stats = CacheStats()
-        self._lock = threading.RLock()
     
     def get(self, key: str) -> Optional[Any]:
         """获取缓存值（先查L1，再查L2）"""
         # 先查L1缓存
         value = self.l1_cache.get(key)
         if value is not None:
-            with self._lock:
-                self._stats.hits += 1
+            self._stats.hits += 1
             return value
         
         # 再查L2缓存
@@ -396,12 +461,10 @@ class MultiLevelCache:
             if value is not None:
                 # 回填到L1缓存
                 self.l1_cache.set(key, value)
-                with self._lock:
-                    self._stats.hits += 1
+                self._stats.hits += 1
                 return value
         
-        with self._lock:
-            self._stats.misses += 1
+        self._stats.misses += 1
         return None
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
@@ -412,8 +475,23 @@ class MultiLevelCache:
         if self.l2_cache:
             l2_success = self.l2_cache.set(key, value, ttl)
         
-        with self._lock:
-            self._stats.sets += 1
+        self._stats.sets += 1
+        
+        return l1_success and l2_success
+    
+    def set_many(self, items: Dict[str, Tuple[Any, Optional[int]]]) -> bool:
+        """批量设置缓存值，L2支持set_many时合并为一次写入"""
+        l1_success = all([self.l1_cache.set(key, value, ttl) for key, (value, ttl) in items.items()])
+        l2_success = True
+        
+        if self.l2_cache:
+            l2_set_many = getattr(self.l2_cache, "set_many", None)
+            if l2_set_many is not None:
+                l2_success = l2_set_many(items)
+            else:
+                l2_success = all([self.l2_cache.set(key, value, ttl) for key, (value, ttl) in items.items()])
+        
+        self._stats.sets += len(items)
         
         return l1_success and l2_success
     
@@ -425,9 +503,8 @@ class MultiLevelCache:
         if self.l2_cache:
             l2_success = self.l2_cache.delete(key)
         
-        with self._lock:
-            if l1_success or l2_success:
-                self._stats.deletes += 1
+        if l1_success or l2_success:
+            self._stats.deletes += 1
         
         return l1_success or l2_success
     
@@ -467,9 +544,29 @@ class MultiLevelCache:
 class CacheKeyGenerator:
     """缓存键生成器"""
     
+    # 可直接用str()拼接的参数类型
+    _PRIMITIVE_TYPES = frozenset((str, int, float, bool))
+    
+    # 超过该长度的键改用哈希摘要
+    MAX_KEY_LENGTH = 100
+    
+    @staticmethod
+    def _digest(key_string: str) -> str:
+        """长键的摘要（blake2b比md5更快，128位输出与md5等长）"""
+        return hashlib.blake2b(key_string.encode(), digest_size=16).hexdigest()
+    
     @staticmethod
     def generate_key(*args, **kwargs) -> str:
         """生成缓存键"""
+        # 快速路径：仅有基本类型的位置参数时直接拼接
+        if not kwargs:
+            primitive_types = CacheKeyGenerator._PRIMITIVE_TYPES
+            if all(type(arg) in primitive_types for arg in args):
+                key_string = "|".join(map(str, args))
+                if len(key_string) > CacheKeyGenerator.MAX_KEY_LENGTH:
+                    return CacheKeyGenerator._digest(key_string)
+                return key_string
+        
         # 构建键的组成部分
         key_parts = []
         
@@ -490,27 +587,32 @@ class CacheKeyGenerator:
         # 生成最终键
         key_string = "|".join(key_parts)
         
-        # 使用MD5哈希避免键过长
-        if len(key_string) > 100:
-            return hashlib.md5(key_string.encode()).hexdigest()
+        # 使用哈希摘要避免键过长
+        if len(key_string) > CacheKeyGenerator.MAX_KEY_LENGTH:
+            return CacheKeyGenerator._digest(key_string)
         
         return key_string
     
     @staticmethod
-    def generate_time_key(dt: datetime, precision: str = "hour") -> str:
-        """生成基于时间的缓存键"""
+    def generate_time_key(dt: datetime, precision: str = "hour", namespace: str = "time") -> str:
+        """生成基于时间的缓存键
+        
+        时间各字段按十进制位打包为一个整数（如 day 精度为 YYYYMMDD），
+        只需一次整数格式化；namespace 直接作为键前缀，调用方无需再拼接。
+        """
         if precision == "year":
-            return f"time:{dt.year}"
+            packed = dt.year
         elif precision == "month":
-            return f"time:{dt.year}-{dt.month:02d}"
+            packed = dt.year * 100 + dt.month
         elif precision == "day":
-            return f"time:{dt.year}-{dt.month:02d}-{dt.day:02d}"
+            packed = (dt.year * 100 + dt.month) * 100 + dt.day
         elif precision == "hour":
-            return f"time:{dt.year}-{dt.month:02d}-{dt.day:02d}-{dt.hour:02d}"
+            packed = ((dt.year * 100 + dt.month) * 100 + dt.day) * 100 + dt.hour
         elif precision == "minute":
-            return f"time:{dt.year}-{dt.month:02d}-{dt.day:02d}-{dt.hour:02d}-{dt.minute:02d}"
+            packed = (((dt.year * 100 + dt.month) * 100 + dt.day) * 100 + dt.hour) * 100 + dt.minute
         else:
-            return f"time:{dt.isoformat()}"
+            return f"{namespace}:{dt.isoformat()}"
+        return f"{namespace}:{packed}"
 
 
 class QimenCache:
@@ -550,11 +652,10 @@ class QimenCache:
         """启动定期清理任务"""
         def cleanup_task():
             while True:
-                time.sleep(300)  # 5分钟清理一次
+                # 睡眠到最早的条目过期为止，没有带过期时间的条目时一直等待
+                self.l1_cache.wait_for_expiry()
                 try:
-                    expired_count = self.l1_cache.cleanup_expired()
-                    if expired_count > 0:
-                        print(f"清理了{expired_count}个过期缓存项")
+                    self.l1_cache.cleanup_expired()
                 except Exception as e:
                     print(f"缓存清理出错: {e}")
         
@@ -583,8 +684,7 @@ class QimenCache:
         if not self.cache_ganzhi:
             return False
         
-        time_key = CacheKeyGenerator.generate_time_key(dt, "day")
-        key = f"ganzhi:{time_key}"
+        key = CacheKeyGenerator.generate_time_key(dt, "day", "ganzhi")
         return self.cache.set(key, ganzhi_data, ttl)
     
     def get_ganzhi_data(self, dt: datetime) -> Optional[Dict[str, str]]:
@@ -592,8 +692,7 @@ class QimenCache:
         if not self.cache_ganzhi:
             return None
         
-        time_key = CacheKeyGenerator.generate_time_key(dt, "day")
-        key = f"ganzhi:{time_key}"
+        key = CacheKeyGenerator.generate_time_key(dt, "day", "ganzhi")
         return self.cache.get(key)
     
     def cache_ju_data(self, dt: datetime, ju_number: int, is_yang: bool, ttl: int = 1800) -> bool:
@@ -601,8 +700,7 @@ class QimenCache:
         if not self.cache_ju_numbers:
             return False
         
-        time_key = CacheKeyGenerator.generate_time_key(dt, "hour")
-        key = f"ju:{time_key}"
+        key = CacheKeyGenerator.generate_time_key(dt, "hour", "ju")
         data = {"ju_number": ju_number, "is_yang": is_yang}
         return self.cache.set(key, data, ttl)
     
@@ -611,8 +709,7 @@ class QimenCache:
         if not self.cache_ju_numbers:
             return None
         
-        time_key = CacheKeyGenerator.generate_time_key(dt, "hour")
-        key = f"ju:{time_key}"
+        key = CacheKeyGenerator.generate_time_key(dt, "hour", "ju")
         return self.cache.get(key)
     
     def cache_palace_data(self, ju_key: str, palace_data: Any, ttl: int = 7200) -> bool:
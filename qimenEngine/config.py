@@ -3,6 +3,8 @@
 支持多种配置格式、环境变量覆盖、配置验证和热重载
 """
 
+import configparser
+import copy
 import os
 import json
 import logging
@@ -10,9 +12,10 @@ import threading
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, List, Union, Callable
-from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, List, Tuple, Union, Callable
+from dataclasses import asdict, dataclass, field, fields, replace
 from enum import Enum
+from functools import lru_cache
 
 try:
     import yaml
@@ -21,10 +24,28 @@ except ImportError:
     YAML_AVAILABLE = False
 
 try:
-    import configparser
-    INI_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    INI_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    from watchdog.observers.polling import PollingObserver
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+# 网络文件系统上收不到inotify事件，只能轮询
+NETWORK_FS_TYPES = frozenset({"nfs", "nfs4", "cifs", "smbfs", "smb3", "9p", "fuse.sshfs", "afs", "ceph", "glusterfs"})
+
+# 网络文件系统的轮询间隔（秒）
+NETWORK_FS_POLL_INTERVAL = 60
+
+# 配置文件解析结果缓存 {路径: ((格式, 修改时间ns, 大小), 解析结果)}，各配置管理器共用
+_parse_cache: Dict[str, Tuple[Tuple[Any, int, int], Any]] = {}
 
 
 class ConfigFormat(str, Enum):
@@ -45,9 +66,13 @@ class ConfigSource:
     env_prefix: Optional[str] = None
 
 
-@dataclass 
+@dataclass(frozen=True, slots=True)
 class QimenConfig:
-    """奇门遁甲配置结构"""
+    """奇门遁甲配置结构
+    
+    不可变快照：配置变更时生成新实例并整体替换 ConfigManager.config，
+    读取方拿到的实例在使用期间不会被修改。
+    """
     
     # 计算精度设置
     calculation_precision: str = "high"  # high, medium, low
@@ -107,6 +132,108 @@ class QimenConfig:
     # 安全设置
     rate_limiting: bool = False
     max_requests_per_minute: int = 60
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（浅拷贝，列表、字典字段与快照共享）"""
+        return {name: getattr(self, name) for name in _QIMEN_FIELD_NAMES}
+
+
+# QimenConfig 的字段名（按定义顺序）及其集合
+_QIMEN_FIELD_NAMES: Tuple[str, ...] = tuple(f.name for f in fields(QimenConfig))
+_QIMEN_FIELDS = frozenset(_QIMEN_FIELD_NAMES)
+
+
+def _is_network_fs(path: str) -> bool:
+    """根据 /proc/mounts 判断路径是否位于网络文件系统"""
+    try:
+        with open("/proc/mounts", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return False
+    
+    path = os.path.realpath(path)
+    best_mount, best_type = "", ""
+    for mount_point, fs_type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best_mount):
+            best_mount, best_type = mount_point, fs_type
+    return best_type in NETWORK_FS_TYPES
+
+
+class _ConfigFileEventHandler(FileSystemEventHandler):
+    """目录事件处理器，只响应已登记的配置文件"""
+    
+    def __init__(self, manager: "ConfigManager"):
+        super().__init__()
+        self.manager = manager
+        self.sources: Dict[str, ConfigSource] = {}
+    
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type not in ("modified", "created", "moved"):
+            return
+        
+        # 编辑器常以"写临时文件再重命名"的方式保存，重命名时目标路径才是配置文件
+        path = getattr(event, "dest_path", "") or event.src_path
+        source = self.sources.get(os.path.abspath(os.fsdecode(path)))
+        if source is not None:
+            self.manager._reload_source(source)
+
+
+def _load_json(path: str) -> Any:
+    """解析JSON配置文件"""
+    if ORJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _dump_json(data: Any) -> bytes:
+    """序列化为缩进的UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _load_yaml(path: str) -> Any:
+    """解析YAML配置文件"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def _load_ini(path: str) -> Dict[str, Any]:
+    """解析INI配置文件"""
+    parser = configparser.ConfigParser()
+    parser.read(path, encoding='utf-8')
+    return ConfigManager._ini_to_dict(parser)
+
+
+# 环境变量中表示布尔值的字符串（小写）
+_BOOL_VALUES = {'true': True, 'false': False}
+
+
+@lru_cache(maxsize=256)
+def _split_env_key(config_key: str) -> Tuple[str, ...]:
+    """将去掉前缀后的环境变量名按下划线拆分为嵌套键，重复加载时复用拆分结果"""
+    return tuple(config_key.split('_'))
+
+
+# 默认配置文件，按目录和文件的优先级排列
+DEFAULT_CONFIG_FILES: List[Tuple[str, Tuple[Tuple[str, ConfigFormat], ...]]] = [
+    (".", (("qimen_config.yaml", ConfigFormat.YAML), ("qimen_config.json", ConfigFormat.JSON))),
+    ("config", (("qimen.yaml", ConfigFormat.YAML), ("qimen.json", ConfigFormat.JSON))),
+    ("~/.qimen", (("config.yaml", ConfigFormat.YAML),)),
+    ("/etc/qimen", (("config.yaml", ConfigFormat.YAML),)),
+]
+
+
+# 各文件格式的解析函数，导入时按可用的依赖确定一次
+_LOADERS: Dict[ConfigFormat, Callable[[str], Any]] = {
+    ConfigFormat.JSON: _load_json,
+    ConfigFormat.INI: _load_ini,
+}
+if YAML_AVAILABLE:
+    _LOADERS[ConfigFormat.YAML] = _load_yaml
 
 
 class ConfigManager:
@@ -115,10 +242,19 @@ class ConfigManager:
     def __init__(self, config_sources: Optional[List[ConfigSource]] = None):
         self.config_sources = config_sources or []
         self.config = QimenConfig()
-        self.watchers: Dict[str, threading.Thread] = {}
-        self.change_callbacks: List[Callable[[QimenConfig], None]] = []
-        self._lock = threading.RLock()
+        # 已监视的配置文件路径 -> 监视句柄（watchdog的ObservedWatch，或未安装watchdog时的轮询线程）
+        self.watchers: Dict[str, Any] = {}
+        self._observer = None
+        self._polling_observer = None
+        self._event_handler = _ConfigFileEventHandler(self) if WATCHDOG_AVAILABLE else None
+        # 回调元组在写入时整体替换（写时复制），通知时无需加锁或复制
+        self.change_callbacks: Tuple[Callable[[QimenConfig], None], ...] = ()
+        # 只用于串行化写入；读取直接访问 self.config，替换引用本身是原子的
+        self._lock = threading.Lock()
         self._last_modified: Dict[str, float] = {}
+        # 各环境变量前缀上次加载时的变量快照
+        self._env_snapshots: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        self._loaded = False
         
         # 设置默认配置源
         if not self.config_sources:
@@ -129,31 +265,15 @@ class ConfigManager:
     
     def _setup_default_sources(self):
         """设置默认配置源"""
-        # 1. 默认配置文件
-        default_config_paths = [
-            "qimen_config.yaml",
-            "qimen_config.json", 
-            "config/qimen.yaml",
-            "config/qimen.json",
-            os.path.expanduser("~/.qimen/config.yaml"),
-            "/etc/qimen/config.yaml"
-        ]
-        
-        for path in default_config_paths:
-            if os.path.exists(path):
-                if path.endswith('.yaml') and YAML_AVAILABLE:
-                    self.config_sources.append(ConfigSource(
-                        path=path, 
-                        format=ConfigFormat.YAML,
-                        watch=True
-                    ))
-                elif path.endswith('.json'):
-                    self.config_sources.append(ConfigSource(
-                        path=path,
-                        format=ConfigFormat.JSON,
-                        watch=True
-                    ))
-                break
+        # 1. 默认配置文件：按目录优先级扫描，每个目录一次scandir，命中即停止
+        default_config_file = self._find_default_config_file()
+        if default_config_file is not None:
+            path, config_format = default_config_file
+            self.config_sources.append(ConfigSource(
+                path=path,
+                format=config_format,
+                watch=True
+            ))
         
         # 2. 环境变量
         self.config_sources.append(ConfigSource(
@@ -161,15 +281,36 @@ class ConfigManager:
             env_prefix="QIMEN_"
         ))
     
+    @staticmethod
+    def _find_default_config_file() -> Optional[Tuple[str, ConfigFormat]]:
+        """查找第一个存在的默认配置文件，返回 (路径, 格式)"""
+        for directory, candidates in DEFAULT_CONFIG_FILES:
+            directory = os.path.expanduser(directory)
+            try:
+                with os.scandir(directory) as entries:
+                    names = {entry.name for entry in entries if entry.is_file()}
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+            
+            for name, config_format in candidates:
+                if name in names and config_format in _LOADERS:
+                    return os.path.join(directory, name) if directory != "." else name, config_format
+        return None
+    
     def load_config(self):
-        """加载配置"""
+        """加载配置
+        
+        所有配置源（文件修改时间、环境变量）都未变化时直接返回，不再重复验证和通知回调。
+        某个配置源重新加载后，其后的配置源即使未变化也重新合并，保证后者的优先级。
+        """
+        changed = False
         with self._lock:
             for source in self.config_sources:
                 try:
                     if source.format == ConfigFormat.ENV:
-                        self._load_from_env(source)
+                        changed |= self._load_from_env(source, force=changed)
                     elif source.path:
-                        self._load_from_file(source)
+                        changed |= self._load_from_file(source, force=changed)
                         
                         # 启动文件监视
                         if source.watch and source.path and source.path not in self.watchers:
@@ -181,83 +322,114 @@ class ConfigManager:
                     else:
                         logging.warning(f"跳过配置源 {source.path}: {e}")
         
+        if self._loaded and not changed:
+            return
+        
         # 验证配置
         self._validate_config()
+        self._loaded = True
         
         # 通知回调
         self._notify_callbacks()
     
-    def _load_from_file(self, source: ConfigSource):
-        """从文件加载配置"""
-        if not source.path or not os.path.exists(source.path):
-            return
+    def _load_from_file(self, source: ConfigSource, force: bool = False) -> bool:
+        """从文件加载配置，返回是否有新内容被合并；force 为 True 时文件未修改也重新合并"""
+        if not source.path:
+            return False
+        
+        # 一次stat同时判断文件是否存在并取得修改时间
+        try:
+            st = os.stat(source.path)
+        except FileNotFoundError:
+            return False
         
         # 检查文件修改时间
-        mtime = os.path.getmtime(source.path)
-        if source.path in self._last_modified and self._last_modified[source.path] >= mtime:
-            return
+        mtime = st.st_mtime
+        if not force and source.path in self._last_modified and self._last_modified[source.path] >= mtime:
+            return False
         
         self._last_modified[source.path] = mtime
         
-        with open(source.path, 'r', encoding='utf-8') as f:
-            if source.format == ConfigFormat.JSON:
-                data = json.load(f)
-            elif source.format == ConfigFormat.YAML and YAML_AVAILABLE:
-                data = yaml.safe_load(f)
-            elif source.format == ConfigFormat.INI and INI_AVAILABLE:
-                parser = configparser.ConfigParser()
-                parser.read(source.path)
-                data = self._ini_to_dict(parser)
-            else:
-                raise ConfigError(f"不支持的配置格式: {source.format}")
+        # 文件未变化时复用解析结果（如重新初始化配置管理器），返回副本以免合并时修改缓存
+        cache_key = (source.format, st.st_mtime_ns, st.st_size)
+        cached = _parse_cache.get(source.path)
+        if cached is not None and cached[0] == cache_key:
+            data = copy.deepcopy(cached[1])
+        else:
+            data = self._parse_file(source)
+            _parse_cache[source.path] = (cache_key, copy.deepcopy(data))
         
         # 合并配置
         self._merge_config(data)
         
         logging.info(f"已加载配置文件: {source.path}")
+        return True
     
-    def _load_from_env(self, source: ConfigSource):
-        """从环境变量加载配置"""
+    def _parse_file(self, source: ConfigSource) -> Any:
+        """读取并解析配置文件"""
+        loader = _LOADERS.get(source.format)
+        if loader is None:
+            raise ConfigError(f"不支持的配置格式: {source.format}")
+        return loader(source.path)
+    
+    def _load_from_env(self, source: ConfigSource, force: bool = False) -> bool:
+        """从环境变量加载配置，返回是否有新内容被合并
+        
+        相关变量与上次加载相同时跳过；force 为 True 时（前面的配置源已重新加载）仍重新合并。
+        """
         prefix = source.env_prefix or "QIMEN_"
+        prefix_len = len(prefix)
+        # 一次遍历筛出匹配前缀的变量，同时去掉前缀并转为小写
+        env_items = tuple(sorted(
+            (key[prefix_len:].lower(), value) for key, value in os.environ.items() if key.startswith(prefix)
+        ))
+        if not force and self._env_snapshots.get(prefix) == env_items:
+            return False
+        self._env_snapshots[prefix] = env_items
+        
         env_config = {}
         
-        for key, value in os.environ.items():
-            if key.startswith(prefix):
-                config_key = key[len(prefix):].lower()
-                
-                # 处理嵌套键（使用下划线分隔）
-                keys = config_key.split('_')
-                current = env_config
-                
-                for k in keys[:-1]:
-                    if k not in current:
-                        current[k] = {}
-                    current = current[k]
-                
-                # 尝试转换类型
-                current[keys[-1]] = self._convert_env_value(value)
+        for config_key, value in env_items:
+            # 处理嵌套键（使用下划线分隔）
+            keys = _split_env_key(config_key)
+            current = env_config
+            
+            for k in keys[:-1]:
+                if k not in current:
+                    current[k] = {}
+                current = current[k]
+            
+            # 尝试转换类型
+            current[keys[-1]] = self._convert_env_value(value)
         
         if env_config:
             self._merge_config(env_config)
             logging.info("已加载环境变量配置")
+            return True
+        return False
     
-    def _convert_env_value(self, value: str) -> Any:
+    @staticmethod
+    def _convert_env_value(value: str) -> Any:
         """转换环境变量值类型"""
         # 布尔值
-        if value.lower() in ('true', 'false'):
-            return value.lower() == 'true'
+        boolean = _BOOL_VALUES.get(value.lower())
+        if boolean is not None:
+            return boolean
         
-        # 数字
-        try:
-            if '.' in value:
-                return float(value)
-            else:
-                return int(value)
-        except ValueError:
-            pass
+        first = value[:1]
+        
+        # 数字：先按首字符排除普通字符串，避免每次转换失败抛出异常
+        if first.isdigit() or first in "+-." or first.isspace():
+            try:
+                if '.' in value:
+                    return float(value)
+                else:
+                    return int(value)
+            except ValueError:
+                pass
         
         # JSON
-        if value.startswith(('{', '[', '"')):
+        if first in ('{', '[', '"'):
             try:
                 return json.loads(value)
             except json.JSONDecodeError:
@@ -266,71 +438,140 @@ class ConfigManager:
         # 字符串
         return value
     
-    def _ini_to_dict(self, parser: 'configparser.ConfigParser') -> Dict[str, Any]:
+    @staticmethod
+    def _ini_to_dict(parser: configparser.ConfigParser) -> Dict[str, Any]:
         """将INI解析器转换为字典"""
-        result = {}
-        
-        for section_name in parser.sections():
-            section = {}
-            for key, value in parser.items(section_name):
-                section[key] = self._convert_env_value(value)
-            result[section_name] = section
-        
-        return result
+        convert = ConfigManager._convert_env_value
+        return {
+            section_name: {key: convert(value) for key, value in parser.items(section_name)}
+            for section_name in parser.sections()
+        }
     
     def _merge_config(self, new_config: Dict[str, Any]):
         """合并配置"""
         def deep_merge(target: Dict[str, Any], source: Dict[str, Any]):
-            for key, value in source.items():
-                if key in target and isinstance(target[key], dict) and isinstance(value, dict):
-                    deep_merge(target[key], value)
-                else:
-                    target[key] = value
-        
-        # 转换为字典
-        config_dict = self.config.__dict__.copy()
+            # 用显式栈代替递归，逐层合并嵌套字典
+            stack = [(target, source)]
+            while stack:
+                target, source = stack.pop()
+                for key, value in source.items():
+                    current = target.get(key)
+                    if isinstance(current, dict) and isinstance(value, dict):
+                        stack.append((current, value))
+                    else:
+                        target[key] = value
         
-        # 合并新配置
-        deep_merge(config_dict, new_config)
+        # 只处理新配置中出现的已知字段；字典字段在副本上深度合并，不修改当前快照
+        updates = {}
+        for key, value in new_config.items():
+            if key not in _QIMEN_FIELDS:
+                continue
+            current = getattr(self.config, key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged = copy.deepcopy(current)
+                deep_merge(merged, value)
+                value = merged
+            updates[key] = value
         
-        # 更新配置对象
-        for key, value in config_dict.items():
-            if hasattr(self.config, key):
-                setattr(self.config, key, value)
+        # 生成新快照并替换
+        if updates:
+            self.config = replace(self.config, **updates)
     
-    def _validate_config(self):
-        """验证配置"""
+    def _validate_config(self, config: Optional[QimenConfig] = None):
+        """验证配置，默认验证当前配置"""
+        config = config or self.config
+        
         # 验证精度设置
-        if self.config.calculation_precision not in ["high", "medium", "low"]:
-            raise ConfigError(f"无效的计算精度: {self.config.calculation_precision}")
+        if config.calculation_precision not in ["high", "medium", "low"]:
+            raise ConfigError(f"无效的计算精度: {config.calculation_precision}")
         
         # 验证起局方法
-        if self.config.default_ju_mode not in ["活盘", "拆补", "时家", "日家"]:
-            raise ConfigError(f"无效的起局方法: {self.config.default_ju_mode}")
+        if config.default_ju_mode not in ["活盘", "拆补", "时家", "日家"]:
+            raise ConfigError(f"无效的起局方法: {config.default_ju_mode}")
         
         # 验证宫位模式
-        if self.config.default_palace_mode not in ["turn", "fly"]:
-            raise ConfigError(f"无效的宫位模式: {self.config.default_palace_mode}")
+        if config.default_palace_mode not in ["turn", "fly"]:
+            raise ConfigError(f"无效的宫位模式: {config.default_palace_mode}")
         
         # 验证经纬度
-        if not -180 <= self.config.longitude <= 180:
-            raise ConfigError(f"无效的经度: {self.config.longitude}")
+        if not -180 <= config.longitude <= 180:
+            raise ConfigError(f"无效的经度: {config.longitude}")
         
-        if not -90 <= self.config.latitude <= 90:
-            raise ConfigError(f"无效的纬度: {self.config.latitude}")
+        if not -90 <= config.latitude <= 90:
+            raise ConfigError(f"无效的纬度: {config.latitude}")
         
         # 验证缓存设置
-        if self.config.cache_l1_max_size <= 0:
-            raise ConfigError(f"缓存大小必须大于0: {self.config.cache_l1_max_size}")
+        if config.cache_l1_max_size <= 0:
+            raise ConfigError(f"缓存大小必须大于0: {config.cache_l1_max_size}")
         
         # 验证插件
         available_plugins = ["zhifu", "wangshuai", "geju", "yingqi"]
-        invalid_plugins = [p for p in self.config.enabled_plugins if p not in available_plugins]
+        invalid_plugins = [p for p in config.enabled_plugins if p not in available_plugins]
         if invalid_plugins:
             logging.warning(f"无效的插件: {invalid_plugins}")
     
+    def _reload_source(self, source: ConfigSource):
+        """配置文件变化后重新加载"""
+        try:
+            logging.info(f"检测到配置文件变化: {source.path}")
+            with self._lock:
+                old_config = self.config
+                try:
+                    if self._load_from_file(source):
+                        # 重新合并其后的配置源（如环境变量），保持其优先级
+                        for later in self.config_sources[self.config_sources.index(source) + 1:]:
+                            if later.format == ConfigFormat.ENV:
+                                self._load_from_env(later, force=True)
+                            elif later.path:
+                                self._load_from_file(later, force=True)
+                    self._validate_config()
+                except Exception:
+                    # 新配置无效时保留原快照
+                    self.config = old_config
+                    raise
+            self._notify_callbacks()
+        except Exception as e:
+            logging.error(f"文件监视出错: {e}")
+    
     def _start_file_watcher(self, source: ConfigSource):
-        """启动文件监视器"""
+        """启动文件监视器
+        
+        安装了watchdog时，所有配置文件共用一个基于内核事件（inotify等）的观察者，
+        空闲时不产生任何系统调用；网络文件系统收不到事件，改用低频轮询观察者。
+        未安装watchdog时退回到每秒检查修改时间的轮询线程。
+        """
+        if not source.path:
+            return
+        
+        if not WATCHDOG_AVAILABLE:
+            self._start_polling_thread(source)
+            return
+        
+        path = os.path.abspath(source.path)
+        directory = os.path.dirname(path)
+        
+        if _is_network_fs(directory):
+            if self._polling_observer is None:
+                self._polling_observer = PollingObserver(timeout=NETWORK_FS_POLL_INTERVAL)
+                self._polling_observer.daemon = True
+                self._polling_observer.start()
+            observer = self._polling_observer
+        else:
+            if self._observer is None:
+                self._observer = Observer()
+                self._observer.daemon = True
+                self._observer.start()
+            observer = self._observer
+        
+        # 同一目录只登记一次，事件处理器按路径分发
+        self._event_handler.sources[path] = source
+        watch = next((w for w in self.watchers.values() if getattr(w, "path", None) == directory), None)
+        if watch is None:
+            watch = observer.schedule(self._event_handler, directory, recursive=False)
+        self.watchers[source.path] = watch
+    
+    def _start_polling_thread(self, source: ConfigSource):
+        """未安装watchdog时的轮询监视线程"""
         def watch_file():
             while True:
                 try:
@@ -339,17 +580,13 @@ class ConfigManager:
                         mtime = os.path.getmtime(source.path)
                         if source.path in self._last_modified:
                             if mtime > self._last_modified[source.path]:
-                                logging.info(f"检测到配置文件变化: {source.path}")
-                                self._load_from_file(source)
-                                self._validate_config()
-                                self._notify_callbacks()
+                                self._reload_source(source)
                 except Exception as e:
                     logging.error(f"文件监视出错: {e}")
         
         watcher = threading.Thread(target=watch_file, daemon=True)
         watcher.start()
-        if source.path:
-            self.watchers[source.path] = watcher
+        self.watchers[source.path] = watcher
     
     def _notify_callbacks(self):
         """通知配置变更回调"""
@@ -361,64 +598,66 @@ class ConfigManager:
     
     def add_change_callback(self, callback: Callable[[QimenConfig], None]):
         """添加配置变更回调"""
-        self.change_callbacks.append(callback)
+        with self._lock:
+            self.change_callbacks = self.change_callbacks + (callback,)
     
     def remove_change_callback(self, callback: Callable[[QimenConfig], None]):
         """移除配置变更回调"""
-        if callback in self.change_callbacks:
-            self.change_callbacks.remove(callback)
+        with self._lock:
+            callbacks = list(self.change_callbacks)
+            if callback in callbacks:
+                callbacks.remove(callback)
+                self.change_callbacks = tuple(callbacks)
     
     def get_config(self) -> QimenConfig:
-        """获取当前配置"""
-        with self._lock:
-            return self.config
+        """获取当前配置（无锁读取不可变快照）"""
+        return self.config
     
     def update_config(self, updates: Dict[str, Any]) -> bool:
-        """更新配置"""
+        """更新配置
+        
+        基于当前快照生成新配置，验证通过后一次性替换；验证失败时当前配置保持不变。
+        """
         try:
             with self._lock:
-                old_config = self.config.__dict__.copy()
-                
-                # 应用更新
+                known_updates = {}
                 for key, value in updates.items():
-                    if hasattr(self.config, key):
-                        setattr(self.config, key, value)
+                    if key in _QIMEN_FIELDS:
+                        known_updates[key] = value
                     else:
                         logging.warning(f"未知的配置项: {key}")
                 
-                # 验证配置
-                self._validate_config()
-                
-                # 通知回调
-                self._notify_callbacks()
+                new_config = replace(self.config, **known_updates)
                 
-                logging.info(f"配置已更新: {updates}")
-                return True
+                # 验证配置
+                self._validate_config(new_config)
                 
+                self.config = new_config
+        
         except Exception as e:
-            # 回滚配置
-            for key, value in old_config.items():
-                setattr(self.config, key, value)
-            
             logging.error(f"配置更新失败: {e}")
             return False
+        
+        # 通知回调（在锁外调用，回调中可以再次更新配置）
+        self._notify_callbacks()
+        
+        logging.info(f"配置已更新: {updates}")
+        return True
     
     def save_config(self, path: str, format: ConfigFormat = ConfigFormat.JSON) -> bool:
         """保存配置到文件"""
         try:
-            config_dict = self.config.__dict__.copy()
+            config_dict = self.config.to_dict()
             
-            # 移除不可序列化的字段
-            if 'change_callbacks' in config_dict:
-                del config_dict['change_callbacks']
+            if format == ConfigFormat.JSON:
+                content = _dump_json(config_dict)
+            elif format == ConfigFormat.YAML and YAML_AVAILABLE:
+                content = yaml.dump(config_dict, default_flow_style=False, allow_unicode=True).encode('utf-8')
+            else:
+                raise ConfigError(f"不支持的保存格式: {format}")
             
-            with open(path, 'w', encoding='utf-8') as f:
-                if format == ConfigFormat.JSON:
-                    json.dump(config_dict, f, indent=2, ensure_ascii=False)
-                elif format == ConfigFormat.YAML and YAML_AVAILABLE:
-                    yaml.dump(config_dict, f, default_flow_style=False, allow_unicode=True)
-                else:
-                    raise ConfigError(f"不支持的保存格式: {format}")
+            with open(path, 'wb') as f:
+                f.write(content)
             
             logging.info(f"配置已保存到: {path}")
             return True
@@ -429,7 +668,8 @@ class ConfigManager:
     
     def get_effective_config(self) -> Dict[str, Any]:
         """获取有效配置（包含来源信息）"""
-        config_dict = self.config.__dict__.copy()
+        # 返回给调用方的字典可能被修改，深拷贝以免改动共享的配置快照
+        config_dict = asdict(self.config)
         
         return {
             "config": config_dict,
@@ -495,7 +735,6 @@ def require_config(config_key: str, default_value: Any = None):
             if hasattr(config, config_key):
                 value = getattr(config, config_key)
                 if value is None and default_value is not None:
-                    setattr(config, config_key, default_value)
                     value = default_value
                 kwargs[config_key] = value
             elif default_value is not None:
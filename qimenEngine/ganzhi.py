@@ -3,15 +3,48 @@
 实现精确的年月日时干支计算，包括节气换月、五虎遁年起月法、五鼠遁日起时法等
 """
 
-from datetime import datetime, timedelta
-from typing import Tuple, Dict, Optional
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Tuple, Dict, List, Optional, Sequence, Union
 
 try:
     from symbols import TIAN_GAN, DI_ZHI, SOLAR_TERMS
     from astronomical import astro_calculator
+    from config import get_config
 except ImportError:
     from .symbols import TIAN_GAN, DI_ZHI, SOLAR_TERMS
     from .astronomical import astro_calculator
+    from .config import get_config
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# 天干、地支到序号的映射，代替列表的线性查找
+_GAN_TO_IDX: Dict[str, int] = {gan: index for index, gan in enumerate(TIAN_GAN)}
+_ZHI_TO_IDX: Dict[str, int] = {zhi: index for index, zhi in enumerate(DI_ZHI)}
+
+# 六十甲子纳音，相邻两个干支（甲子、乙丑……）共用一个，按 甲子序号//2 排列
+_NAYIN_BY_JIAZI_INDEX: Tuple[str, ...] = (
+    "海中金", "炉中火", "大林木", "路旁土", "剑锋金",  # 甲子 丙寅 戊辰 庚午 壬申
+    "山头火", "涧下水", "城墙土", "白蜡金", "杨柳木",  # 甲戌 丙子 戊寅 庚辰 壬午
+    "泉中水", "屋上土", "霹雳火", "松柏木", "长流水",  # 甲申 丙戌 戊子 庚寅 壬辰
+    "沙中金", "山下火", "平地木", "壁上土", "金箔金",  # 甲午 丙申 戊戌 庚子 壬寅
+    "覆灯火", "天河水", "大驿土", "钗钏金", "桑柘木",  # 甲辰 丙午 戊申 庚戌 壬子
+    "大溪水", "沙中土", "天上火", "石榴木", "大海水",  # 甲寅 丙辰 戊午 庚申 壬戌
+)
+
+# 十二时辰名称，以及按小时（0-23）直接索引的时辰表（23点属子时）
+_SHI_CHEN_NAMES: Tuple[str, ...] = (
+    "子时", "丑时", "寅时", "卯时", "辰时", "巳时",
+    "午时", "未时", "申时", "酉时", "戌时", "亥时",
+)
+_SHI_CHEN_BY_HOUR: Tuple[str, ...] = tuple(
+    _SHI_CHEN_NAMES[0 if hour == 23 else (hour + 1) // 2] for hour in range(24)
+)
 
 
 class GanZhiCalculator:
@@ -64,14 +97,9 @@ class GanZhiCalculator:
         Returns:
             Tuple[str, str]: (年干, 年支)
         """
-        # 以甲子年（1984年）为基准
-        base_year = 1984
-        offset = year - base_year
-        
-        gan_index = offset % 10
-        zhi_index = offset % 12
-        
-        return TIAN_GAN[gan_index], DI_ZHI[zhi_index]
+        if get_config().cache_ganzhi:
+            return _year_ganzhi_cached(year)
+        return _year_ganzhi(year)
     
     def calculate_month_ganzhi(self, dt: datetime, use_solar_terms: bool = True) -> Tuple[str, str]:
         """
@@ -87,38 +115,14 @@ class GanZhiCalculator:
         # 确保使用naive datetime
         if dt.tzinfo is not None:
             dt = dt.replace(tzinfo=None)
-            
-        if use_solar_terms:
-            # 获取当前节气
-            solar_term, _, _ = astro_calculator.get_current_solar_term(dt)
-            
-            # 根据节气确定月建（地支）
-            month_zhi_index = self.SOLAR_TERM_TO_ZHI.get(solar_term, 2)  # 默认寅月
-            month_zhi = DI_ZHI[month_zhi_index]
-            
-            # 计算月干（五虎遁年起月法）
-            year_gan, _ = self.calculate_year_ganzhi(dt.year)
-            year_gan_index = TIAN_GAN.index(year_gan)
-            
-            # 基础月干 = 年干对应的起月干 + （月支索引 - 寅月索引）
-            base_month_gan_index = self.YEAR_MONTH_GAN_TABLE.get(year_gan_index, 2)
-            month_gan_index = (base_month_gan_index + (month_zhi_index - 2)) % 10
-            month_gan = TIAN_GAN[month_gan_index]
-            
-            return month_gan, month_zhi
-        else:
-            # 简化版本：直接使用公历月份
-            month_zhi_index = (dt.month + 1) % 12  # 寅月为正月
-            month_zhi = DI_ZHI[month_zhi_index]
-            
-            # 计算月干
-            year_gan, _ = self.calculate_year_ganzhi(dt.year)
-            year_gan_index = TIAN_GAN.index(year_gan)
-            base_month_gan_index = self.YEAR_MONTH_GAN_TABLE.get(year_gan_index, 2)
-            month_gan_index = (base_month_gan_index + (month_zhi_index - 2)) % 10
-            month_gan = TIAN_GAN[month_gan_index]
-            
-            return month_gan, month_zhi
+        
+        # 按日缓存，节气在当日内交接时按精确时间选取交节前后的月干支
+        if get_config().cache_ganzhi:
+            start_ganzhi, switch_time, next_ganzhi = _day_month_ganzhi_cached(dt.toordinal(), use_solar_terms)
+            if switch_time is not None and dt >= switch_time:
+                return next_ganzhi
+            return start_ganzhi
+        return _month_ganzhi(dt, use_solar_terms)
     
     def calculate_day_ganzhi(self, dt: datetime) -> Tuple[str, str]:
         """
@@ -130,23 +134,41 @@ class GanZhiCalculator:
         Returns:
             Tuple[str, str]: (日干, 日支)
         """
-        # 确保使用naive datetime
-        if dt.tzinfo is not None:
-            dt = dt.replace(tzinfo=None)
-            
-        # 使用1900年1月1日作为基准（甲戌日）
-        from datetime import date
-        base_date = date(1900, 1, 1)
-        base_gan_index = 0  # 甲
-        base_zhi_index = 10  # 戌
+        # toordinal() 只取日期部分，与时区无关，无需先去掉tzinfo
+        if get_config().cache_ganzhi:
+            return _day_ganzhi_cached(dt.toordinal())
+        return _day_ganzhi(dt.toordinal())
+    
+    def calculate_day_ganzhi_batch(self, ordinals: Union["np.ndarray", Sequence[int]]) -> Tuple[Union["np.ndarray", List[int]], Union["np.ndarray", List[int]]]:
+        """
+        批量计算日干支序号，用于日期范围查询
         
-        target_date = dt.date()
-        days_diff = (target_date - base_date).days
+        Args:
+            ordinals: 日期序数（date.toordinal()）数组
+            
+        Returns:
+            (日干序号, 日支序号)：安装了 NumPy 时为整数数组，否则为列表；
+            可通过 TIAN_GAN / DI_ZHI 映射为名称
+        """
+        if NUMPY_AVAILABLE:
+            days_diff = np.asarray(ordinals, dtype=np.int64) - _DAY_GANZHI_BASE_ORDINAL
+            return days_diff % 10, (days_diff + 10) % 12
         
-        gan_index = (base_gan_index + days_diff) % 10
-        zhi_index = (base_zhi_index + days_diff) % 12
+        days_diffs = [ordinal - _DAY_GANZHI_BASE_ORDINAL for ordinal in ordinals]
+        return [d % 10 for d in days_diffs], [(d + 10) % 12 for d in days_diffs]
+    
+    def calculate_hour_gan(self, day_gan: str, hour_zhi_index: int) -> str:
+        """
+        计算时干（五鼠遁日起时法）
         
-        return TIAN_GAN[gan_index], DI_ZHI[zhi_index]
+        Args:
+            day_gan: 日干
+            hour_zhi_index: 时支序号（子=0）
+            
+        Returns:
+            str: 时干
+        """
+        return TIAN_GAN[_HOUR_GAN_IDX[_GAN_TO_IDX[day_gan]][hour_zhi_index]]
     
     def calculate_shi_chen(self, hour: int) -> str:
         """
@@ -158,15 +180,7 @@ class GanZhiCalculator:
         Returns:
             str: 时辰名称
         """
-        # 时辰对应表
-        shi_chen_list = ["子时", "丑时", "寅时", "卯时", "辰时", "巳时", 
-                        "午时", "未时", "申时", "酉时", "戌时", "亥时"]
-        
-        if hour == 23:
-            return shi_chen_list[0]  # 子时
-        else:
-            index = (hour + 1) // 2
-            return shi_chen_list[index]
+        return _SHI_CHEN_BY_HOUR[hour]
     
     def get_nayin(self, gan: str, zhi: str) -> str:
         """
@@ -179,71 +193,128 @@ class GanZhiCalculator:
         Returns:
             str: 纳音五行名称
         """
-        # 纳音表
-        nayin_table = {
-            # 甲子、乙丑
-            ("甲", "子"): "海中金", ("乙", "丑"): "海中金",
-            # 丙寅、丁卯  
-            ("丙", "寅"): "炉中火", ("丁", "卯"): "炉中火",
-            # 戊辰、己巳
-            ("戊", "辰"): "大林木", ("己", "巳"): "大林木",
-            # 庚午、辛未
-            ("庚", "午"): "路旁土", ("辛", "未"): "路旁土",
-            # 壬申、癸酉
-            ("壬", "申"): "剑锋金", ("癸", "酉"): "剑锋金",
-            # 甲戌、乙亥
-            ("甲", "戌"): "山头火", ("乙", "亥"): "山头火",
-            # 丙子、丁丑
-            ("丙", "子"): "涧下水", ("丁", "丑"): "涧下水",
-            # 戊寅、己卯
-            ("戊", "寅"): "城墙土", ("己", "卯"): "城墙土",
-            # 庚辰、辛巳
-            ("庚", "辰"): "白蜡金", ("辛", "巳"): "白蜡金",
-            # 壬午、癸未
-            ("壬", "午"): "杨柳木", ("癸", "未"): "杨柳木",
-            # 甲申、乙酉
-            ("甲", "申"): "泉中水", ("乙", "酉"): "泉中水",
-            # 丙戌、丁亥
-            ("丙", "戌"): "屋上土", ("丁", "亥"): "屋上土",
-            # 戊子、己丑
-            ("戊", "子"): "霹雳火", ("己", "丑"): "霹雳火",
-            # 庚寅、辛卯
-            ("庚", "寅"): "松柏木", ("辛", "卯"): "松柏木",
-            # 壬辰、癸巳
-            ("壬", "辰"): "长流水", ("癸", "巳"): "长流水",
-            # 甲午、乙未
-            ("甲", "午"): "沙中金", ("乙", "未"): "沙中金",
-            # 丙申、丁酉
-            ("丙", "申"): "山下火", ("丁", "酉"): "山下火",
-            # 戊戌、己亥
-            ("戊", "戌"): "平地木", ("己", "亥"): "平地木",
-            # 庚子、辛丑
-            ("庚", "子"): "壁上土", ("辛", "丑"): "壁上土",
-            # 壬寅、癸卯
-            ("壬", "寅"): "金箔金", ("癸", "卯"): "金箔金",
-            # 甲辰、乙巳
-            ("甲", "辰"): "覆灯火", ("乙", "巳"): "覆灯火",
-            # 丙午、丁未
-            ("丙", "午"): "天河水", ("丁", "未"): "天河水",
-            # 戊申、己酉
-            ("戊", "申"): "大驿土", ("己", "酉"): "大驿土",
-            # 庚戌、辛亥
-            ("庚", "戌"): "钗钏金", ("辛", "亥"): "钗钏金",
-            # 壬子、癸丑
-            ("壬", "子"): "桑柘木", ("癸", "丑"): "桑柘木",
-            # 甲寅、乙卯
-            ("甲", "寅"): "大溪水", ("乙", "卯"): "大溪水",
-            # 丙辰、丁巳
-            ("丙", "辰"): "沙中土", ("丁", "巳"): "沙中土",
-            # 戊午、己未
-            ("戊", "午"): "天上火", ("己", "未"): "天上火",
-            # 庚申、辛酉
-            ("庚", "申"): "石榴木", ("辛", "酉"): "石榴木",
-            # 壬戌、癸亥
-            ("壬", "戌"): "大海水", ("癸", "亥"): "大海水"
-        }
+        gan_index = _GAN_TO_IDX.get(gan)
+        zhi_index = _ZHI_TO_IDX.get(zhi)
+        # 干支阴阳必须相同（阳干配阳支），否则不是六十甲子之一
+        if gan_index is None or zhi_index is None or (gan_index - zhi_index) % 2:
+            return "未知纳音"
+        
+        # 六十甲子序号，满足 序号%10=干序、序号%12=支序
+        jiazi_index = (6 * gan_index - 5 * zhi_index) % 60
+        return _NAYIN_BY_JIAZI_INDEX[jiazi_index // 2]
+
+
+# 五虎遁月干表：_MONTH_GAN_IDX[年干序号][月支序号] = 月干序号
+# 月干 = 年干对应的起月干 + （月支索引 - 寅月索引）
+_MONTH_GAN_IDX: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple((GanZhiCalculator.YEAR_MONTH_GAN_TABLE[year_gan] + (month_zhi - 2)) % 10 for month_zhi in range(12))
+    for year_gan in range(10)
+)
+
+# 五鼠遁时干表：_HOUR_GAN_IDX[日干序号][时支序号] = 时干序号
+_HOUR_GAN_IDX: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple((GanZhiCalculator.DAY_HOUR_GAN_TABLE[day_gan] + hour_zhi) % 10 for hour_zhi in range(12))
+    for day_gan in range(10)
+)
+
+
+# 以下为干支计算的纯函数实现，参数均为可哈希的基本值，
+# GanZhiCalculator 根据配置 cache_ganzhi 选择带缓存或不带缓存的版本
+
+def _year_ganzhi(year: int) -> Tuple[str, str]:
+    """年干支，见 GanZhiCalculator.calculate_year_ganzhi"""
+    # 以甲子年（1984年）为基准
+    base_year = 1984
+    offset = year - base_year
+    
+    gan_index = offset % 10
+    zhi_index = offset % 12
+    
+    return TIAN_GAN[gan_index], DI_ZHI[zhi_index]
+
+
+@lru_cache(maxsize=2048)
+def _day_solar_terms(ordinal: int) -> Tuple[Tuple[str, int, datetime], Optional[Tuple[str, int, datetime]]]:
+    """
+    某日（date.toordinal()）的节气信息
+    
+    Returns:
+        (当日零点所处节气, 当日内交接的下一个节气或None)；相邻节气相隔约15天，一天内至多交接一次
+    """
+    day_start = datetime.fromordinal(ordinal)
+    next_day_start = datetime.fromordinal(ordinal + 1)
+    start_term = astro_calculator.get_current_solar_term(day_start)
+    next_term = astro_calculator.get_current_solar_term(next_day_start)
+    if next_term[2] != start_term[2] and next_term[2] < next_day_start:
+        return start_term, next_term
+    return start_term, None
+
+
+def _current_solar_term(dt: datetime) -> Tuple[str, int, datetime]:
+    """当前节气（dt为naive datetime），配置 cache_solar_terms 开启时按日缓存节气交接信息"""
+    if not get_config().cache_solar_terms:
+        return astro_calculator.get_current_solar_term(dt)
+    
+    start_term, next_term = _day_solar_terms(dt.toordinal())
+    # 节气在当日内交接时按精确时间判断
+    if next_term is not None and dt >= next_term[2]:
+        return next_term
+    return start_term
+
+
+def _month_ganzhi(dt: datetime, use_solar_terms: bool) -> Tuple[str, str]:
+    """月干支（dt为naive datetime），见 GanZhiCalculator.calculate_month_ganzhi"""
+    if use_solar_terms:
+        # 获取当前节气
+        solar_term, _, _ = _current_solar_term(dt)
         
-        return nayin_table.get((gan, zhi), "未知纳音")
+        # 根据节气确定月建（地支）
+        month_zhi_index = GanZhiCalculator.SOLAR_TERM_TO_ZHI.get(solar_term, 2)  # 默认寅月
+    else:
+        # 简化版本：直接使用公历月份
+        month_zhi_index = (dt.month + 1) % 12  # 寅月为正月
+    
+    return _month_gan_zhi(dt.year, month_zhi_index)
+
+
+def _month_gan_zhi(year: int, month_zhi_index: int) -> Tuple[str, str]:
+    """由年份和月支序号得到月干支"""
+    # 计算月干（五虎遁年起月法），年干序号即 (年份 - 1984) % 10
+    return TIAN_GAN[_MONTH_GAN_IDX[(year - 1984) % 10][month_zhi_index]], DI_ZHI[month_zhi_index]
+
+
+@lru_cache(maxsize=4096)
+def _day_month_ganzhi_cached(ordinal: int, use_solar_terms: bool) -> Tuple[Tuple[str, str], Optional[datetime], Optional[Tuple[str, str]]]:
+    """
+    某日（date.toordinal()）的月干支，按日缓存
+    
+    Returns:
+        (当日零点的月干支, 当日内交节时间或None, 交节后的月干支或None)
+    """
+    day_start = datetime.fromordinal(ordinal)
+    if not use_solar_terms:
+        return _month_ganzhi(day_start, False), None, None
+    
+    start_term, next_term = _day_solar_terms(ordinal)
+    start_ganzhi = _month_gan_zhi(day_start.year, GanZhiCalculator.SOLAR_TERM_TO_ZHI.get(start_term[0], 2))
+    if next_term is None:
+        return start_ganzhi, None, None
+    return start_ganzhi, next_term[2], _month_gan_zhi(day_start.year, GanZhiCalculator.SOLAR_TERM_TO_ZHI.get(next_term[0], 2))
+
+
+# 1900年1月1日（甲戌日）的序数日，日干支的基准
+_DAY_GANZHI_BASE_ORDINAL = date(1900, 1, 1).toordinal()
+
+
+def _day_ganzhi(ordinal: int) -> Tuple[str, str]:
+    """日干支（参数为 date.toordinal()），见 GanZhiCalculator.calculate_day_ganzhi"""
+    days_diff = ordinal - _DAY_GANZHI_BASE_ORDINAL
+    # 基准日天干为甲（0）、地支为戌（10）
+    return TIAN_GAN[days_diff % 10], DI_ZHI[(days_diff + 10) % 12]
+
+
+_year_ganzhi_cached = lru_cache(maxsize=4096)(_year_ganzhi)
+_day_ganzhi_cached = lru_cache(maxsize=4096)(_day_ganzhi)
 
 
 # 全局实例 - 统一的干支计算入口
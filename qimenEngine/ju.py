@@ -2,7 +2,8 @@
 奇门遁甲局号计算模块
 """
 
-from typing import Literal, Tuple
+from functools import lru_cache
+from typing import List, Literal, Sequence, Tuple, Union
 try:
     from qimen_calendar import CalendarInfo
     from symbols import (
@@ -15,6 +16,30 @@ except ImportError:
     )
 
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# 地支到序号的映射；时辰数字即 序号 + 1（子=1 ... 亥=12）
+_ZHI_TO_IDX = {zhi: index for index, zhi in enumerate(DI_ZHI)}
+
+
+def _jit(func):
+    """安装了 numba 时编译为机器码，否则原样返回（磁盘缓存规则同 astronomical._jit）"""
+    if NUMBA_AVAILABLE:
+        return njit(cache=bool(__package__))(func)
+    return func
+
+
 def get_ju(
     cal: CalendarInfo,
     mode: Literal["拆补", "活盘"] = "活盘"
@@ -45,13 +70,9 @@ def get_ju_chabu(cal: CalendarInfo) -> Tuple[int, bool]:
     Returns:
         Tuple[int, bool]: (局号, 是否阳遁)
     """
-    # 判断阴阳遁
-    is_yang = is_yang_dune(cal)
-    
-    # 计算局号
-    ju_number = calculate_ju_number_chabu(cal, is_yang)
-    
-    return ju_number, is_yang
+    return _get_ju_chabu_cached(
+        cal["solar_term_index"], cal["yuan_shou"], _ZHI_TO_IDX.get(cal["hour_zhi"], 0) + 1
+    )
 
 
 def get_ju_huopan(cal: CalendarInfo) -> Tuple[int, bool]:
@@ -64,16 +85,12 @@ def get_ju_huopan(cal: CalendarInfo) -> Tuple[int, bool]:
     Returns:
         Tuple[int, bool]: (局号, 是否阳遁)
     """
-    # 判断阴阳遁
-    is_yang = is_yang_dune(cal)
-    
-    # 计算局号索引（0-17，对应阴阳遁各9局）
-    ju_index = calculate_ju_index_huopan(cal, is_yang)
-    
-    # 转换为局号（1-9）
-    ju_number = (ju_index % 9) + 1
-    
-    return ju_number, is_yang
+    return _get_ju_huopan_cached(
+        cal["solar_term_index"],
+        TIAN_GAN.index(cal["day_gan"]),
+        DI_ZHI.index(cal["day_zhi"]),
+        DI_ZHI.index(cal["hour_zhi"])
+    )
 
 
 def is_yang_dune(cal: CalendarInfo) -> bool:
@@ -86,11 +103,14 @@ def is_yang_dune(cal: CalendarInfo) -> bool:
     Returns:
         bool: 是否为阳遁
     """
+    return _is_yang_dune(cal["solar_term_index"])
+
+
+def _is_yang_dune(solar_term_index: int) -> bool:
+    """根据节气索引判断阴阳遁，见 is_yang_dune"""
     # 根据节气判断阴阳遁
     # 冬至到夏至为阳遁，夏至到冬至为阴遁
     
-    solar_term_index = cal["solar_term_index"]
-    
     # 阳遁：冬至(23) - 夏至(11)
     # 阴遁：夏至(11) - 冬至(23)
     
@@ -112,25 +132,18 @@ def calculate_ju_number_chabu(cal: CalendarInfo, is_yang: bool) -> int:
     Returns:
         int: 局号（1-9）
     """
-    # 获取元首（节气在月内的位置）
-    yuan_shou = cal["yuan_shou"]
-    
-    # 获取时辰对应的数字
-    shi_chen_num = get_shi_chen_number(cal["hour_zhi"])
-    
-    # 基础局号计算
+    # 元首（节气在月内的位置）与时辰对应的数字
+    return _ju_number_chabu(cal["yuan_shou"], get_shi_chen_number(cal["hour_zhi"]), is_yang)
+
+
+def _ju_number_chabu(yuan_shou: int, shi_chen_num: int, is_yang: bool) -> int:
+    """由元首和时辰数字计算拆补法局号，见 calculate_ju_number_chabu"""
+    # 基础局号计算，((x - 1) % 9) + 1 直接落在1-9范围内（9的倍数对应9局）
     if is_yang:
         # 阳遁：元首 + 时辰 - 1
-        base_ju = (yuan_shou + shi_chen_num - 1) % 9
-    else:
-        # 阴遁：元首 - 时辰 + 1
-        base_ju = (yuan_shou - shi_chen_num + 1) % 9
-    
-    # 确保局号在1-9范围内
-    if base_ju == 0:
-        base_ju = 9
-    
-    return base_ju
+        return ((yuan_shou + shi_chen_num - 2) % 9) + 1
+    # 阴遁：元首 - 时辰 + 1
+    return ((yuan_shou - shi_chen_num) % 9) + 1
 
 
 def calculate_ju_index_huopan(cal: CalendarInfo, is_yang: bool) -> int:
@@ -144,17 +157,20 @@ def calculate_ju_index_huopan(cal: CalendarInfo, is_yang: bool) -> int:
     Returns:
         int: 局号索引（0-17）
     """
-    # 获取日干支数字
-    day_gan_num = TIAN_GAN.index(cal["day_gan"])
-    day_zhi_num = DI_ZHI.index(cal["day_zhi"])
-    
-    # 获取时辰数字
-    hour_zhi_num = DI_ZHI.index(cal["hour_zhi"])
-    
-    # 根据节气和时间计算索引
-    solar_term_index = cal["solar_term_index"]
-    
-    # 基础计算
+    # 日干支、时辰数字
+    return _ju_index_huopan(
+        cal["solar_term_index"],
+        TIAN_GAN.index(cal["day_gan"]),
+        DI_ZHI.index(cal["day_zhi"]),
+        DI_ZHI.index(cal["hour_zhi"]),
+        is_yang
+    )
+
+
+def _ju_index_huopan(solar_term_index: int, day_gan_num: int, day_zhi_num: int,
+                     hour_zhi_num: int, is_yang: bool) -> int:
+    """由节气索引和日、时干支序号计算活盘法局号索引，见 calculate_ju_index_huopan"""
+    # 根据节气和时间计算基础索引
     base_index = (solar_term_index * 2 + day_gan_num + day_zhi_num + hour_zhi_num) % 18
     
     # 根据阴阳遁调整
@@ -166,6 +182,78 @@ def calculate_ju_index_huopan(cal: CalendarInfo, is_yang: bool) -> int:
     return ju_index
 
 
+# 局号只取决于历法信息中的少数几个小整数，按这些整数缓存计算结果
+
+@lru_cache(maxsize=4096)
+def _get_ju_chabu_cached(solar_term_index: int, yuan_shou: int, shi_chen_num: int) -> Tuple[int, bool]:
+    """拆补法（局号, 是否阳遁），见 get_ju_chabu"""
+    is_yang = _is_yang_dune(solar_term_index)
+    return _ju_number_chabu(yuan_shou, shi_chen_num, is_yang), is_yang
+
+
+@lru_cache(maxsize=4096)
+def _get_ju_huopan_cached(solar_term_index: int, day_gan_num: int, day_zhi_num: int,
+                          hour_zhi_num: int) -> Tuple[int, bool]:
+    """活盘法（局号, 是否阳遁），见 get_ju_huopan"""
+    is_yang = _is_yang_dune(solar_term_index)
+    # 局号索引（0-17，对应阴阳遁各9局）转换为局号（1-9）
+    ju_index = _ju_index_huopan(solar_term_index, day_gan_num, day_zhi_num, hour_zhi_num, is_yang)
+    return (ju_index % 9) + 1, is_yang
+
+
+@_jit
+def _ju_chabu_kernel(solar_term_indices, yuan_shous, hour_zhi_indices, ju_numbers, is_yang):
+    """批量拆补法计算内核，结果写入 ju_numbers / is_yang，见 get_ju_chabu_batch"""
+    for i in range(solar_term_indices.shape[0]):
+        solar_term_index = solar_term_indices[i]
+        yang = solar_term_index >= 23 or solar_term_index <= 11
+        is_yang[i] = yang
+        # 时辰数字 = 时支序号 + 1，代入 _ju_number_chabu 的公式
+        if yang:
+            ju_numbers[i] = ((yuan_shous[i] + hour_zhi_indices[i] - 1) % 9) + 1
+        else:
+            ju_numbers[i] = ((yuan_shous[i] - hour_zhi_indices[i] - 1) % 9) + 1
+
+
+def get_ju_chabu_batch(
+    solar_term_indices: Union["np.ndarray", Sequence[int]],
+    yuan_shous: Union["np.ndarray", Sequence[int]],
+    hour_zhi_indices: Union["np.ndarray", Sequence[int]]
+) -> Tuple[Union["np.ndarray", List[int]], Union["np.ndarray", List[bool]]]:
+    """
+    批量拆补置闰法计算局号，用于时间范围扫描等大批量排盘
+    
+    Args:
+        solar_term_indices: 节气索引数组
+        yuan_shous: 元首数组
+        hour_zhi_indices: 时支序号数组（子=0）
+        
+    Returns:
+        (局号, 是否阳遁)：安装了 NumPy 时为数组，否则为列表
+    """
+    if NUMPY_AVAILABLE:
+        terms = np.asarray(solar_term_indices, dtype=np.int64)
+        yuan = np.asarray(yuan_shous, dtype=np.int64)
+        hours = np.asarray(hour_zhi_indices, dtype=np.int64)
+        
+        if NUMBA_AVAILABLE:
+            ju_numbers = np.empty(terms.shape, dtype=np.int64)
+            is_yang = np.empty(terms.shape, dtype=np.bool_)
+            _ju_chabu_kernel(terms, yuan, hours, ju_numbers, is_yang)
+            return ju_numbers, is_yang
+        
+        is_yang = (terms >= 23) | (terms <= 11)
+        ju_numbers = (np.where(is_yang, yuan + hours, yuan - hours) - 1) % 9 + 1
+        return ju_numbers, is_yang
+    
+    is_yang = [_is_yang_dune(term) for term in solar_term_indices]
+    ju_numbers = [
+        _ju_number_chabu(yuan_shou, hour_zhi_index + 1, yang)
+        for yuan_shou, hour_zhi_index, yang in zip(yuan_shous, hour_zhi_indices, is_yang)
+    ]
+    return ju_numbers, is_yang
+
+
 def get_shi_chen_number(hour_zhi: str) -> int:
     """
     获取时辰对应的数字
@@ -176,14 +264,8 @@ def get_shi_chen_number(hour_zhi: str) -> int:
     Returns:
         int: 时辰数字
     """
-    # 时辰数字对应表
-    shi_chen_nums = {
-        "子": 1, "丑": 2, "寅": 3, "卯": 4,
-        "辰": 5, "巳": 6, "午": 7, "未": 8,
-        "申": 9, "酉": 10, "戌": 11, "亥": 12
-    }
-    
-    return shi_chen_nums.get(hour_zhi, 1)
+    # 未知地支按子时处理
+    return _ZHI_TO_IDX.get(hour_zhi, 0) + 1
 
 
 def get_ju_name(ju_number: int, is_yang: bool) -> str:
@@ -201,6 +283,17 @@ def get_ju_name(ju_number: int, is_yang: bool) -> str:
     return f"{dun_type}{ju_number}局"
 
 
+# 各月份（1-12，下标0不用）的季节性局号范围：
+# 春季（2-4月）1-3局，夏季（5-7月）4-6局，秋季（8-10月）7-9局，冬季1-3局
+_SEASONAL_JU_RANGE: Tuple[Tuple[int, int], ...] = (
+    (1, 3),
+    (1, 3), (1, 3), (1, 3), (1, 3),
+    (4, 6), (4, 6), (4, 6),
+    (7, 9), (7, 9), (7, 9),
+    (1, 3), (1, 3),
+)
+
+
 def get_seasonal_ju_range(month: int) -> Tuple[int, int]:
     """
     获取季节性局号范围
@@ -211,18 +304,9 @@ def get_seasonal_ju_range(month: int) -> Tuple[int, int]:
     Returns:
         Tuple[int, int]: (最小局号, 最大局号)
     """
-    # 春季：1-3局
-    if month in [2, 3, 4]:
-        return (1, 3)
-    # 夏季：4-6局
-    elif month in [5, 6, 7]:
-        return (4, 6)
-    # 秋季：7-9局
-    elif month in [8, 9, 10]:
-        return (7, 9)
-    # 冬季：1-3局
-    else:
-        return (1, 3)
+    if 1 <= month <= 12:
+        return _SEASONAL_JU_RANGE[month]
+    return (1, 3)
 
 
 def validate_ju(ju_number: int, is_yang: bool, cal: CalendarInfo) -> bool:
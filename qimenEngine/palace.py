@@ -3,26 +3,49 @@
 """
 
 import json
-from typing import Dict, List, Optional, Union, TypedDict
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union, TypedDict
 from dataclasses import dataclass
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
     from qimen_calendar import CalendarInfo
     from symbols import (
         JIU_GONG, LUOSHU, TIAN_GAN, DI_ZHI, BA_MEN, JIU_XING, JIU_SHEN,
-        GONG_POSITION, BAGUA_GONG
+        GONG_POSITION, BAGUA_GONG, GONG_WU_XING
     )
 except ImportError:
     from .qimen_calendar import CalendarInfo
     from .symbols import (
         JIU_GONG, LUOSHU, TIAN_GAN, DI_ZHI, BA_MEN, JIU_XING, JIU_SHEN,
-        GONG_POSITION, BAGUA_GONG
+        GONG_POSITION, BAGUA_GONG, GONG_WU_XING
     )
 
 
-class PalaceInfo(TypedDict):
-    """单宫信息"""
+class PalaceInfoDict(TypedDict):
+    """单宫信息的字典形式，用于JSON序列化"""
+    gong_num: int
+    gong_name: str
+    position: str
+    bagua: str
+    gan: str
+    men: str
+    xing: str
+    shen: str
+    wu_xing: str
+
+
+@dataclass(frozen=True, slots=True)
+class PalaceInfo:
+    """单宫信息（不可变，可在多个九宫盘之间共享）"""
     gong_num: int
     gong_name: str
     position: str
@@ -33,17 +56,183 @@ class PalaceInfo(TypedDict):
     shen: str
     wu_xing: str
     
+    def as_dict(self) -> PalaceInfoDict:
+        """转换为字典"""
+        return PalaceInfoDict(
+            gong_num=self.gong_num,
+            gong_name=self.gong_name,
+            position=self.position,
+            bagua=self.bagua,
+            gan=self.gan,
+            men=self.men,
+            xing=self.xing,
+            shen=self.shen,
+            wu_xing=self.wu_xing
+        )
+    
 
 class NinePalace(TypedDict):
     """九宫盘信息"""
     ju_number: int
     is_yang: bool
     ju_name: str
-    palaces: Dict[str, PalaceInfo]
+    palaces: Dict[int, PalaceInfo]  # 以宫位号为键
     calendar_info: Optional[CalendarInfo]
     mode: str  # "turn" or "fly"
+    zhi_fu_gong: Optional[int]  # 值符（直符）所在宫位号，排盘时确定
     
 
+# 排盘默认序列（三奇六仪、八门、九星、九神），转盘与飞盘共用，转盘阴遁时逆序使用
+_GAN_SEQUENCE = ("戊", "己", "庚", "辛", "壬", "癸", "丁", "丙", "乙")
+_MEN_SEQUENCE = tuple(BA_MEN)
+_XING_SEQUENCE = tuple(JIU_XING)
+_SHEN_SEQUENCE = tuple(JIU_SHEN)
+
+
+# 各宫固定信息：(宫位号, 数据文件中的键, 宫名, 方位, 八卦, 五行)，按宫位号排列
+_GONG_STATIC: Tuple[Tuple[int, str, str, str, str, str], ...] = tuple(
+    (gong_num, str(gong_num), JIU_GONG[gong_num], GONG_POSITION[gong_num], BAGUA_GONG[gong_num], GONG_WU_XING[gong_num])
+    for gong_num in range(1, 10)
+)
+
+
+def _build_turn_palaces(ju_number: int, is_yang: bool) -> Dict[int, PalaceInfo]:
+    """按默认序列计算转盘九宫，见 PalaceEngine._calculate_turn_pan"""
+    if is_yang:
+        # 阳遁：正序
+        offset = ju_number - 1
+        gan_sequence, men_sequence = _GAN_SEQUENCE, _MEN_SEQUENCE
+        xing_sequence, shen_sequence = _XING_SEQUENCE, _SHEN_SEQUENCE
+    else:
+        # 阴遁：逆序
+        offset = 9 - ju_number
+        gan_sequence, men_sequence = _GAN_SEQUENCE[::-1], _MEN_SEQUENCE[::-1]
+        xing_sequence, shen_sequence = _XING_SEQUENCE[::-1], _SHEN_SEQUENCE[::-1]
+    
+    palaces = {}
+    for gong_num, _, gong_name, position, bagua, wu_xing in _GONG_STATIC:
+        idx = (gong_num - 1 + offset) % 9
+        palaces[gong_num] = PalaceInfo(
+            gong_num=gong_num,
+            gong_name=gong_name,
+            position=position,
+            bagua=bagua,
+            gan=gan_sequence[idx],
+            men=men_sequence[idx],
+            xing=xing_sequence[idx],
+            shen=shen_sequence[idx],
+            wu_xing=wu_xing
+        )
+    return palaces
+
+
+# 九宫相邻关系（基于洛书排列）
+_ADJACENT_GONGS: Dict[int, Tuple[int, ...]] = {
+    1: (2, 4, 6),       # 坎宫
+    2: (1, 3, 5),       # 坤宫
+    3: (2, 4, 8),       # 震宫
+    4: (1, 3, 7, 9),  # 巽宫
+    5: (2, 6, 8),       # 中宫
+    6: (1, 5, 7),       # 乾宫
+    7: (4, 6, 8),       # 兑宫
+    8: (3, 5, 7, 9),  # 艮宫
+    9: (4, 8),            # 离宫
+}
+
+
+# 五行相生、相克（前者生/克后者）
+_WU_XING_SHENG = {"木": "火", "火": "土", "土": "金", "金": "水", "水": "木"}
+_WU_XING_KE = {"木": "土", "土": "水", "水": "火", "火": "金", "金": "木"}
+
+# 两个五行之间的关系，一次查表得到：(五行1, 五行2) -> "sheng" / "ke"，其余为平
+_WU_XING_RELATION: Dict[Tuple[str, str], str] = {
+    **{(a, b): "ke" for a, b in _WU_XING_KE.items()},
+    **{(a, b): "sheng" for a, b in _WU_XING_SHENG.items()},
+}
+
+# 值符对其他宫位的影响描述，按五行关系区分
+_RELATION_INFLUENCE: Dict[Optional[str], str] = {
+    "sheng": "生助有力，加强吉祥",
+    "ke": "制约有度，化解凶煞",
+    None: "关系平和，影响中性",
+}
+
+
+def _find_zhi_fu_gong(palaces: Dict[int, PalaceInfo]) -> Optional[int]:
+    """查找值符（直符）所在宫位号，未找到时返回None"""
+    for palace_info in palaces.values():
+        if palace_info.shen == "直符":
+            return palace_info.gong_num
+    return None
+
+
+# 月份（1-12，下标0不用）所属季节：0春（3-5月）、1夏（6-8月）、2秋（9-11月）、3冬
+_SEASON_OF_MONTH: Tuple[int, ...] = (3, 3, 3, 0, 0, 0, 1, 1, 1, 2, 2, 2, 3)
+
+# 各季节的名称、当旺五行、衰弱五行
+_SEASONS: Tuple[Tuple[str, str, str], ...] = (
+    ("春季", "木", "金"),
+    ("夏季", "火", "水"),
+    ("秋季", "金", "木"),
+    ("冬季", "水", "火"),
+)
+
+# 值符时令影响：(季节, 宫位五行) -> 描述，未列出的五行取该季节的平稳描述
+_SEASONAL_INFLUENCE: Dict[Tuple[int, str], str] = {
+    **{(season, wang): f"{name}{wang}旺，值符得时而强" for season, (name, wang, _) in enumerate(_SEASONS)},
+    **{(season, shuai): f"{name}{shuai}衰，值符失时需谨慎" for season, (name, _, shuai) in enumerate(_SEASONS)},
+}
+_SEASONAL_NEUTRAL: Tuple[str, ...] = tuple(f"{name}时令，值符力量平稳" for name, _, _ in _SEASONS)
+
+# 值符居各宫（1-9，下标0不用）的含义
+_ZHI_FU_MEANINGS: Tuple[str, ...] = (
+    "",
+    "值符居坎宫，主智慧谋略，利于策划思考",
+    "值符居坤宫，主厚德载物，利于合作共事",
+    "值符居震宫，主振奋向上，利于开创事业",
+    "值符居巽宫，主进退有度，利于渐进发展",
+    "值符居中宫，主居中调和，统领全局",
+    "值符居乾宫，主刚健有力，利于领导决策",
+    "值符居兑宫，主言语交流，利于社交商谈",
+    "值符居艮宫，主稳重止静，利于守成积蓄",
+    "值符居离宫，主光明正大，利于宣传展示",
+)
+
+# 值符天干戊土在各五行宫位的旺衰
+_WANG_SHUAI_BY_WX: Dict[str, str] = {
+    "土": "戊土居土宫，比和而旺",
+    "火": "戊土居火宫，火生土旺",
+    "金": "戊土居金宫，土生金泄",
+    "水": "戊土居水宫，土克水耗力",
+    "木": "戊土居木宫，木克土受制",
+}
+
+
+# 18局（阳遁、阴遁各1-9局）的转盘九宫及值符宫位，导入时计算一次
+_TURN_PAN_PALACES: Dict[Tuple[int, bool], Dict[int, PalaceInfo]] = {
+    (ju_number, is_yang): _build_turn_palaces(ju_number, is_yang)
+    for is_yang in (True, False)
+    for ju_number in range(1, 10)
+}
+_TURN_PAN_ZHI_FU_GONG: Dict[Tuple[int, bool], Optional[int]] = {
+    key: _find_zhi_fu_gong(palaces) for key, palaces in _TURN_PAN_PALACES.items()
+}
+
+
+@lru_cache(maxsize=4)
+def _read_palace_data(data_path: str, mtime_ns: int, size: int) -> Mapping[str, Any]:
+    """
+    解析活盘数据文件
+    
+    以文件修改时间和大小作为缓存键的一部分，文件变化后自动重新解析；
+    返回只读视图，供所有引擎实例共享
+    """
+    with open(data_path, 'rb') as f:
+        content = f.read()
+    data = orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content.decode('utf-8'))
+    return MappingProxyType(data)
+
+
 class PalaceEngine:
     """宫位排盘引擎"""
     
@@ -56,14 +245,15 @@ class PalaceEngine:
         """
         self.palace_data = self._load_palace_data(palace_data_path)
         
-    def _load_palace_data(self, data_path: str) -> dict:
-        """加载18活盘数据"""
+    def _load_palace_data(self, data_path: str) -> Mapping[str, Any]:
+        """加载18活盘数据（只读），文件未修改时复用已解析的结果"""
         try:
-            with open(data_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            st = os.stat(data_path)
         except FileNotFoundError:
             # 如果文件不存在，使用默认数据
             return self._get_default_palace_data()
+        
+        return _read_palace_data(data_path, st.st_mtime_ns, st.st_size)
     
     def _get_default_palace_data(self) -> dict:
         """获取默认活盘数据"""
@@ -97,20 +287,19 @@ class PalaceEngine:
         
         # 构建九宫盘
         palaces = {}
-        for gong_num in range(1, 10):
-            gong_str = str(gong_num)
+        for gong_num, gong_str, gong_name, position, bagua, wu_xing in _GONG_STATIC:
             base_info = base_palace["palaces"].get(gong_str, {})
             
-            palaces[gong_str] = PalaceInfo(
+            palaces[gong_num] = PalaceInfo(
                 gong_num=gong_num,
-                gong_name=JIU_GONG[gong_num],
-                position=GONG_POSITION[gong_num],
-                bagua=BAGUA_GONG[gong_num],
+                gong_name=gong_name,
+                position=position,
+                bagua=bagua,
                 gan=base_info.get("gan", ""),
                 men=base_info.get("men", ""),
                 xing=base_info.get("xing", ""),
                 shen=base_info.get("shen", ""),
-                wu_xing=self._get_gong_wu_xing(gong_num)
+                wu_xing=wu_xing
             )
         
         return NinePalace(
@@ -119,7 +308,8 @@ class PalaceEngine:
             ju_name=ju_name,
             palaces=palaces,
             calendar_info=None,
-            mode="turn"
+            mode="turn",
+            zhi_fu_gong=_find_zhi_fu_gong(palaces)
         )
     
     def fly_pan(self, cal: CalendarInfo) -> NinePalace:
@@ -143,24 +333,25 @@ class PalaceEngine:
             year_gan_idx, month_zhi_idx, day_gan_idx, hour_zhi_idx
         )
         
-        # 构建飞盘
+        # 构建飞盘，九神序列首位为值符
         palaces = {}
-        for gong_num in range(1, 10):
-            gong_str = str(gong_num)
-            
-            # 计算飞到的位置
-            fly_pos = self._calculate_fly_position(start_gong, gong_num)
+        zhi_fu_gong = None
+        for gong_num, _, gong_name, position, bagua, wu_xing in _GONG_STATIC:
+            # 计算飞到的位置，按位置取默认序列中的干、门、星、神
+            idx = self._calculate_fly_position(start_gong, gong_num) - 1
+            if idx == 0:
+                zhi_fu_gong = gong_num
             
-            palaces[gong_str] = PalaceInfo(
+            palaces[gong_num] = PalaceInfo(
                 gong_num=gong_num,
-                gong_name=JIU_GONG[gong_num],
-                position=GONG_POSITION[gong_num],
-                bagua=BAGUA_GONG[gong_num],
-                gan=self._get_fly_gan(fly_pos),
-                men=self._get_fly_men(fly_pos),
-                xing=self._get_fly_xing(fly_pos),
-                shen=self._get_fly_shen(fly_pos),
-                wu_xing=self._get_gong_wu_xing(gong_num)
+                gong_name=gong_name,
+                position=position,
+                bagua=bagua,
+                gan=_GAN_SEQUENCE[idx],
+                men=_MEN_SEQUENCE[idx],
+                xing=_XING_SEQUENCE[idx],
+                shen=_SHEN_SEQUENCE[idx],
+                wu_xing=wu_xing
             )
         
         return NinePalace(
@@ -169,7 +360,8 @@ class PalaceEngine:
             ju_name="飞盘",
             palaces=palaces,
             calendar_info=cal,
-            mode="fly"
+            mode="fly",
+            zhi_fu_gong=zhi_fu_gong
         )
     
     def _calculate_turn_pan(self, ju_number: int, is_yang: bool) -> NinePalace:
@@ -178,40 +370,14 @@ class PalaceEngine:
         dun_type = "阳遁" if is_yang else "阴遁"
         ju_name = f"{dun_type}{ju_number}局"
         
-        # 默认排列
-        base_sequence = ["戊", "己", "庚", "辛", "壬", "癸", "丁", "丙", "乙"]
-        men_sequence = ["休门", "死门", "伤门", "杜门", "中门", "开门", "惊门", "生门", "景门"]
-        xing_sequence = ["天蓬", "天任", "天冲", "天辅", "天禽", "天心", "天柱", "天英", "天芮"]
-        shen_sequence = ["直符", "腾蛇", "太阴", "六合", "白虎", "玄武", "九地", "九天", "太常"]
-        
-        # 根据局号和阴阳遁调整序列
-        if is_yang:
-            # 阳遁：正序
-            offset = ju_number - 1
+        # 常规局号直接复用预先计算的九宫，宫位信息不可变，只需复制外层映射
+        base_palaces = _TURN_PAN_PALACES.get((ju_number, is_yang))
+        if base_palaces is None:
+            palaces = _build_turn_palaces(ju_number, is_yang)
+            zhi_fu_gong = _find_zhi_fu_gong(palaces)
         else:
-            # 阴遁：逆序
-            offset = 9 - ju_number
-            base_sequence = base_sequence[::-1]
-            men_sequence = men_sequence[::-1]
-            xing_sequence = xing_sequence[::-1]
-            shen_sequence = shen_sequence[::-1]
-        
-        palaces = {}
-        for gong_num in range(1, 10):
-            gong_str = str(gong_num)
-            idx = (gong_num - 1 + offset) % 9
-            
-            palaces[gong_str] = PalaceInfo(
-                gong_num=gong_num,
-                gong_name=JIU_GONG[gong_num],
-                position=GONG_POSITION[gong_num],
-                bagua=BAGUA_GONG[gong_num],
-                gan=base_sequence[idx],
-                men=men_sequence[idx],
-                xing=xing_sequence[idx],
-                shen=shen_sequence[idx],
-                wu_xing=self._get_gong_wu_xing(gong_num)
-            )
+            palaces = dict(base_palaces)
+            zhi_fu_gong = _TURN_PAN_ZHI_FU_GONG[(ju_number, is_yang)]
         
         return NinePalace(
             ju_number=ju_number,
@@ -219,49 +385,20 @@ class PalaceEngine:
             ju_name=ju_name,
             palaces=palaces,
             calendar_info=None,
-            mode="turn"
+            mode="turn",
+            zhi_fu_gong=zhi_fu_gong
         )
     
     def _calculate_fly_start_gong(self, year_gan: int, month_zhi: int, 
                                  day_gan: int, hour_zhi: int) -> int:
         """计算飞盘起始宫位"""
-        # 飞盘起始位置计算公式
-        start_pos = (year_gan + month_zhi + day_gan + hour_zhi) % 9
-        return start_pos if start_pos != 0 else 9
+        # 飞盘起始位置计算公式，结果为1-9（9的倍数对应9宫）
+        return ((year_gan + month_zhi + day_gan + hour_zhi - 1) % 9) + 1
     
     def _calculate_fly_position(self, start_gong: int, gong_num: int) -> int:
         """计算飞盘位置"""
-        # 飞盘位置计算
-        fly_pos = (start_gong + gong_num - 1) % 9
-        return fly_pos if fly_pos != 0 else 9
-    
-    def _get_fly_gan(self, fly_pos: int) -> str:
-        """获取飞盘天干"""
-        gan_sequence = ["戊", "己", "庚", "辛", "壬", "癸", "丁", "丙", "乙"]
-        return gan_sequence[fly_pos - 1]
-    
-    def _get_fly_men(self, fly_pos: int) -> str:
-        """获取飞盘八门"""
-        men_sequence = ["休门", "死门", "伤门", "杜门", "中门", "开门", "惊门", "生门", "景门"]
-        return men_sequence[fly_pos - 1]
-    
-    def _get_fly_xing(self, fly_pos: int) -> str:
-        """获取飞盘九星"""
-        xing_sequence = ["天蓬", "天任", "天冲", "天辅", "天禽", "天心", "天柱", "天英", "天芮"]
-        return xing_sequence[fly_pos - 1]
-    
-    def _get_fly_shen(self, fly_pos: int) -> str:
-        """获取飞盘九神"""
-        shen_sequence = ["直符", "腾蛇", "太阴", "六合", "白虎", "玄武", "九地", "九天", "太常"]
-        return shen_sequence[fly_pos - 1]
-    
-    def _get_gong_wu_xing(self, gong_num: int) -> str:
-        """获取宫位五行"""
-        wu_xing_map = {
-            1: "水", 2: "土", 3: "木", 4: "木", 5: "土", 
-            6: "金", 7: "金", 8: "土", 9: "火"
-        }
-        return wu_xing_map.get(gong_num, "土")
+        # 飞盘位置计算，结果为1-9
+        return ((start_gong + gong_num - 2) % 9) + 1
     
     def get_palace_analysis(self, nine_palace: NinePalace) -> Dict[str, str]:
         """
@@ -280,12 +417,12 @@ class PalaceEngine:
         }
         
         # 分析各宫位
-        for gong_str, palace_info in nine_palace["palaces"].items():
+        for gong_num, palace_info in nine_palace["palaces"].items():
             gong_analysis = (
-                f"{palace_info['gong_name']}({palace_info['position']}): "
-                f"{palace_info['gan']}{palace_info['men']}{palace_info['xing']}{palace_info['shen']}"
+                f"{palace_info.gong_name}({palace_info.position}): "
+                f"{palace_info.gan}{palace_info.men}{palace_info.xing}{palace_info.shen}"
             )
-            analysis[f"{gong_str}宫"] = gong_analysis
+            analysis[f"{gong_num}宫"] = gong_analysis
         
         return analysis
 
@@ -299,10 +436,15 @@ class PalaceEngine:
         Returns:
             Optional[PalaceInfo]: 值符宫位信息，若未找到则返回None
         """
-        for palace_info in nine_palace["palaces"].values():
-            if palace_info["shen"] == "直符":
-                return palace_info
-        return None
+        palaces = nine_palace["palaces"]
+        # 排盘时已记录值符宫位；其他来源构造的九宫盘没有该字段时逐宫查找
+        if "zhi_fu_gong" in nine_palace:
+            zhi_fu_gong = nine_palace["zhi_fu_gong"]
+        else:
+            zhi_fu_gong = _find_zhi_fu_gong(palaces)
+        if zhi_fu_gong is None:
+            return None
+        return palaces[zhi_fu_gong]
     
     def get_zhi_fu_analysis(self, nine_palace: NinePalace, cal: Optional[CalendarInfo] = None) -> Dict[str, str]:
         """
@@ -320,10 +462,10 @@ class PalaceEngine:
             return {"错误": "未找到值符位置"}
         
         analysis = {
-            "值符位置": f"{zhi_fu_palace['gong_name']}({zhi_fu_palace['position']})",
-            "值符组合": f"{zhi_fu_palace['gan']}{zhi_fu_palace['men']}{zhi_fu_palace['xing']}{zhi_fu_palace['shen']}",
-            "宫位八卦": zhi_fu_palace['bagua'],
-            "宫位五行": zhi_fu_palace['wu_xing'],
+            "值符位置": f"{zhi_fu_palace.gong_name}({zhi_fu_palace.position})",
+            "值符组合": f"{zhi_fu_palace.gan}{zhi_fu_palace.men}{zhi_fu_palace.xing}{zhi_fu_palace.shen}",
+            "宫位八卦": zhi_fu_palace.bagua,
+            "宫位五行": zhi_fu_palace.wu_xing,
             "值符意义": self._get_zhi_fu_meaning(zhi_fu_palace)
         }
         
@@ -344,19 +486,10 @@ class PalaceEngine:
         Returns:
             str: 值符含义
         """
-        gong_num = zhi_fu_palace["gong_num"]
-        meanings = {
-            1: "值符居坎宫，主智慧谋略，利于策划思考",
-            2: "值符居坤宫，主厚德载物，利于合作共事", 
-            3: "值符居震宫，主振奋向上，利于开创事业",
-            4: "值符居巽宫，主进退有度，利于渐进发展",
-            5: "值符居中宫，主居中调和，统领全局",
-            6: "值符居乾宫，主刚健有力，利于领导决策",
-            7: "值符居兑宫，主言语交流，利于社交商谈",
-            8: "值符居艮宫，主稳重止静，利于守成积蓄",
-            9: "值符居离宫，主光明正大，利于宣传展示"
-        }
-        return meanings.get(gong_num, "值符含义待解")
+        gong_num = zhi_fu_palace.gong_num
+        if 1 <= gong_num <= 9:
+            return _ZHI_FU_MEANINGS[gong_num]
+        return "值符含义待解"
     
     def _analyze_zhi_fu_seasonal_influence(self, zhi_fu_palace: PalaceInfo, cal: CalendarInfo) -> str:
         """
@@ -370,37 +503,8 @@ class PalaceEngine:
             str: 时令影响分析
         """
         month = cal["month"]
-        gong_wu_xing = zhi_fu_palace["wu_xing"]
-        
-        # 根据月份判断季节对值符的影响
-        if month in [3, 4, 5]:  # 春季
-            if gong_wu_xing in ["木"]:
-                return "春季木旺，值符得时而强"
-            elif gong_wu_xing in ["金"]:
-                return "春季金衰，值符失时需谨慎"
-            else:
-                return "春季时令，值符力量平稳"
-        elif month in [6, 7, 8]:  # 夏季
-            if gong_wu_xing in ["火"]:
-                return "夏季火旺，值符得时而强"
-            elif gong_wu_xing in ["水"]:
-                return "夏季水衰，值符失时需谨慎"
-            else:
-                return "夏季时令，值符力量平稳"
-        elif month in [9, 10, 11]:  # 秋季
-            if gong_wu_xing in ["金"]:
-                return "秋季金旺，值符得时而强"
-            elif gong_wu_xing in ["木"]:
-                return "秋季木衰，值符失时需谨慎"
-            else:
-                return "秋季时令，值符力量平稳"
-        else:  # 冬季
-            if gong_wu_xing in ["水"]:
-                return "冬季水旺，值符得时而强"
-            elif gong_wu_xing in ["火"]:
-                return "冬季火衰，值符失时需谨慎"
-            else:
-                return "冬季时令，值符力量平稳"
+        season = _SEASON_OF_MONTH[month] if 1 <= month <= 12 else 3  # 其他月份按冬季处理
+        return _SEASONAL_INFLUENCE.get((season, zhi_fu_palace.wu_xing), _SEASONAL_NEUTRAL[season])
     
     def _analyze_zhi_fu_wang_shuai(self, zhi_fu_palace: PalaceInfo, cal: CalendarInfo) -> str:
         """
@@ -414,21 +518,7 @@ class PalaceEngine:
             str: 旺衰分析
         """
         # 值符天干为戊土，分析戊土在当前宫位的旺衰
-        gong_wu_xing = zhi_fu_palace["wu_xing"]
-        
-        # 戊土在不同宫位的旺衰
-        if gong_wu_xing == "土":
-            return "戊土居土宫，比和而旺"
-        elif gong_wu_xing == "火":
-            return "戊土居火宫，火生土旺"
-        elif gong_wu_xing == "金":
-            return "戊土居金宫，土生金泄"
-        elif gong_wu_xing == "水":
-            return "戊土居水宫，土克水耗力"
-        elif gong_wu_xing == "木":
-            return "戊土居木宫，木克土受制"
-        else:
-            return "值符旺衰状态需详查"
+        return _WANG_SHUAI_BY_WX.get(zhi_fu_palace.wu_xing, "值符旺衰状态需详查")
     
     def get_zhi_fu_influence_analysis(self, nine_palace: NinePalace) -> List[str]:
         """
@@ -447,14 +537,15 @@ class PalaceEngine:
         influences = []
         
         # 分析值符对相邻宫位的影响
-        zhi_fu_gong_num = zhi_fu_palace["gong_num"]
+        zhi_fu_gong_num = zhi_fu_palace.gong_num
         adjacent_gongs = self._get_adjacent_gongs(zhi_fu_gong_num)
         
-        for adj_gong_num in adjacent_gongs:
-            adj_palace = nine_palace["palaces"][str(adj_gong_num)]
+        palaces = nine_palace["palaces"]
+        for adj_gong in adjacent_gongs:
+            adj_palace = palaces[adj_gong]
             influence = self._analyze_zhi_fu_to_palace_influence(zhi_fu_palace, adj_palace)
             if influence:
-                influences.append(f"值符对{adj_palace['gong_name']}：{influence}")
+                influences.append(f"值符对{adj_palace.gong_name}：{influence}")
         
         # 分析值符与特殊格局的关系
         special_patterns = self._check_zhi_fu_special_patterns(nine_palace, zhi_fu_palace)
@@ -462,7 +553,7 @@ class PalaceEngine:
         
         return influences
     
-    def _get_adjacent_gongs(self, gong_num: int) -> List[int]:
+    def _get_adjacent_gongs(self, gong_num: int) -> Tuple[int, ...]:
         """
         获取相邻宫位
         
@@ -470,21 +561,9 @@ class PalaceEngine:
             gong_num: 宫位号
             
         Returns:
-            List[int]: 相邻宫位号列表
-        """
-        # 九宫相邻关系（基于洛书排列）
-        adjacent_map = {
-            1: [2, 4, 6],      # 坎宫
-            2: [1, 3, 5],      # 坤宫
-            3: [2, 4, 8],      # 震宫
-            4: [1, 3, 7, 9],   # 巽宫
-            5: [2, 6, 8],      # 中宫
-            6: [1, 5, 7],      # 乾宫
-            7: [4, 6, 8],      # 兑宫
-            8: [3, 5, 7, 9],   # 艮宫
-            9: [4, 8]          # 离宫
-        }
-        return adjacent_map.get(gong_num, [])
+            Tuple[int, ...]: 相邻宫位号
+        """
+        return _ADJACENT_GONGS.get(gong_num, ())
     
     def _analyze_zhi_fu_to_palace_influence(self, zhi_fu_palace: PalaceInfo, target_palace: PalaceInfo) -> str:
         """
@@ -498,29 +577,16 @@ class PalaceEngine:
             str: 影响描述
         """
         # 简化实现：主要看五行关系和门神配合
-        zhi_fu_wu_xing = zhi_fu_palace["wu_xing"]
-        target_wu_xing = target_palace["wu_xing"]
-        
-        if self._is_sheng_relation(zhi_fu_wu_xing, target_wu_xing):
-            return "生助有力，加强吉祥"
-        elif self._is_ke_relation(zhi_fu_wu_xing, target_wu_xing):
-            return "制约有度，化解凶煞"
-        else:
-            return "关系平和，影响中性"
+        relation = _WU_XING_RELATION.get((zhi_fu_palace.wu_xing, target_palace.wu_xing))
+        return _RELATION_INFLUENCE[relation]
     
     def _is_sheng_relation(self, wu_xing1: str, wu_xing2: str) -> bool:
         """判断五行相生关系"""
-        sheng_map = {
-            "木": "火", "火": "土", "土": "金", "金": "水", "水": "木"
-        }
-        return sheng_map.get(wu_xing1) == wu_xing2
+        return _WU_XING_SHENG.get(wu_xing1) == wu_xing2
     
     def _is_ke_relation(self, wu_xing1: str, wu_xing2: str) -> bool:
         """判断五行相克关系"""
-        ke_map = {
-            "木": "土", "土": "水", "水": "火", "火": "金", "金": "木"
-        }
-        return ke_map.get(wu_xing1) == wu_xing2
+        return _WU_XING_KE.get(wu_xing1) == wu_xing2
     
     def _check_zhi_fu_special_patterns(self, nine_palace: NinePalace, zhi_fu_palace: PalaceInfo) -> List[str]:
         """
@@ -536,22 +602,22 @@ class PalaceEngine:
         patterns = []
         
         # 检查值符是否在中宫
-        if zhi_fu_palace["gong_num"] == 5:
+        if zhi_fu_palace.gong_num == 5:
             patterns.append("值符居中宫：统领全局，权威显著")
         
         # 检查值符与三奇的关系
         san_qi = ["乙", "丙", "丁"]
-        for gong_str, palace_info in nine_palace["palaces"].items():
-            if palace_info["gan"] in san_qi:
-                if palace_info["gong_num"] == zhi_fu_palace["gong_num"]:
-                    patterns.append(f"值符与{palace_info['gan']}奇同宫：奇仪相合，大吉之象")
-                elif abs(palace_info["gong_num"] - zhi_fu_palace["gong_num"]) == 1:
-                    patterns.append(f"值符与{palace_info['gan']}奇相邻：奇仪呼应，吉祥有应")
+        for palace_info in nine_palace["palaces"].values():
+            if palace_info.gan in san_qi:
+                if palace_info.gong_num == zhi_fu_palace.gong_num:
+                    patterns.append(f"值符与{palace_info.gan}奇同宫：奇仪相合，大吉之象")
+                elif abs(palace_info.gong_num - zhi_fu_palace.gong_num) == 1:
+                    patterns.append(f"值符与{palace_info.gan}奇相邻：奇仪呼应，吉祥有应")
         
         # 检查值符与开门的关系
         for palace_info in nine_palace["palaces"].values():
-            if palace_info["men"] == "开门":
-                if palace_info["gong_num"] == zhi_fu_palace["gong_num"]:
+            if palace_info.men == "开门":
+                if palace_info.gong_num == zhi_fu_palace.gong_num:
                     patterns.append("值符与开门同宫：开启良机，事业发达")
                 break
         
@@ -575,39 +641,33 @@ class PalaceEngine:
         if highlight_zhi_fu:
             zhi_fu_palace = self.find_zhi_fu(nine_palace)
             if zhi_fu_palace:
-                zhi_fu_gong = zhi_fu_palace["gong_num"]
+                zhi_fu_gong = zhi_fu_palace.gong_num
+        
+        p1, p2, p3, p4, p5, p6, p7, p8, p9 = (palaces[i] for i in range(1, 10))
+        
+        # 各宫内容（下标为宫位号），值符宫位用方括号突出显示
+        contents = [""] + [f"{p.gan}{p.men}{p.xing}{p.shen}" for p in (p1, p2, p3, p4, p5, p6, p7, p8, p9)]
+        if zhi_fu_gong:
+            contents[zhi_fu_gong] = f"【{contents[zhi_fu_gong]}】"
+        _, c1, c2, c3, c4, c5, c6, c7, c8, c9 = contents
         
         # 九宫格布局
-        layout = """
+        result = f"""
         ┌─────────┬─────────┬─────────┐
-        │  {p4}  │  {p9}  │  {p2}  │
-        │  {p4_content}  │  {p9_content}  │  {p2_content}  │
+        │  {p4.gong_name}  │  {p9.gong_name}  │  {p2.gong_name}  │
+        │  {c4}  │  {c9}  │  {c2}  │
         ├─────────┼─────────┼─────────┤
-        │  {p3}  │  {p5}  │  {p7}  │
-        │  {p3_content}  │  {p5_content}  │  {p7_content}  │
+        │  {p3.gong_name}  │  {p5.gong_name}  │  {p7.gong_name}  │
+        │  {c3}  │  {c5}  │  {c7}  │
         ├─────────┼─────────┼─────────┤
-        │  {p8}  │  {p1}  │  {p6}  │
-        │  {p8_content}  │  {p1_content}  │  {p6_content}  │
+        │  {p8.gong_name}  │  {p1.gong_name}  │  {p6.gong_name}  │
+        │  {c8}  │  {c1}  │  {c6}  │
         └─────────┴─────────┴─────────┘
         """
         
-        # 填充内容
-        content = {}
-        for i in range(1, 10):
-            palace = palaces[str(i)]
-            content[f"p{i}"] = palace["gong_name"]
-            palace_content = f"{palace['gan']}{palace['men']}{palace['xing']}{palace['shen']}"
-            
-            # 如果是值符宫位，添加标记
-            if highlight_zhi_fu and i == zhi_fu_gong:
-                palace_content = f"【{palace_content}】"  # 用方括号突出显示值符
-            
-            content[f"p{i}_content"] = palace_content
-        
         # 添加值符说明
-        result = layout.format(**content)
         if highlight_zhi_fu and zhi_fu_gong:
-            result += f"\n※ 【】标记为值符位置：{palaces[str(zhi_fu_gong)]['gong_name']}"
+            result += f"\n※ 【】标记为值符位置：{palaces[zhi_fu_gong].gong_name}"
         
         return result
     
@@ -668,10 +728,10 @@ class PalaceEngine:
             return False
         
         # 检查每个宫位的信息是否完整
-        for gong_str, palace_info in nine_palace["palaces"].items():
+        for palace_info in nine_palace["palaces"].values():
             if not all([
-                palace_info["gan"], palace_info["men"], 
-                palace_info["xing"], palace_info["shen"]
+                palace_info.gan, palace_info.men, 
+                palace_info.xing, palace_info.shen
             ]):
                 return False
         
@@ -9,12 +9,12 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, Tuple, TypedDict, Union
 
 try:
-    from symbols import TIAN_GAN, DI_ZHI, WU_XING, SHI_CHEN, SOLAR_TERMS
+    from symbols import DI_ZHI, WU_XING, SHI_CHEN, SOLAR_TERMS
     from astronomical import get_current_solar_term, get_true_solar_time
     from config import get_config
     from ganzhi import ganzhi_calculator
 except ImportError:
-    from .symbols import TIAN_GAN, DI_ZHI, WU_XING, SHI_CHEN, SOLAR_TERMS
+    from .symbols import DI_ZHI, WU_XING, SHI_CHEN, SOLAR_TERMS
     from .astronomical import get_current_solar_term, get_true_solar_time  
     from .config import get_config
     from .ganzhi import ganzhi_calculator
@@ -105,17 +105,7 @@ def from_datetime(
     hour_zhi = DI_ZHI[hour_zhi_index]
     
     # 使用五鼠遁日起时法计算时干
-    day_gan_index = TIAN_GAN.index(day_gan)
-    DAY_HOUR_GAN_TABLE = {
-        0: 0, 5: 0,  # 甲日、己日起甲子时
-        1: 2, 6: 2,  # 乙日、庚日起丙子时  
-        2: 4, 7: 4,  # 丙日、辛日起戊子时
-        3: 6, 8: 6,  # 丁日、壬日起庚子时
-        4: 8, 9: 8   # 戊日、癸日起壬子时
-    }
-    base_hour_gan_index = DAY_HOUR_GAN_TABLE.get(day_gan_index, 0)
-    hour_gan_index = (base_hour_gan_index + hour_zhi_index) % 10
-    hour_gan = TIAN_GAN[hour_gan_index]
+    hour_gan = ganzhi_calculator.calculate_hour_gan(day_gan, hour_zhi_index)
     
     ganzhi_data = {
         "year_gan": year_gan, "year_zhi": year_zhi,
@@ -63,11 +63,11 @@ def display_ju_info(ju_number, is_yang, nine_palace, cal_info=None):
     zhi_fu_info = "未知"
     zhi_fu_gong = None
     
-    for gong_str, palace_info in nine_palace.get("palaces", {}).items():
+    for gong_num, palace_info in nine_palace.get("palaces", {}).items():
         # 查找值符（直符）
-        if palace_info.get("shen") == "直符":
-            zhi_fu_info = f"{palace_info.get('gong_name', '')}({palace_info.get('gan', '')})"
-            zhi_fu_gong = gong_str
+        if palace_info.shen == "直符":
+            zhi_fu_info = f"{palace_info.gong_name}({palace_info.gan})"
+            zhi_fu_gong = gong_num
             break
     
     print(f"   🧭 值符: {zhi_fu_info}")
@@ -79,7 +79,7 @@ def display_ju_info(ju_number, is_yang, nine_palace, cal_info=None):
         zhishi_gong, zhishi_palace = zhishi_calculator.find_zhishi_gong(nine_palace, zhishi_men)
         
         if zhishi_gong and zhishi_palace:
-            zhi_shi_info = f"{zhishi_palace.get('gong_name', '')}({zhishi_men})"
+            zhi_shi_info = f"{zhishi_palace.gong_name}({zhishi_men})"
         else:
             zhi_shi_info = f"{zhishi_men}(未在盘中)"
     else:
@@ -100,9 +100,9 @@ def display_nine_palace(nine_palace):
     
     # 找到值符位置用于标记
     zhi_fu_gong = None
-    for gong_str, palace_info in palaces.items():
-        if palace_info.get("shen") == "直符":
-            zhi_fu_gong = int(gong_str)
+    for gong_num, palace_info in palaces.items():
+        if palace_info.shen == "直符":
+            zhi_fu_gong = gong_num
             break
     
     # 九宫格布局显示
@@ -110,17 +110,17 @@ def display_nine_palace(nine_palace):
     
     # 上排：巽4 离9 坤2
     for gong_num in [4, 9, 2]:
-        gong_info = palaces.get(str(gong_num), {})
-        content = f"{gong_info.get('gan', '?')}{gong_info.get('men', '?')}{gong_info.get('xing', '?')}{gong_info.get('shen', '?')}"
+        gong_info = palaces[gong_num]
+        content = f"{gong_info.gan}{gong_info.men}{gong_info.xing}{gong_info.shen}"
         if gong_num == zhi_fu_gong:
             content = f"【{content}】"  # 标记值符
-        gong_name = gong_info.get('gong_name', f'{gong_num}宫')
+        gong_name = gong_info.gong_name
         print(f"   │ {gong_name:^9} │", end="")
     print()
     
     for gong_num in [4, 9, 2]:
-        gong_info = palaces.get(str(gong_num), {})
-        content = f"{gong_info.get('gan', '?')}{gong_info.get('men', '?')}{gong_info.get('xing', '?')}{gong_info.get('shen', '?')}"
+        gong_info = palaces[gong_num]
+        content = f"{gong_info.gan}{gong_info.men}{gong_info.xing}{gong_info.shen}"
         if gong_num == zhi_fu_gong:
             content = f"【{content}】"
         print(f"   │ {content:^11} │", end="")
@@ -130,17 +130,17 @@ def display_nine_palace(nine_palace):
     
     # 中排：震3 中5 兑7  
     for gong_num in [3, 5, 7]:
-        gong_info = palaces.get(str(gong_num), {})
-        content = f"{gong_info.get('gan', '?')}{gong_info.get('men', '?')}{gong_info.get('xing', '?')}{gong_info.get('shen', '?')}"
+        gong_info = palaces[gong_num]
+        content = f"{gong_info.gan}{gong_info.men}{gong_info.xing}{gong_info.shen}"
         if gong_num == zhi_fu_gong:
             content = f"【{content}】"
-        gong_name = gong_info.get('gong_name', f'{gong_num}宫')
+        gong_name = gong_info.gong_name
         print(f"   │ {gong_name:^9} │", end="")
     print()
     
     for gong_num in [3, 5, 7]:
-        gong_info = palaces.get(str(gong_num), {})
-        content = f"{gong_info.get('gan', '?')}{gong_info.get('men', '?')}{gong_info.get('xing', '?')}{gong_info.get('shen', '?')}"
+        gong_info = palaces[gong_num]
+        content = f"{gong_info.gan}{gong_info.men}{gong_info.xing}{gong_info.shen}"
         if gong_num == zhi_fu_gong:
             content = f"【{content}】"
         print(f"   │ {content:^11} │", end="")
@@ -150,17 +150,17 @@ def display_nine_palace(nine_palace):
     
     # 下排：艮8 坎1 乾6
     for gong_num in [8, 1, 6]:
-        gong_info = palaces.get(str(gong_num), {})
-        content = f"{gong_info.get('gan', '?')}{gong_info.get('men', '?')}{gong_info.get('xing', '?')}{gong_info.get('shen', '?')}"
+        gong_info = palaces[gong_num]
+        content = f"{gong_info.gan}{gong_info.men}{gong_info.xing}{gong_info.shen}"
         if gong_num == zhi_fu_gong:
             content = f"【{content}】"
-        gong_name = gong_info.get('gong_name', f'{gong_num}宫')
+        gong_name = gong_info.gong_name
         print(f"   │ {gong_name:^9} │", end="")
     print()
     
     for gong_num in [8, 1, 6]:
-        gong_info = palaces.get(str(gong_num), {})
-        content = f"{gong_info.get('gan', '?')}{gong_info.get('men', '?')}{gong_info.get('xing', '?')}{gong_info.get('shen', '?')}"
+        gong_info = palaces[gong_num]
+        content = f"{gong_info.gan}{gong_info.men}{gong_info.xing}{gong_info.shen}"
         if gong_num == zhi_fu_gong:
             content = f"【{content}】"
         print(f"   │ {content:^11} │", end="")
@@ -170,8 +170,8 @@ def display_nine_palace(nine_palace):
     
     # 添加说明
     if zhi_fu_gong:
-        zhi_fu_palace = palaces.get(str(zhi_fu_gong), {})
-        print(f"   ※ 【】标记为值符位置：{zhi_fu_palace.get('gong_name', '未知宫位')}")
+        zhi_fu_palace = palaces[zhi_fu_gong]
+        print(f"   ※ 【】标记为值符位置：{zhi_fu_palace.gong_name}")
     
     print("   📝 排盘格式：天干+八门+九星+九神")
     print()
@@ -296,11 +296,11 @@ def display_palace_details(nine_palace):
             print(f"   🏛️  {key}: {value}")
     
     print("\n🔍 各宫五行属性:")
-    for gong_str, palace_info in nine_palace.get("palaces", {}).items():
-        wu_xing = palace_info.get('wu_xing', '未知')
-        bagua = palace_info.get('bagua', '未知')
-        position = palace_info.get('position', '未知')
-        print(f"   {palace_info.get('gong_name', f'{gong_str}宫')}: {wu_xing}行 {bagua}卦 {position}")
+    for palace_info in nine_palace.get("palaces", {}).values():
+        wu_xing = palace_info.wu_xing
+        bagua = palace_info.bagua
+        position = palace_info.position
+        print(f"   {palace_info.gong_name}: {wu_xing}行 {bagua}卦 {position}")
     print()
 
 def display_zhi_fu_comprehensive_analysis(palace_engine, nine_palace, cal_info):
@@ -441,9 +441,9 @@ def display_zhishi_info(cal_info, nine_palace):
     print(f"   🚪 值使门: {zhishi_men}")
     
     if zhishi_gong and zhishi_palace:
-        print(f"   🏛️  值使宫位: {zhishi_palace.get('gong_name', '')}({zhishi_gong}宫)")
-        print(f"   📍 宫位方位: {zhishi_palace.get('position', '')}")
-        print(f"   🌟 宫位组合: {zhishi_palace.get('gan', '')}{zhishi_men}{zhishi_palace.get('xing', '')}{zhishi_palace.get('shen', '')}")
+        print(f"   🏛️  值使宫位: {zhishi_palace.gong_name}({zhishi_gong}宫)")
+        print(f"   📍 宫位方位: {zhishi_palace.position}")
+        print(f"   🌟 宫位组合: {zhishi_palace.gan}{zhishi_men}{zhishi_palace.xing}{zhishi_palace.shen}")
         
         # 添加值使门的意义解释
         men_meanings = {
@@ -463,9 +463,9 @@ def display_zhishi_info(cal_info, nine_palace):
         
         # 检查值符值使是否同宫
         zhi_fu_gong = None
-        for gong_str, palace_info in nine_palace.get("palaces", {}).items():
-            if palace_info.get("shen") == "直符":
-                zhi_fu_gong = gong_str
+        for gong_num, palace_info in nine_palace.get("palaces", {}).items():
+            if palace_info.shen == "直符":
+                zhi_fu_gong = gong_num
                 break
         
         if zhi_fu_gong == zhishi_gong:
@@ -63,13 +63,13 @@ class WangShuaiPlugin:
         yong_shen_gong = self._get_yong_shen_gong(nine_palace, cal)
         if yong_shen_gong:
             wang_shuai = self._analyze_wang_shuai(yong_shen_gong)
-            messages.append(f"用神在{yong_shen_gong['gong_name']}，{wang_shuai}")
+            messages.append(f"用神在{yong_shen_gong.gong_name}，{wang_shuai}")
         
         # 分析各宫旺衰
-        for gong_str, palace_info in nine_palace["palaces"].items():
+        for palace_info in nine_palace["palaces"].values():
             wang_shuai = self._get_palace_wang_shuai(palace_info, cal)
             if wang_shuai:
-                messages.append(f"{palace_info['gong_name']}{wang_shuai}")
+                messages.append(f"{palace_info.gong_name}{wang_shuai}")
         
         return messages
     
@@ -79,7 +79,7 @@ class WangShuaiPlugin:
         day_gan = cal["day_gan"]
         
         for palace_info in nine_palace["palaces"].values():
-            if palace_info["gan"] == day_gan:
+            if palace_info.gan == day_gan:
                 return palace_info
         
         return None
@@ -87,8 +87,8 @@ class WangShuaiPlugin:
     def _analyze_wang_shuai(self, palace_info: PalaceInfo) -> str:
         """分析宫位旺衰"""
         # 根据五行相生相克判断旺衰
-        gan_wu_xing = TIAN_GAN_WU_XING.get(palace_info["gan"], "")
-        gong_wu_xing = palace_info["wu_xing"]
+        gan_wu_xing = TIAN_GAN_WU_XING.get(palace_info.gan, "")
+        gong_wu_xing = palace_info.wu_xing
         
         if self._is_sheng(gong_wu_xing, gan_wu_xing):
             return "得地而旺"
@@ -100,7 +100,7 @@ class WangShuaiPlugin:
     def _get_palace_wang_shuai(self, palace_info: PalaceInfo, cal: CalendarInfo) -> str:
         """获取宫位旺衰"""
         # 根据时令判断旺衰
-        season_wang_shuai = self._get_season_wang_shuai(palace_info["wu_xing"], cal["month"])
+        season_wang_shuai = self._get_season_wang_shuai(palace_info.wu_xing, cal["month"])
         return f"：{season_wang_shuai}"
     
     def _get_season_wang_shuai(self, wu_xing: str, month: int) -> str:
@@ -244,37 +244,37 @@ class GeJuPlugin:
     def _check_qing_long_fan_shou(self, nine_palace: NinePalace) -> bool:
         """检查青龙返首格"""
         # 简化实现：检查乙奇在一宫
-        return nine_palace["palaces"]["1"]["gan"] == "乙"
+        return nine_palace["palaces"][1].gan == "乙"
     
     def _check_fei_niao_die_xue(self, nine_palace: NinePalace) -> bool:
         """检查飞鸟跌穴格"""
         # 简化实现：检查丙奇在九宫
-        return nine_palace["palaces"]["9"]["gan"] == "丙"
+        return nine_palace["palaces"][9].gan == "丙"
     
     def _check_san_qi_de_shi(self, nine_palace: NinePalace) -> bool:
         """检查三奇得使格"""
         # 简化实现：检查三奇（乙丙丁）是否在开门、休门、生门
         for palace_info in nine_palace["palaces"].values():
-            if palace_info["gan"] in ["乙", "丙", "丁"]:
-                if palace_info["men"] in ["开门", "休门", "生门"]:
+            if palace_info.gan in ["乙", "丙", "丁"]:
+                if palace_info.men in ["开门", "休门", "生门"]:
                     return True
         return False
     
     def _check_bai_hu_chang_kuang(self, nine_palace: NinePalace) -> bool:
         """检查白虎猖狂格"""
         # 简化实现：检查白虎在震宫
-        return nine_palace["palaces"]["3"]["shen"] == "白虎"
+        return nine_palace["palaces"][3].shen == "白虎"
     
     def _check_teng_she_yao_jiao(self, nine_palace: NinePalace) -> bool:
         """检查腾蛇夭矫格"""
         # 简化实现：检查腾蛇在离宫
-        return nine_palace["palaces"]["9"]["shen"] == "腾蛇"
+        return nine_palace["palaces"][9].shen == "腾蛇"
     
     def _check_men_po(self, nine_palace: NinePalace) -> bool:
         """检查门迫格"""
         # 简化实现：检查门宫是否相冲
         for palace_info in nine_palace["palaces"].values():
-            if palace_info["men"] == "死门" and palace_info["bagua"] == "坎":
+            if palace_info.men == "死门" and palace_info.bagua == "坎":
                 return True
         return False
     
@@ -282,7 +282,7 @@ class GeJuPlugin:
         """检查伏吟格"""
         # 简化实现：检查天盘地盘是否相同
         for palace_info in nine_palace["palaces"].values():
-            if palace_info["xing"] == "天禽" and palace_info["gong_num"] == 5:
+            if palace_info.xing == "天禽" and palace_info.gong_num == 5:
                 return True
         return False
     
@@ -291,9 +291,9 @@ class GeJuPlugin:
         # 简化实现：检查对冲宫位
         dui_chong_pairs = [(1, 9), (2, 8), (3, 7), (4, 6)]
         for pair in dui_chong_pairs:
-            palace1 = nine_palace["palaces"][str(pair[0])]
-            palace2 = nine_palace["palaces"][str(pair[1])]
-            if palace1["xing"] == palace2["xing"]:
+            palace1 = nine_palace["palaces"][pair[0]]
+            palace2 = nine_palace["palaces"][pair[1]]
+            if palace1.xing == palace2.xing:
                 return True
         return False
 
@@ -345,14 +345,14 @@ class YingQiPlugin:
         """获取用神宫位"""
         day_gan = cal["day_gan"]
         for palace_info in nine_palace["palaces"].values():
-            if palace_info["gan"] == day_gan:
+            if palace_info.gan == day_gan:
                 return palace_info
         return None
     
     def _calculate_ying_qi_time(self, palace_info: PalaceInfo, cal: CalendarInfo) -> str:
         """计算应期时间"""
         # 简化实现：根据宫位数字推算
-        gong_num = palace_info["gong_num"]
+        gong_num = palace_info.gong_num
         
         if gong_num <= 3:
             return "近期（1-3天内）"
@@ -367,8 +367,8 @@ class YingQiPlugin:
         
         # 找出开门、生门、休门的方位
         for palace_info in nine_palace["palaces"].values():
-            if palace_info["men"] in ["开门", "生门", "休门"]:
-                favorable_directions.append(palace_info["position"])
+            if palace_info.men in ["开门", "生门", "休门"]:
+                favorable_directions.append(palace_info.position)
         
         return favorable_directions
 
@@ -423,14 +423,14 @@ class ZhiFuPlugin:
     def _find_zhi_fu(self, nine_palace: NinePalace) -> Optional[PalaceInfo]:
         """查找值符位置"""
         for palace_info in nine_palace["palaces"].values():
-            if palace_info["shen"] == "直符":
+            if palace_info.shen == "直符":
                 return palace_info
         return None
     
     def _analyze_zhi_fu_location(self, zhi_fu_palace: PalaceInfo) -> str:
         """分析值符位置的意义"""
-        gong_num = zhi_fu_palace["gong_num"]
-        position = zhi_fu_palace["position"]
+        gong_num = zhi_fu_palace.gong_num
+        position = zhi_fu_palace.position
         
         location_meanings = {
             1: f"坎宫{position}，智慧内敛，利于谋划决策",
@@ -444,14 +444,14 @@ class ZhiFuPlugin:
             9: f"离宫{position}，光明显达，利于展示宣传"
         }
         
-        return location_meanings.get(gong_num, f"{zhi_fu_palace['gong_name']}{position}，位置特殊")
+        return location_meanings.get(gong_num, f"{zhi_fu_palace.gong_name}{position}，位置特殊")
     
     def _analyze_time_space_match(self, zhi_fu_palace: PalaceInfo, cal: CalendarInfo) -> str:
         """分析时空匹配度"""
         # 检查值符天干戊土与当前时空的匹配程度
         month = cal["month"]
         hour_gan = cal["hour_gan"]
-        gong_wu_xing = zhi_fu_palace["wu_xing"]
+        gong_wu_xing = zhi_fu_palace.wu_xing
         
         # 戊土在不同季节的状态
         seasonal_status = self._get_seasonal_status(month)
@@ -536,14 +536,14 @@ class ZhiFuPlugin:
         """检查值符与三奇的配合"""
         combinations = []
         san_qi = ["乙", "丙", "丁"]
-        zhi_fu_gong = zhi_fu_palace["gong_num"]
+        zhi_fu_gong = zhi_fu_palace.gong_num
         
-        for gong_str, palace_info in nine_palace["palaces"].items():
-            if palace_info["gan"] in san_qi:
-                if palace_info["gong_num"] == zhi_fu_gong:
-                    combinations.append(f"值符与{palace_info['gan']}奇同宫：权威与才华并显，主贵")
-                elif abs(palace_info["gong_num"] - zhi_fu_gong) <= 1:
-                    combinations.append(f"值符与{palace_info['gan']}奇相邻：权威呼应才华，吉祥")
+        for palace_info in nine_palace["palaces"].values():
+            if palace_info.gan in san_qi:
+                if palace_info.gong_num == zhi_fu_gong:
+                    combinations.append(f"值符与{palace_info.gan}奇同宫：权威与才华并显，主贵")
+                elif abs(palace_info.gong_num - zhi_fu_gong) <= 1:
+                    combinations.append(f"值符与{palace_info.gan}奇相邻：权威呼应才华，吉祥")
         
         return combinations
     
@@ -551,19 +551,19 @@ class ZhiFuPlugin:
         """检查值符与吉门的配合"""
         combinations = []
         ji_men = ["开门", "休门", "生门"]
-        zhi_fu_gong = zhi_fu_palace["gong_num"]
+        zhi_fu_gong = zhi_fu_palace.gong_num
         
         for palace_info in nine_palace["palaces"].values():
-            if palace_info["men"] in ji_men and palace_info["gong_num"] != zhi_fu_gong:
-                if abs(palace_info["gong_num"] - zhi_fu_gong) <= 1:
-                    combinations.append(f"值符临近{palace_info['men']}：权威配吉门，利于行动")
+            if palace_info.men in ji_men and palace_info.gong_num != zhi_fu_gong:
+                if abs(palace_info.gong_num - zhi_fu_gong) <= 1:
+                    combinations.append(f"值符临近{palace_info.men}：权威配吉门，利于行动")
         
         return combinations
     
     def _check_jiu_xing_combination(self, zhi_fu_palace: PalaceInfo) -> str:
         """检查值符与九星的配合"""
         # 值符固定配天蓬星
-        xing = zhi_fu_palace["xing"]
+        xing = zhi_fu_palace.xing
         if xing == "天蓬":
             return "值符配天蓬星：智慧与权威结合，利于谋略策划"
         else:
@@ -571,8 +571,8 @@ class ZhiFuPlugin:
     
     def _get_action_advice(self, zhi_fu_palace: PalaceInfo, cal: CalendarInfo) -> str:
         """获取行运建议"""
-        gong_num = zhi_fu_palace["gong_num"]
-        position = zhi_fu_palace["position"]
+        gong_num = zhi_fu_palace.gong_num
+        position = zhi_fu_palace.position
         month = cal["month"]
         
         # 基于值符位置的建议
@@ -608,7 +608,7 @@ class ZhiFuPlugin:
     
     def _predict_ying_qi(self, zhi_fu_palace: PalaceInfo, cal: CalendarInfo) -> str:
         """预测应期"""
-        gong_num = zhi_fu_palace["gong_num"]
+        gong_num = zhi_fu_palace.gong_num
         
         # 基于宫位数字的应期
         if gong_num in [1, 6]:  # 坎、乾
@@ -5,6 +5,7 @@
 
 from typing import Dict, Tuple, Optional
 from symbols import BA_MEN, DI_ZHI
+from palace import PalaceInfo
 
 class ZhiShiCalculator:
     """值使计算器"""
@@ -53,7 +54,7 @@ class ZhiShiCalculator:
         """
         return self.MEN_DIZHI_MAP.get(hour_zhi, "未知")
     
-    def find_zhishi_gong(self, nine_palace: Dict, zhishi_men: str) -> Tuple[Optional[str], Optional[Dict]]:
+    def find_zhishi_gong(self, nine_palace: Dict, zhishi_men: str) -> Tuple[Optional[int], Optional[PalaceInfo]]:
         """
         在九宫盘中找到值使门所在的宫位
         
@@ -62,18 +63,18 @@ class ZhiShiCalculator:
             zhishi_men: 值使门名称
             
         Returns:
-            Tuple[Optional[str], Optional[Dict]]: (宫位编号, 宫位信息)
+            Tuple[Optional[int], Optional[PalaceInfo]]: (宫位编号, 宫位信息)
         """
         palaces = nine_palace.get("palaces", {})
         
-        for gong_str, palace_info in palaces.items():
-            if palace_info.get("men") == zhishi_men:
-                return gong_str, palace_info
+        for gong_num, palace_info in palaces.items():
+            if palace_info.men == zhishi_men:
+                return gong_num, palace_info
         
         return None, None
     
     def get_zhishi_analysis(self, hour_zhi: str, zhishi_men: str, 
-                          zhishi_gong: Optional[str], zhishi_palace: Optional[Dict]) -> Dict[str, str]:
+                          zhishi_gong: Optional[int], zhishi_palace: Optional[PalaceInfo]) -> Dict[str, str]:
         """
         获取值使分析信息
         
@@ -89,14 +90,14 @@ class ZhiShiCalculator:
         analysis = {
             "时辰地支": hour_zhi,
             "值使门": zhishi_men,
-            "值使宫位": zhishi_gong or "未找到",
+            "值使宫位": str(zhishi_gong) if zhishi_gong else "未找到",
         }
         
         if zhishi_palace:
-            analysis["宫位信息"] = f"{zhishi_palace.get('gong_name', '')}({zhishi_palace.get('position', '')})"
-            analysis["天干"] = zhishi_palace.get('gan', '')
-            analysis["九星"] = zhishi_palace.get('xing', '')
-            analysis["九神"] = zhishi_palace.get('shen', '')
+            analysis["宫位信息"] = f"{zhishi_palace.gong_name}({zhishi_palace.position})"
+            analysis["天干"] = zhishi_palace.gan
+            analysis["九星"] = zhishi_palace.xing
+            analysis["九神"] = zhishi_palace.shen
         
         # 添加值使门的意义解释
         men_meanings = {
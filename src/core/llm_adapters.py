@@ -37,13 +37,16 @@ class OpenAICompatibleAdapter(BaseLLMAdapter):
         endpoint: str,
         api_key: Optional[str] = None,
         provider: str = "openai",
-        custom_headers: Optional[Dict[str, str]] = None
+        custom_headers: Optional[Dict[str, str]] = None,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         self.model_name = model_name
         self.endpoint = endpoint
         self.api_key = api_key
         self.provider = provider
         self.custom_headers = custom_headers or {}
+        # 外部传入的共享客户端，复用其连接池；由调用方负责关闭
+        self.http_client = http_client
     
     def _build_headers(self) -> Dict[str, str]:
         """构建请求头"""
@@ -121,27 +124,35 @@ class OpenAICompatibleAdapter(BaseLLMAdapter):
             
             logger.info(f"📨 请求载荷: {payload}")
             
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
+            if self.http_client is not None:
+                response = await self.http_client.post(
                     self.endpoint,
                     headers=headers,
-                    json=payload
+                    json=payload,
+                    timeout=60.0
                 )
-                
-                logger.info(f"📥 API响应状态: {response.status_code}")
-                
-                if response.status_code != 200:
-                    error_msg = f"API请求失败: {response.status_code} - {response.text}"
-                    logger.error(error_msg)
-                    raise Exception(error_msg)
-                
-                result = response.json()
-                logger.info(f"📋 原始响应: {result}")
-                
-                parsed_result = self._parse_response(result, bool(tools))
-                logger.info(f"✅ 解析后响应: {parsed_result}")
-                
-                return parsed_result
+            else:
+                async with httpx.AsyncClient(timeout=60.0) as client:
+                    response = await client.post(
+                        self.endpoint,
+                        headers=headers,
+                        json=payload
+                    )
+            
+            logger.info(f"📥 API响应状态: {response.status_code}")
+            
+            if response.status_code != 200:
+                error_msg = f"API请求失败: {response.status_code} - {response.text}"
+                logger.error(error_msg)
+                raise Exception(error_msg)
+            
+            result = response.json()
+            logger.info(f"📋 原始响应: {result}")
+            
+            parsed_result = self._parse_response(result, bool(tools))
+            logger.info(f"✅ 解析后响应: {parsed_result}")
+            
+            return parsed_result
                 
         except Exception as e:
             logger.error(f"❌ LLM API调用失败: {e}")
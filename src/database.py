@@ -1,6 +1,6 @@
 """数据库连接和会话管理"""
 
-from sqlalchemy import create_engine
+from sqlalchemy import DDL, create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
@@ -24,6 +24,15 @@ AsyncSessionLocal = async_sessionmaker(
 Base = declarative_base()
 
 
+def add_default_partition(table):
+    """为按范围分区的表在建表后创建默认分区，未挂载时间分区前数据都写入默认分区"""
+    event.listen(
+        table,
+        "after_create",
+        DDL(f"CREATE TABLE IF NOT EXISTS {table.name}_default PARTITION OF {table.name} DEFAULT"),
+    )
+
+
 def get_db():
     """获取数据库会话"""
     db = SessionLocal()
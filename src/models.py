@@ -1,16 +1,16 @@
 """数据库模型"""
 
-import uuid
 from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, Any, List
 
-from sqlalchemy import Column, String, Boolean, Integer, Float, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, String, Boolean, Integer, Float, DateTime, Text, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from .database import Base
+from .database import Base, add_default_partition
+from .utils.ids import uuid7
 
 
 class ProviderType(str, Enum):
@@ -54,17 +54,22 @@ class Model(Base):
     """LLM 模型表"""
     __tablename__ = "models"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    name = Column(String, nullable=False, unique=True, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    name = Column(String, nullable=False)
     provider = Column(String, nullable=False, index=True)
     endpoint = Column(String, nullable=False)
     context_len = Column(Integer, nullable=False, default=4096)
     enabled = Column(Boolean, nullable=False, default=True)
     api_key = Column(String, nullable=True)  # API密钥
-    custom_headers = Column(JSON, nullable=True)  # 自定义请求头
+    custom_headers = Column(JSONB, nullable=True)  # 自定义请求头
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # 唯一约束与迁移中的命名一致
+    __table_args__ = (
+        UniqueConstraint("name", name="uq_models_name"),
+    )
+    
     # 关系
     routes_primary = relationship("Route", foreign_keys="Route.primary_model_id", back_populates="primary_model")
     runs = relationship("Run", back_populates="model")
@@ -74,7 +79,7 @@ class Agent(Base):
     """Agent 配置表"""
     __tablename__ = "agents"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(String, nullable=False, index=True)
     description = Column(Text, nullable=True)
     avatar = Column(String, nullable=True)  # 头像URL
@@ -85,22 +90,22 @@ class Agent(Base):
     version = Column(Integer, nullable=False, default=1)
     
     # 模型配置
-    llm_config = Column(JSON, nullable=False)  # 包含primary_model_id, fallback_model_id等
+    llm_config = Column(JSONB, nullable=False)  # 包含primary_model_id, fallback_model_id等
     
     # 系统配置
-    system_config = Column(JSON, nullable=False)  # 系统提示词、对话风格等
+    system_config = Column(JSONB, nullable=False)  # 系统提示词、对话风格等
     
     # 工具配置
-    tools_config = Column(JSON, nullable=False, default={})  # 启用的工具和配置
+    tools_config = Column(JSONB, nullable=False, default={})  # 启用的工具和配置
     
     # 知识库配置
-    knowledge_config = Column(JSON, nullable=False, default={})  # 知识库设置
+    knowledge_config = Column(JSONB, nullable=False, default={})  # 知识库设置
     
     # 部署配置
-    deployment_config = Column(JSON, nullable=False, default={})  # 部署相关设置
+    deployment_config = Column(JSONB, nullable=False, default={})  # 部署相关设置
     
     # 统计信息
-    stats = Column(JSON, nullable=False, default={
+    stats = Column(JSONB, nullable=False, default={
         "total_conversations": 0,
         "total_messages": 0,
         "avg_response_time": 0,
@@ -120,7 +125,7 @@ class Route(Base):
     """路由配置表"""
     __tablename__ = "routes"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     tenant_id = Column(UUID(as_uuid=True), nullable=True, index=True)
     prompt_type = Column(String, nullable=True)  # general, code, etc.
     strategy = Column(String, nullable=False, default=RouteStrategy.FIXED)
@@ -137,32 +142,42 @@ class Tool(Base):
     """工具注册表"""
     __tablename__ = "tools"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    name = Column(String, nullable=False, unique=True, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    name = Column(String, nullable=False)
     description = Column(Text, nullable=True)
-    schema = Column(JSON, nullable=False)  # OpenAI Function Schema
+    schema = Column(JSONB, nullable=False)  # OpenAI Function Schema
     endpoint = Column(String, nullable=True)  # HTTP endpoint
     enabled = Column(Boolean, nullable=False, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # 唯一约束与迁移中的命名一致
+    __table_args__ = (
+        UniqueConstraint("name", name="uq_tools_name"),
+    )
 
 
 class Run(Base):
     """执行记录表"""
     __tablename__ = "runs"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    agent_id = Column(UUID(as_uuid=True), ForeignKey("agents.id"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    agent_id = Column(UUID(as_uuid=True), ForeignKey("agents.id"), nullable=False)
     model_id = Column(UUID(as_uuid=True), ForeignKey("models.id"), nullable=True, index=True)
     status = Column(String, nullable=False, default=RunStatus.PENDING)
     input_tokens = Column(Integer, nullable=True)
     output_tokens = Column(Integer, nullable=True)
     execution_time_ms = Column(Integer, nullable=True)
     error_message = Column(Text, nullable=True)
-    run_metadata = Column(JSON, nullable=True)
+    run_metadata = Column(JSONB, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
+    # 按 Agent 查询最近的执行记录
+    __table_args__ = (
+        Index("ix_runs_agent_id_created_at", agent_id, created_at.desc()),
+    )
+    
     # 关系
     agent = relationship("Agent", back_populates="runs")
     model = relationship("Model", back_populates="runs")
@@ -173,30 +188,44 @@ class Message(Base):
     """消息记录表"""
     __tablename__ = "messages"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    run_id = Column(UUID(as_uuid=True), ForeignKey("runs.id"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    run_id = Column(UUID(as_uuid=True), ForeignKey("runs.id"), nullable=False)
     role = Column(String, nullable=False)  # user, assistant, system, tool
     content = Column(Text, nullable=True)
-    tool_calls = Column(JSON, nullable=True)  # OpenAI tool call format
+    tool_calls = Column(JSONB, nullable=True)  # OpenAI tool call format
     tool_call_id = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    
+    # 按 created_at 范围分区，分区表的主键必须包含分区键
+    __table_args__ = (
+        Index("ix_messages_run_id_created_at", run_id, created_at),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
     
     # 关系
     run = relationship("Run", back_populates="messages")
 
 
+add_default_partition(Message.__table__)
+
+
 class Usage(Base):
     """使用统计表"""
     __tablename__ = "usage"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    tenant_id = Column(UUID(as_uuid=True), nullable=True, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    tenant_id = Column(UUID(as_uuid=True), nullable=True)
     model_id = Column(UUID(as_uuid=True), ForeignKey("models.id"), nullable=False)
     date = Column(DateTime(timezone=True), nullable=False, index=True)
     request_count = Column(Integer, nullable=False, default=0)
     input_tokens = Column(Integer, nullable=False, default=0)
     output_tokens = Column(Integer, nullable=False, default=0)
     
+    __table_args__ = (
+        Index("ix_usage_tenant_id_date", tenant_id, date),
+    )
+    
     # 关系
     model = relationship("Model")
 
@@ -205,7 +234,7 @@ class ChatSession(Base):
     """聊天会话表"""
     __tablename__ = "chat_sessions"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     title = Column(String, nullable=False, default="新对话")
     model_id = Column(UUID(as_uuid=True), ForeignKey("models.id"), nullable=True)
     agent_id = Column(UUID(as_uuid=True), ForeignKey("agents.id"), nullable=True)
@@ -226,29 +255,44 @@ class ChatMessage(Base):
     """聊天消息表"""
     __tablename__ = "chat_messages"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    session_id = Column(UUID(as_uuid=True), ForeignKey("chat_sessions.id"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    session_id = Column(UUID(as_uuid=True), ForeignKey("chat_sessions.id"), nullable=False)
     role = Column(String, nullable=False)  # user, assistant, system, tool
     content = Column(Text, nullable=True)  # 允许为空，因为工具调用消息可能没有文本内容
     model_used = Column(String, nullable=True)  # 记录使用的模型
-    tool_calls = Column(JSON, nullable=True)  # OpenAI tool call format
+    tool_calls = Column(JSONB, nullable=True)  # OpenAI tool call format
     tool_call_id = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    
+    # 按 created_at 范围分区，分区表的主键必须包含分区键
+    __table_args__ = (
+        Index("ix_chat_messages_session_id_created_at", session_id, created_at),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
     
     # 关系
     session = relationship("ChatSession", back_populates="messages")
 
 
+add_default_partition(ChatMessage.__table__)
+
+
 class User(Base):
     """用户表"""
     __tablename__ = "users"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    email = Column(String, nullable=False, unique=True, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    email = Column(String, nullable=False)
     hashed_password = Column(String, nullable=False)
     full_name = Column(String, nullable=True)
     is_active = Column(Boolean, nullable=False, default=True)
     is_superuser = Column(Boolean, nullable=False, default=False)
     tenant_id = Column(UUID(as_uuid=True), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now()) 
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # 唯一约束与迁移中的命名一致
+    __table_args__ = (
+        UniqueConstraint("email", name="uq_users_email"),
+    )
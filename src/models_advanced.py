@@ -1,16 +1,16 @@
 """高级Agent数据库模型"""
 
-import uuid
 from datetime import datetime
 from enum import Enum
 from typing import Optional, Dict, Any, List
 
-from sqlalchemy import Column, String, Boolean, Integer, Float, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, String, Boolean, Integer, Float, DateTime, Text, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from .database import Base
+from .database import Base, add_default_partition
+from .utils.ids import uuid7
 
 
 class AdvancedAgentStatus(str, Enum):
@@ -72,14 +72,14 @@ class AdvancedAgent(Base):
     """高级Agent表"""
     __tablename__ = "advanced_agents"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(String, nullable=False, index=True)
     role = Column(String, nullable=False)  # research_assistant, creative_partner, etc.
     personality = Column(String, nullable=False, default=AgentPersonality.PROFESSIONAL)
     description = Column(Text, nullable=True)
     
     # 核心配置
-    config = Column(JSON, nullable=False, default={
+    config = Column(JSONB, nullable=False, default={
         "primary_model": "",
         "autonomy_level": AutonomyLevel.SEMI_AUTONOMOUS,
         "transparency": TransparencyLevel.HIGH,
@@ -94,7 +94,7 @@ class AdvancedAgent(Base):
     current_session_id = Column(UUID(as_uuid=True), ForeignKey("agent_sessions.id"), nullable=True)
     
     # 统计信息
-    stats = Column(JSON, nullable=False, default={
+    stats = Column(JSONB, nullable=False, default={
         "total_sessions": 0,
         "success_rate": 0.0,
         "avg_response_time": 0.0,
@@ -116,7 +116,7 @@ class AgentSession(Base):
     """Agent会话表"""
     __tablename__ = "agent_sessions"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     agent_id = Column(UUID(as_uuid=True), ForeignKey("advanced_agents.id"), nullable=False)
     
     # 会话状态
@@ -127,7 +127,7 @@ class AgentSession(Base):
     reasoning_visible = Column(Boolean, default=True)
     
     # 会话配置
-    session_config = Column(JSON, nullable=False, default={
+    session_config = Column(JSONB, nullable=False, default={
         "max_messages": 100,
         "timeout_minutes": 30,
         "auto_save": True
@@ -154,7 +154,7 @@ class SessionMessage(Base):
     """会话消息表"""
     __tablename__ = "session_messages"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     session_id = Column(UUID(as_uuid=True), ForeignKey("agent_sessions.id"), nullable=False)
     
     # 消息内容
@@ -164,31 +164,41 @@ class SessionMessage(Base):
     reasoning = Column(Text, nullable=True)  # 推理过程
     
     # 工具调用相关
-    tool_calls = Column(JSON, nullable=True)  # 工具调用信息
-    tool_results = Column(JSON, nullable=True)  # 工具执行结果
+    tool_calls = Column(JSONB, nullable=True)  # 工具调用信息
+    tool_results = Column(JSONB, nullable=True)  # 工具执行结果
     
     # 元数据
-    message_metadata = Column(JSON, nullable=True)
+    message_metadata = Column(JSONB, nullable=True)
     tokens_used = Column(Integer, default=0)
     execution_time_ms = Column(Integer, default=0)
-    timestamp = Column(DateTime(timezone=True), server_default=func.now())
+    timestamp = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    
+    # 按 timestamp 范围分区，分区表的主键必须包含分区键
+    __table_args__ = (
+        Index("ix_session_messages_session_id_timestamp", session_id, timestamp),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
     
     # 关系
     session = relationship("AgentSession", back_populates="messages")
 
 
+add_default_partition(SessionMessage.__table__)
+
+
 class AdvancedTool(Base):
     """高级工具表"""
     __tablename__ = "advanced_tools"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    name = Column(String, nullable=False, unique=True, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    name = Column(String, nullable=False)
     description = Column(Text, nullable=False)
     category = Column(String, nullable=False)
     
     # 工具配置
-    schema = Column(JSON, nullable=False)  # 工具参数schema
-    implementation = Column(JSON, nullable=False)  # 实现配置
+    schema = Column(JSONB, nullable=False)  # 工具参数schema
+    implementation = Column(JSONB, nullable=False)  # 实现配置
     
     # 元数据
     version = Column(String, default="1.0.0")
@@ -204,19 +214,24 @@ class AdvancedTool(Base):
     # 元数据
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # 唯一约束与迁移中的命名一致
+    __table_args__ = (
+        UniqueConstraint("name", name="uq_advanced_tools_name"),
+    )
 
 
 class AgentMemory(Base):
     """Agent记忆表"""
     __tablename__ = "agent_memories"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     agent_id = Column(UUID(as_uuid=True), ForeignKey("advanced_agents.id"), nullable=False)
     
     # 记忆内容
     memory_type = Column(String, nullable=False)  # conversation, preference, fact, skill
     content = Column(Text, nullable=False)
-    embedding = Column(JSON, nullable=True)  # 向量嵌入
+    embedding = Column(JSONB, nullable=True)  # 向量嵌入
     
     # 记忆元数据
     importance_score = Column(Float, default=0.5)  # 重要性评分
@@ -241,7 +256,7 @@ class AgentPerformanceMetric(Base):
     """Agent性能指标表"""
     __tablename__ = "agent_performance_metrics"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     agent_id = Column(UUID(as_uuid=True), ForeignKey("advanced_agents.id"), nullable=False)
     session_id = Column(UUID(as_uuid=True), ForeignKey("agent_sessions.id"), nullable=True)
     
@@ -251,19 +266,26 @@ class AgentPerformanceMetric(Base):
     metric_unit = Column(String, nullable=True)
     
     # 上下文信息
-    context = Column(JSON, nullable=True)
-    measurement_time = Column(DateTime(timezone=True), server_default=func.now())
+    context = Column(JSONB, nullable=True)
+    measurement_time = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    
+    # 按 measurement_time 范围分区，分区表的主键必须包含分区键
+    __table_args__ = {"postgresql_partition_by": "RANGE (measurement_time)"}
+    __mapper_args__ = {"primary_key": [id]}
     
     # 关系
     agent = relationship("AdvancedAgent")
     session = relationship("AgentSession")
 
 
+add_default_partition(AgentPerformanceMetric.__table__)
+
+
 class AgentKnowledgeBase(Base):
     """Agent知识库表"""
     __tablename__ = "agent_knowledge_bases"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     agent_id = Column(UUID(as_uuid=True), ForeignKey("advanced_agents.id"), nullable=False)
     
     # 知识内容
@@ -272,7 +294,7 @@ class AgentKnowledgeBase(Base):
     content_type = Column(String, default="text")  # text, document, code, etc.
     
     # 索引信息
-    embedding = Column(JSON, nullable=True)
+    embedding = Column(JSONB, nullable=True)
     keywords = Column(ARRAY(String), default=[])
     categories = Column(ARRAY(String), default=[])
     
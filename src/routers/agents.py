@@ -36,7 +36,7 @@ async def list_agents(
     if access_level:
         query = query.filter(Agent.access_level == access_level)
     
-    agents = query.offset(skip).limit(limit).all()
+    agents = query.order_by(Agent.id).offset(skip).limit(limit).all()
     return agents
 
 
@@ -28,7 +28,7 @@ async def list_models(
     if enabled is not None:
         query = query.filter(Model.enabled == enabled)
     
-    models = query.offset(skip).limit(limit).all()
+    models = query.order_by(Model.id).offset(skip).limit(limit).all()
     return models
 
 
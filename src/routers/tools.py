@@ -41,7 +41,7 @@ async def list_tools(
     if enabled is not None:
         query = query.filter(Tool.enabled == enabled)
     
-    tools = query.offset(skip).limit(limit).all()
+    tools = query.order_by(Tool.id).offset(skip).limit(limit).all()
     return tools
 
 
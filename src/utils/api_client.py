@@ -1,25 +1,38 @@
 """ModelVS3 API 客户端工具"""
 
 import httpx
+import importlib.util
 import json
-from typing import Dict, List, Any, Optional, AsyncGenerator
+from typing import Dict, List, Any, Optional, AsyncGenerator, Tuple
 from datetime import datetime
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# httpx 的 HTTP/2 支持依赖可选的 h2 包
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 
 class ModelVS3Client:
     """ModelVS3 Agent 平台 API 客户端"""
     
+    # 健康检查结果的缓存时间（秒），合并短时间内的重复探测
+    HEALTH_CACHE_TTL = 1.0
+    
     def __init__(self, base_url: str = "http://localhost:8000", api_key: Optional[str] = None):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
+        # 整个客户端生命周期内复用同一个连接池；安装了 h2 时启用 HTTP/2 多路复用
         self.client = httpx.AsyncClient(
             base_url=base_url,
             headers=self._get_headers(),
-            timeout=30.0
+            timeout=30.0,
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
         )
+        # 按检查模式（simple）分别缓存：(结果, 获取时间)
+        self._cached_health: Dict[bool, Tuple[Dict[str, Any], float]] = {}
     
     def _get_headers(self) -> Dict[str, str]:
         """获取请求头"""
@@ -43,6 +56,25 @@ class ModelVS3Client:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
     
+    async def _paginate(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = 50
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """按 skip/limit 分页请求列表接口，逐条产出结果，直到返回不满一页"""
+        params = dict(params or {})
+        skip = 0
+        while True:
+            response = await self.client.get(path, params={**params, "skip": skip, "limit": page_size})
+            response.raise_for_status()
+            page = response.json()
+            for item in page:
+                yield item
+            if len(page) < page_size:
+                break
+            skip += page_size
+    
     # Agent 管理
     async def create_agent(self, agent_data: Dict[str, Any]) -> Dict[str, Any]:
         """创建 Agent"""
@@ -60,6 +92,12 @@ class ModelVS3Client:
         response.raise_for_status()
         return response.json()
     
+    async def iter_agents(self, status: Optional[str] = None, page_size: int = 50) -> AsyncGenerator[Dict[str, Any], None]:
+        """分页遍历全部 Agent"""
+        params = {"status": status} if status else None
+        async for agent in self._paginate("/api/v1/agents/", params, page_size):
+            yield agent
+    
     async def get_agent(self, agent_id: str) -> Dict[str, Any]:
         """获取单个 Agent"""
         response = await self.client.get(f"/api/v1/agents/{agent_id}")
@@ -109,6 +147,22 @@ class ModelVS3Client:
         response.raise_for_status()
         return response.json()
     
+    async def iter_models(
+        self,
+        provider: Optional[str] = None,
+        enabled: Optional[bool] = None,
+        page_size: int = 50
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """分页遍历全部模型"""
+        params: Dict[str, Any] = {}
+        if provider:
+            params["provider"] = provider
+        if enabled is not None:
+            params["enabled"] = enabled
+        
+        async for model in self._paginate("/api/v1/models/", params, page_size):
+            yield model
+    
     # 工具管理
     async def create_tool(self, tool_data: Dict[str, Any]) -> Dict[str, Any]:
         """创建工具"""
@@ -126,6 +180,12 @@ class ModelVS3Client:
         response.raise_for_status()
         return response.json()
     
+    async def iter_tools(self, enabled: Optional[bool] = None, page_size: int = 50) -> AsyncGenerator[Dict[str, Any], None]:
+        """分页遍历全部工具"""
+        params = {"enabled": enabled} if enabled is not None else None
+        async for tool in self._paginate("/api/v1/tools/", params, page_size):
+            yield tool
+    
     # Agent 执行
     async def run_agent(
         self, 
@@ -252,11 +312,26 @@ class ModelVS3Client:
         return response.json()
     
     # 系统状态
-    async def health_check(self) -> Dict[str, Any]:
-        """健康检查"""
-        response = await self.client.get("/health")
+    async def health_check(self, bypass_cache: bool = False, simple: bool = False) -> Dict[str, Any]:
+        """健康检查
+        
+        HEALTH_CACHE_TTL 内的重复调用直接返回上次结果，bypass_cache 为 True 时强制请求。
+        simple 为 True 时请求 /health?simple=true，只确认服务存活而不探测下游依赖。
+        """
+        cached = self._cached_health.get(simple)
+        if (
+            not bypass_cache
+            and cached is not None
+            and time.monotonic() - cached[1] < self.HEALTH_CACHE_TTL
+        ):
+            return cached[0]
+        
+        params = {"simple": "true"} if simple else None
+        response = await self.client.get("/health", params=params)
         response.raise_for_status()
-        return response.json()
+        result = response.json()
+        self._cached_health[simple] = (result, time.monotonic())
+        return result
 
 
 # 便捷函数
@@ -0,0 +1,61 @@
+"""内存缓存过期清理测试"""
+
+import threading
+import time
+
+from qimenEngine.cache import ThreadSafeLRUCache
+
+
+def test_cleanup_expired_after_wait_for_expiry():
+    """wait_for_expiry 返回后，cleanup_expired 只清理已过期的条目"""
+    cache = ThreadSafeLRUCache(max_size=10)
+    cache.set("short", "a", ttl=1)
+    cache.set("long", "b", ttl=60)
+    cache.set("forever", "c")
+
+    start = time.monotonic()
+    cache.wait_for_expiry(timeout=5)
+    assert time.monotonic() - start < 5  # 因条目过期而返回，而不是超时
+
+    assert cache.cleanup_expired() == 1
+    assert not cache.exists("short")
+    assert cache.get("long") == "b"
+    assert cache.get("forever") == "c"
+    assert cache.next_expiry() is not None and cache.next_expiry() > time.monotonic()
+
+
+def test_cleanup_expired_skips_overwritten_entries():
+    """条目重新设置为不过期后，旧的堆记录不会删除它"""
+    cache = ThreadSafeLRUCache(max_size=10)
+    cache.set("key", "old", ttl=1)
+    cache.set("key", "new")
+
+    cache.wait_for_expiry(timeout=5)
+
+    assert cache.cleanup_expired() == 0
+    assert cache.get("key") == "new"
+    assert cache.next_expiry() is None
+
+
+def test_wait_for_expiry_wakes_on_earlier_expiry():
+    """等待期间写入更早过期的条目时，等待线程被唤醒"""
+    cache = ThreadSafeLRUCache(max_size=10)
+    cache.set("long", "b", ttl=60)
+
+    waiting = threading.Event()
+    returned = threading.Event()
+
+    def waiter():
+        waiting.set()
+        cache.wait_for_expiry(timeout=30)
+        returned.set()
+
+    thread = threading.Thread(target=waiter, daemon=True)
+    thread.start()
+    waiting.wait(5)
+    time.sleep(0.2)  # 让等待线程阻塞在 60 秒后的过期时间上
+    # 新条目 20 秒后才过期，5 秒内返回说明等待线程是被通知唤醒的
+    cache.set("short", "a", ttl=20)
+
+    assert returned.wait(5)
+    thread.join(5)
@@ -0,0 +1,36 @@
+"""日干支批量计算测试"""
+
+from datetime import date, datetime
+
+import pytest
+
+from qimenEngine import ganzhi
+from qimenEngine.symbols import TIAN_GAN, DI_ZHI
+
+
+# 1899-12-01 起连续 200 年，覆盖基准日（1900-01-01）之前的日期
+START = date(1899, 12, 1).toordinal()
+ORDINALS = list(range(START, START + 200 * 366))
+
+
+def _assert_matches_scalar(gan_indices, zhi_indices):
+    calculator = ganzhi.ganzhi_calculator
+    assert len(gan_indices) == len(zhi_indices) == len(ORDINALS)
+    for ordinal, gan_index, zhi_index in zip(ORDINALS, gan_indices, zhi_indices):
+        expected = calculator.calculate_day_ganzhi(datetime.fromordinal(ordinal))
+        assert (TIAN_GAN[gan_index], DI_ZHI[zhi_index]) == expected
+
+
+@pytest.mark.skipif(not ganzhi.NUMPY_AVAILABLE, reason="未安装 NumPy")
+def test_day_ganzhi_batch_numpy():
+    """NumPy 实现与 calculate_day_ganzhi 一致"""
+    gan_indices, zhi_indices = ganzhi.ganzhi_calculator.calculate_day_ganzhi_batch(ORDINALS)
+    _assert_matches_scalar(gan_indices, zhi_indices)
+
+
+def test_day_ganzhi_batch_list(monkeypatch):
+    """未安装 NumPy 时返回列表，结果与 calculate_day_ganzhi 一致"""
+    monkeypatch.setattr(ganzhi, "NUMPY_AVAILABLE", False)
+    gan_indices, zhi_indices = ganzhi.ganzhi_calculator.calculate_day_ganzhi_batch(ORDINALS)
+    assert isinstance(gan_indices, list) and isinstance(zhi_indices, list)
+    _assert_matches_scalar(gan_indices, zhi_indices)
@@ -0,0 +1,48 @@
+"""局号批量计算测试"""
+
+import itertools
+
+import pytest
+
+from qimenEngine import ju
+
+
+# 全部节气、元首、时支组合
+CASES = list(itertools.product(range(24), range(1, 10), range(12)))
+
+
+def _expected():
+    """逐个调用标量实现得到的 (局号, 是否阳遁)"""
+    return [ju._get_ju_chabu_cached(term, yuan, hour + 1) for term, yuan, hour in CASES]
+
+
+def _columns():
+    terms, yuans, hours = zip(*CASES)
+    return list(terms), list(yuans), list(hours)
+
+
+def _assert_matches_scalar(ju_numbers, is_yang):
+    assert [(int(n), bool(y)) for n, y in zip(ju_numbers, is_yang)] == _expected()
+
+
+@pytest.mark.skipif(not ju.NUMBA_AVAILABLE, reason="未安装 numba")
+def test_ju_chabu_batch_numba():
+    """numba 内核与标量实现一致"""
+    _assert_matches_scalar(*ju.get_ju_chabu_batch(*_columns()))
+
+
+@pytest.mark.skipif(not ju.NUMPY_AVAILABLE, reason="未安装 NumPy")
+def test_ju_chabu_batch_numpy(monkeypatch):
+    """NumPy 向量化实现与标量实现一致"""
+    monkeypatch.setattr(ju, "NUMBA_AVAILABLE", False)
+    ju_numbers, is_yang = ju.get_ju_chabu_batch(*_columns())
+    assert ju_numbers.shape == is_yang.shape == (len(CASES),)
+    _assert_matches_scalar(ju_numbers, is_yang)
+
+
+def test_ju_chabu_batch_list(monkeypatch):
+    """未安装 NumPy 时返回列表，结果与标量实现一致"""
+    monkeypatch.setattr(ju, "NUMPY_AVAILABLE", False)
+    ju_numbers, is_yang = ju.get_ju_chabu_batch(*_columns())
+    assert isinstance(ju_numbers, list) and isinstance(is_yang, list)
+    _assert_matches_scalar(ju_numbers, is_yang)